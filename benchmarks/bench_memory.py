@@ -0,0 +1,64 @@
+"""Measures the memory footprint per instance of the value types ComplexNumber, MoebGen, Vertical and HalfCircle
+   and compares it to the previous __dict__ based layout (including the level closure stored by every HalfCircle).
+
+   Run from the repository root with
+
+       python -m benchmarks.bench_memory
+"""
+import tracemalloc
+
+from hypgeo.complex_plane import ComplexNumber
+from hypgeo.moebius import MoebGen
+from hypgeo.geometry import Vertical, HalfCircle
+
+SAMPLES = 100000
+
+class _LegacyComplexNumber:
+    def __init__(self, re, im):
+        self._re = re
+        self._im = im
+
+class _LegacyMoebGen:
+    def __init__(self, a, b, c, d):
+        self._a = a
+        self._b = b
+        self._c = c
+        self._d = d
+        self._det = self._a * self._d - self._b * self._c
+
+class _LegacyVertical:
+    def __init__(self, absc):
+        self._absc = absc
+
+class _LegacyHalfCircle:
+    def __init__(self, radius, center):
+        self._radius = radius
+        self._center = center
+        self._level = lambda x, y: (x - self._center) * (x - self._center) + (y - self._center) * (y - self._center) - self._radius * self._radius
+
+def bytes_per_instance(factory, samples=SAMPLES):
+    """Returns the number of bytes allocated per instance created by factory, excluding the float arguments."""
+    args = [float(i) + .5 for i in range(0, samples)]
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    instances = [factory(x) for x in args]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # the list holding the instances is not part of their footprint
+    return (after - before) / samples - 8.0
+
+CASES = [
+    ('ComplexNumber', lambda x: _LegacyComplexNumber(x, x), lambda x: ComplexNumber(x, x)),
+    ('MoebGen', lambda x: _LegacyMoebGen(x, .0, .0, 1.0 / x), lambda x: MoebGen(x, .0, .0, 1.0 / x)),
+    ('Vertical', lambda x: _LegacyVertical(x), lambda x: Vertical(x)),
+    ('HalfCircle', lambda x: _LegacyHalfCircle(x, x), lambda x: HalfCircle(x, x)),
+]
+
+def main():
+    print('{:<15}{:>12}{:>12}{:>10}'.format('type', 'before [B]', 'after [B]', 'ratio'))
+    for name, legacy, current in CASES:
+        before, after = bytes_per_instance(legacy), bytes_per_instance(current)
+        print('{:<15}{:>12.1f}{:>12.1f}{:>10.2f}'.format(name, before, after, before / after))
+
+if __name__ == '__main__':
+    main()
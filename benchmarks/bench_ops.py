@@ -0,0 +1,42 @@
+"""Measures the cost in ns/op of the scalar ComplexNumber operators. Each operator is timed through the former
+   CheckType/MapFloat decorator dispatch, through the current single dispatch operator and through the unchecked
+   method used by trusted internal callers.
+
+   Run from the repository root with
+
+       python -m benchmarks.bench_ops
+"""
+import timeit
+
+from hypgeo.complex_plane import ComplexNumber, CheckType, MapFloat
+
+NUMBER = 200000
+REPEAT = 5
+
+def ns_per_op(op, x, y):
+    """Returns the best time in ns of op(x, y) over REPEAT runs of NUMBER calls."""
+    return min(timeit.repeat(lambda: op(x, y), number=NUMBER, repeat=REPEAT)) / NUMBER * 1e9
+
+def main():
+    z, w = ComplexNumber(1.5, - 2.5), ComplexNumber(.5, 3.0)
+    cases = [
+        ('+', ComplexNumber.__add__, ComplexNumber._add),
+        ('-', ComplexNumber.__sub__, ComplexNumber._sub),
+        ('*', ComplexNumber.__mul__, ComplexNumber._mul),
+        ('/', ComplexNumber.__truediv__, ComplexNumber._truediv),
+    ]
+
+    print('{:<12}{:>14}{:>14}{:>14}'.format('operator', 'decorated', 'dispatch', 'unchecked'))
+    for name, op, unchecked in cases:
+        decorated = CheckType(MapFloat(unchecked))
+        print('{:<12}{:>14.1f}{:>14.1f}{:>14.1f}'.format(name + ' complex', ns_per_op(decorated, z, w),
+            ns_per_op(op, z, w), ns_per_op(unchecked, z, w)))
+        print('{:<12}{:>14.1f}{:>14.1f}{:>14}'.format(name + ' float', ns_per_op(decorated, z, 2.0),
+            ns_per_op(op, z, 2.0), '-'))
+
+    for name, op in [('neg', lambda x, y: - x), ('conj', lambda x, y: x.conj()), ('inv', lambda x, y: x.inv()),
+        ('**', lambda x, y: x ** 5), ('==', lambda x, y: x == y)]:
+        print('{:<12}{:>14}{:>14.1f}{:>14}'.format(name, '-', ns_per_op(op, z, w), '-'))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,291 @@
+"""Benchmark suite timing the scalar and batch variants of the public operations of hypgeo over input sizes from 1
+   up to 10^7. Results are written as JSON and can be compared against a saved baseline, in which case every
+   operation that got slower than the given threshold is flagged and the exit status is 1.
+
+   Run from the repository root, e.g.
+
+       python -m benchmarks.suite --max-size 1000000 --output baseline.json
+       python -m benchmarks.suite --max-size 1000000 --compare baseline.json --threshold 0.25
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+
+import numpy as np
+
+from hypgeo import backend
+from hypgeo.complex_plane import ComplexNumber, ComplexArray
+from hypgeo.flow import rotation
+from hypgeo.geometry import GeodesicLine, GeodesicArray, HalfCircle, HalfSpace, Vertical, unit_circle
+from hypgeo.lazy import Alphabet, evaluate_all, lazy
+from hypgeo.moebius import Moeb, MoebStack
+from hypgeo.polygon import HyperbolicPolygon
+from hypgeo.parallel import Executor
+from hypgeo.reduction import FundamentalDomain
+from hypgeo.transformations import line_to_line, refl, ellip, ellip_batch
+
+CASES = []
+_executor = Executor()
+
+def case(name, variant):
+    """Registers a benchmark case. The decorated function takes the input size and returns a function without
+       arguments performing the timed operation on inputs of that size."""
+    def _register(setup):
+        CASES.append((name, variant, setup))
+        return setup
+    return _register
+
+def _points(n):
+    return ComplexArray(np.random.uniform(- 10.0, + 10.0, n) + 1j * np.random.uniform(.1, 10.0, n))
+
+def _lines(n):
+    return GeodesicArray(np.zeros(n, dtype=bool), np.random.uniform(- 10.0, + 10.0, n), np.random.uniform(.1, 10.0, n))
+
+def _binary_op(op):
+    def _scalar(n):
+        Z, W = _points(n).to_list(), _points(n).to_list()
+        return lambda: [op(z, w) for z, w in zip(Z, W)]
+    def _batch(n):
+        Z, W = _points(n), _points(n)
+        return lambda: op(Z, W)
+    return _scalar, _batch
+
+for _name, _op in [('ComplexNumber.__add__', lambda z, w: z + w), ('ComplexNumber.__mul__', lambda z, w: z * w),
+    ('ComplexNumber.__truediv__', lambda z, w: z / w), ('ComplexNumber.__pow__', lambda z, w: z ** 7)]:
+    _scalar, _batch = _binary_op(_op)
+    case(_name, 'scalar')(_scalar)
+    case(_name, 'batch')(_batch)
+
+@case('MoebGen.__call__', 'scalar')
+def _moeb_call_scalar(n):
+    m, Z = Moeb.rnd(- 5.0, + 5.0, 1)[0], _points(n).to_list()
+    return lambda: [m(z) for z in Z]
+
+@case('MoebGen.__call__', 'batch')
+def _moeb_call_batch(n):
+    m, Z = Moeb.rnd(- 5.0, + 5.0, 1)[0], _points(n)
+    return lambda: m.apply(Z)
+
+@case('MoebGen.__call__', 'parallel')
+def _moeb_call_parallel(n):
+    m, Z = Moeb.rnd(- 5.0, + 5.0, 1)[0], _points(n)
+    return lambda: _executor.apply(m, Z)
+
+@case('MoebGen.__mul__', 'scalar')
+def _moeb_mul_scalar(n):
+    A, B = Moeb.rnd(- 5.0, + 5.0, n).to_list(), Moeb.rnd(- 5.0, + 5.0, n).to_list()
+    return lambda: [a * b for a, b in zip(A, B)]
+
+@case('MoebGen.__mul__', 'batch')
+def _moeb_mul_batch(n):
+    A, B = Moeb.rnd(- 5.0, + 5.0, n), Moeb.rnd(- 5.0, + 5.0, n)
+    return lambda: A * B
+
+@case('MoebGen.__pow__', 'scalar')
+def _moeb_pow_scalar(n):
+    M = Moeb.rnd(- 1.0, + 1.0, n).to_list()
+    return lambda: [m ** 1000 for m in M]
+
+@case('MoebGen.__pow__', 'batch')
+def _moeb_pow_batch(n):
+    m, N = Moeb.rnd(- 1.0, + 1.0, 1)[0], np.random.randint(- 1000, 1000, n)
+    return lambda: m.pow_batch(N)
+
+def _rotations(n):
+    """Returns n elliptic transformations around random centers and random exponents, whose powers stay bounded."""
+    u = np.random.uniform(- 10.0, 10.0, n) + 1.0j * np.random.uniform(.1, 10.0, n)
+    return ellip_batch(np.random.uniform(.0, 2.0 * np.pi, n), u), np.random.randint(- 1000, 1000, n)
+
+@case('MoebStack.__pow__', 'batch')
+def _stack_pow_batch(n):
+    M, N = _rotations(n)
+    return lambda: M ** N
+
+@case('MoebStack.__pow__', 'double-double')
+def _stack_pow_double_double(n):
+    M, N = _rotations(n)
+    def _pow():
+        with backend.using('double-double'):
+            return M ** N
+    return _pow
+
+def _words(n, length=16):
+    """Returns n random products of length letters over 8 random transformations, eagerly as lists of Moeb and
+       lazily as LazyMoeb."""
+    M, A = Moeb.rnd(- 1.0, + 1.0, 8).to_list(), Alphabet()
+    G, N = [lazy(m, A) for m in M], np.random.randint(0, 8, (n, length))
+    W = []
+    for word in N:
+        w = G[word[0]]
+        for letter in word[1:]:
+            w = w * G[letter]
+        W.append(w)
+    return [[M[letter] for letter in word] for word in N], W
+
+@case('LazyMoeb.evaluate', 'scalar')
+def _lazy_scalar(n):
+    M, W = _words(n)
+    def _products():
+        products = []
+        for word in M:
+            p = word[0]
+            for m in word[1:]:
+                p = p * m
+            products.append(p)
+        return products
+    return _products
+
+@case('LazyMoeb.evaluate', 'batch')
+def _lazy_batch(n):
+    M, W = _words(n)
+    return lambda: evaluate_all(W)
+
+@case('MoebGen.map_line', 'scalar')
+def _map_line_scalar(n):
+    m, L = Moeb.rnd(- 5.0, + 5.0, 1)[0], _lines(n).to_list()
+    return lambda: [m.map_line(l) for l in L]
+
+@case('MoebGen.map_line', 'batch')
+def _map_line_batch(n):
+    m, L = Moeb.rnd(- 5.0, + 5.0, 1)[0], _lines(n)
+    return lambda: m.map_lines(L)
+
+@case('GeodesicLine.line_trough', 'scalar')
+def _line_trough_scalar(n):
+    Z, W = _points(n).to_list(), _points(n).to_list()
+    return lambda: [GeodesicLine.line_trough(z, w) for z, w in zip(Z, W)]
+
+@case('GeodesicLine.line_trough', 'batch')
+def _line_trough_batch(n):
+    Z, W = _points(n), _points(n)
+    return lambda: GeodesicArray.line_trough(Z, W)
+
+@case('line_to_line', 'scalar')
+def _line_to_line_scalar(n):
+    L, K = _lines(n).to_list(), _lines(n).to_list()
+    return lambda: [line_to_line(l, k) for l, k in zip(L, K)]
+
+@case('refl', 'scalar')
+def _refl_scalar(n):
+    L = _lines(n).to_list()
+    return lambda: [refl(l) for l in L]
+
+@case('ellip', 'scalar')
+def _ellip_scalar(n):
+    T, U = np.random.uniform(- 10.0, + 10.0, n), _points(n).to_list()
+    return lambda: [ellip(t, u) for t, u in zip(T, U)]
+
+@case('ellip', 'batch')
+def _ellip_batch(n):
+    T, U = np.random.uniform(- 10.0, + 10.0, n), _points(n)
+    return lambda: ellip_batch(T, U)
+
+@case('Flow.trajectories', 'scalar')
+def _trajectories_scalar(n):
+    T, Z = np.random.uniform(- 10.0, + 10.0, n), _points(10).to_list()
+    return lambda: [[rotation(t, z) for z in Z] for t in T]
+
+@case('Flow.trajectories', 'batch')
+def _trajectories_batch(n):
+    T, Z = np.random.uniform(- 10.0, + 10.0, n), _points(10)
+    return lambda: rotation(T, Z)
+
+@case('HalfSpace.position', 'scalar')
+def _position_scalar(n):
+    h, Z = HalfSpace(HalfCircle(5.0, .0)), _points(n).to_list()
+    return lambda: [h.position(z) for z in Z]
+
+@case('HalfSpace.position', 'batch')
+def _position_batch(n):
+    h, Z = HalfSpace(HalfCircle(5.0, .0)), _points(n)
+    return lambda: h.position_batch(Z)
+
+@case('HyperbolicPolygon.positions', 'batch')
+def _polygon_positions(n):
+    sides = [HalfSpace(HalfCircle(.01, c), True) for c in np.linspace(- 10.0, + 10.0, 1000)]
+    P, Z = HyperbolicPolygon(sides), _points(n)
+    return lambda: P.positions(Z)
+
+@case('FundamentalDomain.reduce', 'batch')
+def _reduce(n):
+    P = HyperbolicPolygon([Vertical(- .5), Vertical(.5), unit_circle], ComplexNumber(.0, 2.0))
+    D = FundamentalDomain(P, [Moeb(1.0, 1.0, .0, 1.0), Moeb(1.0, - 1.0, .0, 1.0), Moeb(.0, - 1.0, 1.0, .0)])
+    Z = _points(n)
+    return lambda: D.reduce(Z)
+
+def measure(setup, size, repeat):
+    """Returns the best wall clock time in seconds of the operation created by setup for the given input size."""
+    operation = setup(size)
+    best = float('inf')
+    for i in range(0, repeat):
+        start = time.perf_counter()
+        operation()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def run(max_size, max_scalar_size, repeat, pattern=None):
+    """Runs all registered cases matching pattern for the sizes 1, 10, ..., max_size (max_scalar_size for scalar
+       variants) and returns the results as list of dictionaries."""
+    results = []
+    for name, variant, setup in CASES:
+        if pattern is not None and pattern not in name:
+            continue
+        limit = max_scalar_size if variant == 'scalar' else max_size
+        size = 1
+        while size <= limit:
+            seconds = measure(setup, size, repeat)
+            results.append({'case': name, 'variant': variant, 'size': size, 'seconds': seconds,
+                'ns_per_element': seconds / size * 1e9})
+            print('{:<28}{:<8}{:>10}{:>16.1f} ns/el'.format(name, variant, size, seconds / size * 1e9), file=sys.stderr)
+            size *= 10
+    return results
+
+def compare(results, baseline, threshold):
+    """Returns the results which are slower than the matching baseline results by more than the relative
+       threshold, as list of (result, baseline seconds)."""
+    reference = {(r['case'], r['variant'], r['size']): r['seconds'] for r in baseline['results']}
+    regressions = []
+    for r in results:
+        key = (r['case'], r['variant'], r['size'])
+        if key in reference and r['seconds'] > reference[key] * (1.0 + threshold):
+            regressions.append((r, reference[key]))
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--max-size', type=int, default=10 ** 6, help='largest input size of batch variants')
+    parser.add_argument('--max-scalar-size', type=int, default=10 ** 4, help='largest input size of scalar variants')
+    parser.add_argument('--repeat', type=int, default=3, help='number of timed runs per size, the best is kept')
+    parser.add_argument('--filter', default=None, help='only run cases whose name contains this string')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the random inputs')
+    parser.add_argument('--output', default=None, help='file the JSON results are written to (default stdout)')
+    parser.add_argument('--compare', default=None, help='baseline JSON file to compare the results against')
+    parser.add_argument('--threshold', type=float, default=.25, help='relative slow down flagged as regression')
+    args = parser.parse_args(argv)
+
+    np.random.seed(args.seed)
+    report = {
+        'meta': {'python': platform.python_version(), 'numpy': np.__version__, 'machine': platform.machine(),
+            'platform': platform.platform(), 'time': time.strftime('%Y-%m-%dT%H:%M:%S')},
+        'results': run(args.max_size, args.max_scalar_size, args.repeat, args.filter),
+    }
+
+    if args.output is None:
+        json.dump(report, sys.stdout, indent=2)
+    else:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare is not None:
+        with open(args.compare) as f:
+            regressions = compare(report['results'], json.load(f), args.threshold)
+        for r, seconds in regressions:
+            print('REGRESSION {:<28}{:<8}{:>10}: {:.3e} s -> {:.3e} s ({:+.0%})'.format(r['case'], r['variant'],
+                r['size'], seconds, r['seconds'], r['seconds'] / seconds - 1.0), file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,384 @@
+"""Numeric backends for long compositions of Moebius transformations.
+
+Products of many transformations accumulate rounding errors in float64, until their determinants drift away from
++- 1 beyond the tolerance of the constructors. A backend fixes the arithmetic of the coefficients:
+
+    float64        hardware floats (default)
+    double-double  unevaluated sums hi + lo of two floats with about 32 significant digits, with vectorized kernels
+                   for stacks of matrices
+    exact          fractions.Fraction, exact products of the (exactly converted) float coefficients
+    mpmath         mpmath.mpf of a given number of decimal digits, if mpmath is installed
+
+Compositions in the floating point backends are periodically renormalized, i.e. rescaled to determinant +- 1. The
+backend is chosen globally with set_backend or within the scope of using, or per object (see
+hypgeo.moebius.PreciseMoeb). The global backend computes the products and powers of MoebGen and MoebStack, whose
+results are rounded to float64."""
+import abc
+import contextlib
+import fractions
+import math
+
+import numpy as np
+
+try:
+    import mpmath
+except ImportError:
+    mpmath = None
+
+# double-double arithmetic (Dekker, Knuth), the functions accept floats as well as np.array
+
+_SPLITTER = 134217729.0
+
+def two_sum(a, b):
+    """Returns s = fl(a + b) and the rounding error e with a + b = s + e exactly."""
+    s = a + b
+    v = s - a
+    return s, (a - (s - v)) + (b - v)
+
+def quick_two_sum(a, b):
+    """Returns s = fl(a + b) and the rounding error of the sum, assuming |a| >= |b|."""
+    s = a + b
+    return s, b - (s - a)
+
+def _split(a):
+    t = _SPLITTER * a
+    hi = t - (t - a)
+    return hi, a - hi
+
+def two_prod(a, b):
+    """Returns p = fl(a * b) and the rounding error e with a * b = p + e exactly, using Veltkamp splitting."""
+    p = a * b
+    a_hi, a_lo = _split(a)
+    b_hi, b_lo = _split(b)
+    return p, ((a_hi * b_hi - p) + a_hi * b_lo + a_lo * b_hi) + a_lo * b_lo
+
+def dd_add(x_hi, x_lo, y_hi, y_lo):
+    """Returns the double-double sum of x = x_hi + x_lo and y = y_hi + y_lo."""
+    s, e = two_sum(x_hi, y_hi)
+    t, f = two_sum(x_lo, y_lo)
+    s, e = quick_two_sum(s, e + t)
+    return quick_two_sum(s, e + f)
+
+def dd_mul(x_hi, x_lo, y_hi, y_lo):
+    """Returns the double-double product of x = x_hi + x_lo and y = y_hi + y_lo."""
+    p, e = two_prod(x_hi, y_hi)
+    return quick_two_sum(p, e + (x_hi * y_lo + x_lo * y_hi))
+
+def dd_div(x_hi, x_lo, y_hi, y_lo):
+    """Returns the double-double quotient of x = x_hi + x_lo and y = y_hi + y_lo by two steps of long division."""
+    q = x_hi / y_hi
+    p_hi, p_lo = dd_mul(y_hi, y_lo, q, .0 * q)
+    r_hi, r_lo = dd_add(x_hi, x_lo, - p_hi, - p_lo)
+    return quick_two_sum(q, (r_hi + r_lo) / y_hi)
+
+def dd_sqrt(x_hi, x_lo):
+    """Returns the double-double square root of x = x_hi + x_lo >= 0 by one Newton step from the float root."""
+    s = np.sqrt(x_hi)
+    p, e = two_prod(s, s)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        r = np.where(s > .0, ((x_hi - p) - e + x_lo) / (2.0 * np.where(s > .0, s, 1.0)), .0)
+    return quick_two_sum(s, r)
+
+class DoubleDouble:
+    """A class representing a real number as unevaluated sum hi + lo of two floats with |lo| <= ulp(hi) / 2.
+       Instances are immutable values."""
+
+    __slots__ = ('_hi', '_lo')
+
+    @property
+    def hi(self):
+        return self._hi
+
+    @property
+    def lo(self):
+        return self._lo
+
+    def __init__(self, hi, lo=.0):
+        self._hi, self._lo = quick_two_sum(float(hi), float(lo))
+
+    def _of(o):
+        return o if type(o) is DoubleDouble else DoubleDouble(o)
+
+    def __add__(self, o):
+        o = DoubleDouble._of(o)
+        return DoubleDouble(*dd_add(self._hi, self._lo, o._hi, o._lo))
+
+    __radd__ = __add__
+
+    def __sub__(self, o):
+        o = DoubleDouble._of(o)
+        return DoubleDouble(*dd_add(self._hi, self._lo, - o._hi, - o._lo))
+
+    def __rsub__(self, o):
+        return DoubleDouble._of(o) - self
+
+    def __mul__(self, o):
+        o = DoubleDouble._of(o)
+        return DoubleDouble(*dd_mul(self._hi, self._lo, o._hi, o._lo))
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, o):
+        o = DoubleDouble._of(o)
+        return DoubleDouble(*dd_div(self._hi, self._lo, o._hi, o._lo))
+
+    def __rtruediv__(self, o):
+        return DoubleDouble._of(o) / self
+
+    def __neg__(self):
+        return DoubleDouble(- self._hi, - self._lo)
+
+    def __abs__(self):
+        return - self if self._hi < .0 else self
+
+    def __lt__(self, o):
+        o = DoubleDouble._of(o)
+        return (self._hi, self._lo) < (o._hi, o._lo)
+
+    def __gt__(self, o):
+        return DoubleDouble._of(o) < self
+
+    def __float__(self):
+        return self._hi + self._lo
+
+    def sqrt(self):
+        return DoubleDouble(*(float(x) for x in dd_sqrt(self._hi, self._lo)))
+
+    def __str__(self):
+        return "{!r} + {!r}".format(self._hi, self._lo)
+
+# double-double kernels for stacks of matrices given as pairs (hi, lo) of np.array of shape (..., 2, 2)
+
+def dd_matmul(x, y):
+    """Returns the double-double matrix products of two stacks x and y of 2x2 matrices."""
+    (x_hi, x_lo), (y_hi, y_lo) = x, y
+    hi, lo = np.empty(np.broadcast_shapes(x_hi.shape, y_hi.shape)), np.empty(np.broadcast_shapes(x_hi.shape, y_hi.shape))
+    for i in range(0, 2):
+        for j in range(0, 2):
+            p = dd_mul(x_hi[..., i, 0], x_lo[..., i, 0], y_hi[..., 0, j], y_lo[..., 0, j])
+            q = dd_mul(x_hi[..., i, 1], x_lo[..., i, 1], y_hi[..., 1, j], y_lo[..., 1, j])
+            hi[..., i, j], lo[..., i, j] = dd_add(*p, *q)
+    return hi, lo
+
+def dd_det(x):
+    """Returns the double-double determinants ad - bc of a stack x of 2x2 matrices."""
+    hi, lo = x
+    p = dd_mul(hi[..., 0, 0], lo[..., 0, 0], hi[..., 1, 1], lo[..., 1, 1])
+    q = dd_mul(hi[..., 0, 1], lo[..., 0, 1], hi[..., 1, 0], lo[..., 1, 0])
+    return dd_add(p[0], p[1], - q[0], - q[1])
+
+def dd_renormalize(x, tol=1e-06):
+    """Returns the stack x of 2x2 matrices rescaled to determinant +- 1 where the determinant is within tol of +- 1."""
+    hi, lo = x
+    det_hi, det_lo = dd_det(x)
+    near = np.abs(np.abs(det_hi) - 1.0) <= tol
+    sign = np.where(det_hi < .0, - 1.0, 1.0)
+    s_hi, s_lo = dd_sqrt(np.where(near, sign * det_hi, 1.0), np.where(near, sign * det_lo, .0))
+    return dd_div(hi, lo, s_hi[..., None, None], s_lo[..., None, None])
+
+def dd_pow(x, n, every=8):
+    """Returns the element wise n-th powers (n >= 0 integer np.array broadcastable against the stack) of a stack x
+       of 2x2 matrices by repeated squaring in double-double arithmetic, renormalizing every few squarings."""
+    hi, lo = x
+    n = np.broadcast_to(np.asarray(n), hi.shape[: - 2]).copy()
+    base = (hi.copy(), lo.copy())
+    eye = np.broadcast_to(np.eye(2), hi.shape)
+    pow = (eye.copy(), np.zeros(hi.shape))
+    step = 0
+    # the bases of finished exponents may overflow, but are not used anymore
+    with np.errstate(over='ignore', invalid='ignore'):
+        while np.any(n):
+            odd = (n & 1).astype(bool)[..., None, None]
+            product = dd_matmul(pow, base)
+            pow = (np.where(odd, product[0], pow[0]), np.where(odd, product[1], pow[1]))
+            n = n >> 1
+            if np.any(n):
+                base = dd_matmul(base, base)
+            step += 1
+            if step % every == 0:
+                base, pow = dd_renormalize(base), dd_renormalize(pow)
+    return dd_renormalize(pow)
+
+# matrices with |ad| + |bc| above this bound are not renormalized in float64, as the rounding of their entries alone
+# changes the determinant by more than the drift a rescaling could remove
+RENORMALIZE_MAX_SCALE = 1e3
+
+def det(a, b, c, d):
+    """Returns the determinant ad - bc of float coefficients (or np.array of coefficients) with compensated products,
+       accurate even if the terms cancel, which the plain float determinant of large matrices is not."""
+    p, e = two_prod(a, d)
+    q, f = two_prod(b, c)
+    return (p - q) + (e - f)
+
+def renormalize(m, tol=1e-06):
+    """Returns the stack m of 2x2 float matrices of shape (..., 2, 2) rescaled to determinant +- 1 where the
+       determinant is within tol of +- 1 (and the entries are bounded by RENORMALIZE_MAX_SCALE), which undoes the
+       drift of the determinant in long products."""
+    with np.errstate(over='ignore', divide='ignore', invalid='ignore'):
+        d = det(m[..., 0, 0], m[..., 0, 1], m[..., 1, 0], m[..., 1, 1])
+        scale = np.abs(m[..., 0, 0] * m[..., 1, 1]) + np.abs(m[..., 0, 1] * m[..., 1, 0])
+        near = (np.abs(np.abs(d) - 1.0) <= tol) & (scale <= RENORMALIZE_MAX_SCALE)
+        return m / np.sqrt(np.where(near & (d != .0), np.abs(d), 1.0))[..., None, None]
+
+# backends
+
+class Backend(abc.ABC):
+    """Abstract base class of the numeric backends, defining the number type of the coefficients and its operations.
+       The arithmetic operators of the number type are used directly."""
+
+    Name = None
+    IsExact = False
+
+    @abc.abstractmethod
+    def number(self, x):
+        """Converts a float into the number type of the backend."""
+
+    def to_float(self, x):
+        return float(x)
+
+    @abc.abstractmethod
+    def sqrt(self, x):
+        """Returns the square root of a number x >= 0 of the backend."""
+
+    def context(self):
+        """Returns the context manager within which the arithmetic of the backend is performed."""
+        return contextlib.nullcontext()
+
+class Float64(Backend):
+    Name = 'float64'
+
+    def number(self, x):
+        return float(x)
+
+    def sqrt(self, x):
+        return math.sqrt(x)
+
+class DoubleDoubleBackend(Backend):
+    Name = 'double-double'
+
+    def number(self, x):
+        return x if type(x) is DoubleDouble else DoubleDouble(x)
+
+    def sqrt(self, x):
+        return x.sqrt()
+
+class Exact(Backend):
+    """Backend of exact rational arithmetic. Floats are converted exactly, so products of transformations are exact
+       up to the rounding of the input coefficients, and no renormalization is needed."""
+
+    Name = 'exact'
+    IsExact = True
+
+    @property
+    def Precision(self):
+        return self._precision
+
+    def __init__(self, precision=128):
+        """
+        Parameters
+        ----------
+        precision : int
+            Number of bits of square roots of fractions which are not squares of fractions
+        """
+        self._precision = precision
+
+    def number(self, x):
+        return fractions.Fraction(x)
+
+    def sqrt(self, x):
+        """Returns the square root of a fraction x >= 0, exact if x is the square of a fraction, otherwise rounded
+           down with a relative error below 2^-precision."""
+        x = fractions.Fraction(x)
+        p, q = x.numerator, x.denominator
+        r, s = math.isqrt(p), math.isqrt(q)
+        if r * r == p and s * s == q:
+            return fractions.Fraction(r, s)
+        # sqrt(p / q) = sqrt(p q 4^k) / (q 2^k), whose integer root is off by less than 1 in at least 2^k
+        k = self._precision
+        return fractions.Fraction(math.isqrt((p * q) << (2 * k)), q << k)
+
+class MPMath(Backend):
+    """Backend of the arbitrary precision floats of mpmath with dps decimal digits."""
+
+    Name = 'mpmath'
+
+    @property
+    def Dps(self):
+        return self._dps
+
+    def __init__(self, dps=50):
+        assert mpmath is not None, "The mpmath backend requires the package mpmath!"
+        self._dps = dps
+
+    def number(self, x):
+        with self.context():
+            return mpmath.mpf(x)
+
+    def sqrt(self, x):
+        return mpmath.sqrt(x)
+
+    def context(self):
+        return mpmath.workdps(self._dps)
+
+FLOAT64 = Float64()
+DOUBLE_DOUBLE = DoubleDoubleBackend()
+EXACT = Exact()
+
+_backend = FLOAT64
+
+def backend(name):
+    """Returns the backend of the given name ('float64', 'double-double', 'exact' or 'mpmath'), or name itself if
+       it is a Backend."""
+    if isinstance(name, Backend):
+        return name
+    backends = {'float64': FLOAT64, 'double-double': DOUBLE_DOUBLE, 'exact': EXACT}
+    if name == 'mpmath':
+        return MPMath()
+    assert name in backends, "Unknown backend {}!".format(name)
+    return backends[name]
+
+def get_backend():
+    """Returns the global backend."""
+    return _backend
+
+def set_backend(name):
+    """Sets the global backend, given as Backend or by its name (see backend)."""
+    global _backend
+    _backend = backend(name)
+
+@contextlib.contextmanager
+def using(name):
+    """Context manager setting the global backend within its scope. The previous backend is restored on exit.
+
+    Parameters
+    ----------
+    name : Backend or str
+        Backend or its name (see backend)
+
+    Returns
+    -------
+    Backend
+        Backend used within the scope
+    """
+    global _backend
+    previous = _backend
+    _backend = backend(name)
+    try:
+        yield _backend
+    finally:
+        _backend = previous
+
+def renormalized(backend, a, b, c, d, tol=1e-06):
+    """Returns the coefficients a, b, c, d in the number type of backend rescaled to determinant +- 1 if their
+       determinant is within tol of +- 1, unchanged otherwise and for exact backends (and in float64 for entries
+       beyond RENORMALIZE_MAX_SCALE, see renormalize)."""
+    if backend.IsExact:
+        return a, b, c, d
+    if backend is FLOAT64 and abs(a * d) + abs(b * c) > RENORMALIZE_MAX_SCALE:
+        return a, b, c, d
+    ad_bc = det(a, b, c, d) if backend is FLOAT64 else a * d - b * c
+    ad_bc = - ad_bc if ad_bc < 0 else ad_bc
+    if abs(backend.to_float(ad_bc) - 1.0) > tol:
+        return a, b, c, d
+    s = backend.sqrt(ad_bc)
+    return a / s, b / s, c / s, d / s
@@ -0,0 +1,142 @@
+import collections
+import contextlib
+import functools
+from hypgeo.complex_plane import ComplexNumber, _quantize
+from hypgeo.geometry import Vertical, HalfCircle
+
+CacheInfo = collections.namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+def _key(o):
+    """Returns a hashable key of the argument o, quantized to the equality tolerance of 1e-09. Arguments in the
+       same grid cell share the cached result, while equal arguments in neighbouring cells are computed apart."""
+    if isinstance(o, ComplexNumber):
+        return (type(o), _quantize(o.re), _quantize(o.im))
+    elif isinstance(o, Vertical):
+        return (type(o), _quantize(o.Absc))
+    elif isinstance(o, HalfCircle):
+        return (type(o), _quantize(o.Radius), _quantize(o.Center))
+    elif isinstance(o, float) or isinstance(o, int):
+        return (float, _quantize(float(o)))
+    raise TypeError("%s can not be used as key of the cache!" % str(o))
+
+class LRUCache:
+    """A class representing a bounded cache which evicts the least recently used entry once it is full."""
+
+    @property
+    def MaxSize(self):
+        return self._maxsize
+
+    def __init__(self, maxsize=65536):
+        """
+        Parameters
+        ----------
+        maxsize : int
+            Maximal number of cached entries
+        """
+
+        assert maxsize > 0, "maxsize has to be positive!"
+        self._maxsize = maxsize
+        self._entries = collections.OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        """Returns whether key is cached, without counting a hit or a miss."""
+        return key in self._entries
+
+    def lookup(self, key, compute):
+        """Returns the entry for key, which is computed by calling compute() and stored if it is not cached yet.
+
+        Parameters
+        ----------
+        key : tuple
+            Key of the entry
+        compute : function
+            Computes the entry on a miss
+
+        Returns
+        -------
+        object
+            Cached or computed entry
+        """
+        try:
+            value = self._entries[key]
+        except KeyError:
+            self._misses += 1
+            value = compute()
+            self._entries[key] = value
+            if len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+            return value
+
+        self._hits += 1
+        self._entries.move_to_end(key)
+        return value
+
+    def clear(self):
+        """Removes all entries and resets the statistics."""
+        self._entries.clear()
+        self._hits = 0
+        self._misses = 0
+
+    def info(self):
+        """Returns the hit and miss statistics together with the current and maximal size of instance."""
+        return CacheInfo(self._hits, self._misses, self._maxsize, len(self._entries))
+
+_cache = None
+
+def enable(maxsize=65536):
+    """Enables caching of the memoized constructors with a new cache holding at most maxsize entries."""
+    global _cache
+    _cache = LRUCache(maxsize)
+
+def disable():
+    """Disables caching of the memoized constructors and drops the cache."""
+    global _cache
+    _cache = None
+
+def cache_info():
+    """Returns the statistics of the current cache or None if caching is disabled."""
+    return _cache.info() if _cache is not None else None
+
+def cache_clear():
+    """Clears the current cache."""
+    if _cache is not None:
+        _cache.clear()
+
+@contextlib.contextmanager
+def cached(maxsize=65536):
+    """Context manager enabling a fresh cache within its scope. The previous cache (or the disabled state) is
+       restored on exit.
+
+    Parameters
+    ----------
+    maxsize : int
+        Maximal number of cached entries
+
+    Returns
+    -------
+    LRUCache
+        Cache used within the scope
+    """
+    global _cache
+    previous = _cache
+    _cache = LRUCache(maxsize)
+    try:
+        yield _cache
+    finally:
+        _cache = previous
+
+def memoize(func):
+    """Decorator caching the results of func in the current cache, keyed by its arguments quantized to the equality
+       tolerance. Without an enabled cache func is called directly."""
+    @functools.wraps(func)
+    def _func(*args):
+        cache = _cache
+        if cache is None:
+            return func(*args)
+        return cache.lookup((func,) + tuple(_key(arg) for arg in args), lambda: func(*args))
+    return _func
@@ -3,6 +3,8 @@ import numpy as np
 
 def CheckType(operation):
     def _operation(instance, o):
+        if isinstance(o, ComplexArray):
+            return NotImplemented
         assert type(o) is ComplexNumber or type(o) is float or type(o) is np.float64 or type(o) \
             is int or isinstance(o, ComplexNumber), "%s is not of type \"ComplexNumber\" or \"float\" or \"int\"!" % str(o)
         return operation(instance, o)
@@ -15,8 +17,21 @@ def MapFloat(operation):
         return operation(instance, o)
     return _operation
 
+# real operand types promoted to ComplexNumber by the arithmetic operators
+_REALS = (float, np.float64, int)
+
+def _quantize(x, tol=1e-09):
+    """Returns the float x rounded to the grid of the equality tolerance tol, which is used to hash values
+       that are compared up to that tolerance, or x itself if x / tol is not finite. Equality up to a tolerance is
+       not transitive, so no hash is consistent with it: values within tol of each other only share a hash if
+       they fall into the same grid cell."""
+    q = x / tol
+    return round(q) if math.isfinite(q) else x
+
 class ComplexNumber:
-    """A class representing complex numbers and their algebraic operations."""
+    """A class representing complex numbers and their algebraic operations. Instances are immutable values."""
+
+    __slots__ = ('_re', '_im')
 
     @property
     def re(self):
@@ -39,14 +54,12 @@ class ComplexNumber:
         self._re = re
         self._im = im
 
-    @CheckType
-    @MapFloat
     def __add__(self, o):
         """Adds two complex numbers.
 
         Parameters
         ----------
-        o : ComplexNumber
+        o : ComplexNumber, float or int
             Complex number to be added to instance
 
         Returns
@@ -55,17 +68,18 @@ class ComplexNumber:
             Sum of instance and o
         """
 
-        ret = ComplexNumber(self._re + o.re, self._im + o.im)
-        return ret
+        if isinstance(o, ComplexNumber):
+            return ComplexNumber(self._re + o._re, self._im + o._im)
+        elif type(o) in _REALS:
+            return ComplexNumber(self._re + float(o), self._im)
+        return NotImplemented
 
-    @CheckType
-    @MapFloat
     def __sub__(self, o): 
         """Substracts o from instance.
 
         Parameters
         ----------
-        o : ComplexNumber
+        o : ComplexNumber, float or int
             Complex number to be substracted from instance
 
         Returns
@@ -73,16 +87,18 @@ class ComplexNumber:
         ComplexNumber
             Difference between instance and o
         """    
-        return ComplexNumber(self._re - o.re, self._im - o.im)
+        if isinstance(o, ComplexNumber):
+            return ComplexNumber(self._re - o._re, self._im - o._im)
+        elif type(o) in _REALS:
+            return ComplexNumber(self._re - float(o), self._im)
+        return NotImplemented
 
-    @CheckType
-    @MapFloat
     def __mul__(self, o):
         """Multiplicates two complex numbers.
 
         Parameters
         ----------
-        o : ComplexNumber
+        o : ComplexNumber, float or int
             Complex number to be multiplicated with instance
 
         Returns
@@ -90,8 +106,13 @@ class ComplexNumber:
         ComplexNumber
             Product of instance and o
         """ 
-        return ComplexNumber(self._re * o.re - self._im * o.im,
-            self._re * o.im + o.re * self._im)
+        if isinstance(o, ComplexNumber):
+            return ComplexNumber(self._re * o._re - self._im * o._im,
+                self._re * o._im + o._re * self._im)
+        elif type(o) in _REALS:
+            o = float(o)
+            return ComplexNumber(self._re * o, self._im * o)
+        return NotImplemented
     
     @CheckType
     def __pow__(self, n):
@@ -108,20 +129,25 @@ class ComplexNumber:
             N-th power of instance
         """ 
 
-        ret = self.copy()
-        for i in range(1, n):
-            ret *= self
-        
-        return ret
+        if n < 2:
+            return self.copy()
+
+        # exponentiation by repeated squaring
+        ret, base = None, self
+        while True:
+            if n & 1:
+                ret = base if ret is None else ret * base
+            n >>= 1
+            if n == 0:
+                return ret
+            base = base * base
 
-    @CheckType
-    @MapFloat
     def __truediv__(self, o):
         """Divides instance by o.
 
         Parameters
         ----------
-        o : ComplexNumber
+        o : ComplexNumber, float or int
             Complex number to be used as divisor
 
         Returns
@@ -129,12 +155,31 @@ class ComplexNumber:
         ComplexNumber
             Division between of instance by o
         """ 
-        if type(o) is float or type(o) is np.float64:
+        if isinstance(o, ComplexNumber):
+            norm_sq_inv = 1 / (o._re * o._re + o._im * o._im)
+            return ComplexNumber((self._re * o._re + self._im * o._im) * norm_sq_inv,
+                (- self._re * o._im + o._re * self._im) * norm_sq_inv)
+        elif type(o) in _REALS:
+            o = float(o)
             return ComplexNumber(self._re / o, self._im / o)
+        return NotImplemented
 
-        norm_sq_inv = 1 / o.norm_sq()
-        return ComplexNumber(self._re * o.re + self._im * o.im,
-            - self._re * o.im + o.re * self._im) * norm_sq_inv
+    # Unchecked arithmetic for trusted internal callers, which guarantee that o is a ComplexNumber and
+    # skip the operand dispatch of the operators above.
+
+    def _add(self, o):
+        return ComplexNumber(self._re + o._re, self._im + o._im)
+
+    def _sub(self, o):
+        return ComplexNumber(self._re - o._re, self._im - o._im)
+
+    def _mul(self, o):
+        return ComplexNumber(self._re * o._re - self._im * o._im, self._re * o._im + o._re * self._im)
+
+    def _truediv(self, o):
+        norm_sq_inv = 1 / (o._re * o._re + o._im * o._im)
+        return ComplexNumber((self._re * o._re + self._im * o._im) * norm_sq_inv,
+            (- self._re * o._im + o._re * self._im) * norm_sq_inv)
 
     def __str__(self):
         if self._re == .0 and self._im == .0:
@@ -159,6 +204,12 @@ class ComplexNumber:
         else:
             return False
 
+    def __hash__(self):
+        """Returns the hash of the parts quantized to the equality tolerance. Equal instances near the boundary
+           of a grid cell may hash differently, so sets and dicts only identify instances whose parts are computed
+           alike."""
+        return hash((_quantize(self._re), _quantize(self._im)))
+
     def is_real(self):
         if math.isclose(self._im, .0, abs_tol=1e-09):
             return True, self._re
@@ -176,7 +227,7 @@ class ComplexNumber:
 
     def norm(self):
         """Returns the norm of the instance."""
-        return math.sqrt(self.norm_sq_inv())
+        return math.sqrt(self.norm_sq())
 
     def conj(self):
         """Returns the complex conjugate of instance."""
@@ -205,9 +256,9 @@ class ComplexNumber:
         """ 
         return ComplexNumber(vec[0], vec[1])
 
-    def rnd(min, max, samples):
-        """Returns an array with length n=samples of random complex numbers whose real and imaginary parts
-            are bounded by min from below and by max from above.
+    def rnd(min, max, samples, rng=None):
+        """Returns a batch of n=samples random complex numbers whose real and imaginary parts are bounded by min
+            from below and by max from above.
 
         Parameters
         ----------
@@ -215,22 +266,23 @@ class ComplexNumber:
             lower boundary for real and imaginary part of randomly generated complex numbers  
         max : float
             upper boundary for real and imaginary part of randomly generated complex numbers 
+        samples : int
+            Number of complex numbers
+        rng : np.random.Generator
+            Random number generator, the global numpy random state if None
 
         Returns
         -------
-        ComplexNumber
-            Array of size n=samples of bounded, random complex numbers
+        ComplexArray
+            Batch of size n=samples of bounded, random complex numbers
         """ 
-        rnd_z = []
-        rnds = np.random.uniform(min, max, 2 * samples)
-        for i in range(0, samples):
-            rnd_z.append(ComplexNumber(rnds[2 * i], rnds[2 * i + 1]))
+        rng = rng if rng is not None else np.random
+        rnds = rng.uniform(min, max, (samples, 2))
+        return ComplexArray(rnds[:, 0] + 1j * rnds[:, 1])
 
-        return rnd_z
-
-    def rnd_in_HPlus(min_x, max_x, max_y, samples):
-        """Returns an array with length n=samples of random complex numbers in upper half space whose real part 
-           is within the range [min_x, max_x] and whose imaginary part is bounded by y_max from above
+    def rnd_in_HPlus(min_x, max_x, max_y, samples, rng=None):
+        """Returns a batch of n=samples random complex numbers in upper half space whose real part is within the
+           range [min_x, max_x] and whose imaginary part is within the range (0, max_y]
 
         Parameters
         ----------
@@ -240,17 +292,299 @@ class ComplexNumber:
             upper boundary for real part of randomly generated complex numbers 
         max_y : float
             upper boundary for imaginary part of randomly generated complex numbers  
+        samples : int
+            Number of complex numbers
+        rng : np.random.Generator
+            Random number generator, the global numpy random state if None
 
         Returns
         -------
-        ComplexNumber
-            Array of size n=samples of random complex numbers in upper half space bounded by max_x, min_x, max_y
+        ComplexArray
+            Batch of size n=samples of random complex numbers in upper half space bounded by max_x, min_x, max_y
         """ 
-        return [ComplexNumber(np.random.uniform(min_x, max_x), np.random.uniform(.0, max_y)) for i in range(0, samples)]
+        rng = rng if rng is not None else np.random
+        return ComplexArray(rng.uniform(min_x, max_x, samples) + 1j * (max_y - rng.uniform(.0, max_y, samples)))
 
 _i = ComplexNumber(0, 1)
 
 class RootOfUnity(ComplexNumber):
+    __slots__ = ()
+
     def __init__(self, k, n):
         assert k < n, 'Wrong input parameters k and n! k must be < than n but is {} >= {}'.format(str(k), str(n))
         ComplexNumber.__init__(self, math.cos(2.0 * math.pi * float(k) / float(n)), math.sin(2.0 * math.pi * float(k) / float(n)))
+
+
+def _pow_by_squaring(z, n):
+    """Returns z ** n for an np.array z of complex numbers and an integer (or integer array) n computed by
+       repeated squaring, which needs O(log n) multiplications instead of O(n)."""
+    n = np.asarray(n)
+    assert np.issubdtype(n.dtype, np.integer), "Power has to be an integer or an array of integers!"
+    z, n = np.broadcast_arrays(z, n)
+    base = np.where(n < 0, 1.0 / z, z)
+    n = np.abs(n)
+    ret = np.ones(base.shape, dtype=np.complex128)
+    while np.any(n):
+        odd = (n & 1).astype(bool)
+        ret[odd] *= base[odd]
+        n = n >> 1
+        base = base * base
+    return ret
+
+def _as_complex(z):
+    """Returns a batch of points given as ComplexArray, np.array of type complex of shape (N,) or float np.array
+       of shape (N, 2) as np.array of type complex128."""
+    if isinstance(z, ComplexArray):
+        return z.Values
+    z = np.asarray(z)
+    if np.iscomplexobj(z):
+        return z.astype(np.complex128, copy=False)
+    assert z.shape[-1] == 2, "z has wrong dimension!"
+    return z[..., 0] + 1j * z[..., 1]
+
+def _like(w, z):
+    """Returns the np.array w of type complex in the same layout as the batch z it has been computed from."""
+    if isinstance(z, ComplexArray):
+        return ComplexArray(w)
+    elif np.iscomplexobj(z):
+        return w
+    return np.stack((w.real, w.imag), axis=-1)
+
+class ComplexArray:
+    """A class representing a batch of complex numbers stored in a single np.array of type complex128. All
+       algebraic operations of ComplexNumber are evaluated as one numpy operation over the whole batch."""
+
+    @property
+    def re(self):
+        return self._z.real
+
+    @property
+    def im(self):
+        return self._z.imag
+
+    @property
+    def Values(self):
+        return self._z
+
+    def __init__(self, z):
+        """
+        Parameters
+        ----------
+        z : np.array, list
+            Complex numbers to be stored, converted to an np.array of type complex128
+        """
+
+        self._z = np.asarray(z, dtype=np.complex128)
+
+    def _operand(o):
+        if isinstance(o, ComplexArray):
+            return o._z
+        elif isinstance(o, ComplexNumber):
+            return complex(o.re, o.im)
+        elif type(o) is float or type(o) is np.float64 or type(o) is int:
+            return float(o)
+        elif type(o) is np.ndarray:
+            return o
+        else:
+            raise TypeError("%s is not of type \"ComplexArray\", \"ComplexNumber\", \"float\" or \"int\"!" % str(o))
+
+    def __add__(self, o):
+        """Adds o element wise to instance.
+
+        Parameters
+        ----------
+        o : ComplexArray, ComplexNumber, float or int
+            Complex numbers to be added to instance
+
+        Returns
+        -------
+        ComplexArray
+            Element wise sum of instance and o
+        """
+
+        return ComplexArray(self._z + ComplexArray._operand(o))
+
+    def __radd__(self, o):
+        return ComplexArray(ComplexArray._operand(o) + self._z)
+
+    def __sub__(self, o):
+        """Substracts o element wise from instance.
+
+        Parameters
+        ----------
+        o : ComplexArray, ComplexNumber, float or int
+            Complex numbers to be substracted from instance
+
+        Returns
+        -------
+        ComplexArray
+            Element wise difference between instance and o
+        """
+
+        return ComplexArray(self._z - ComplexArray._operand(o))
+
+    def __rsub__(self, o):
+        return ComplexArray(ComplexArray._operand(o) - self._z)
+
+    def __mul__(self, o):
+        """Multiplicates instance element wise with o.
+
+        Parameters
+        ----------
+        o : ComplexArray, ComplexNumber, float or int
+            Complex numbers to be multiplicated with instance
+
+        Returns
+        -------
+        ComplexArray
+            Element wise product of instance and o
+        """
+
+        return ComplexArray(self._z * ComplexArray._operand(o))
+
+    def __rmul__(self, o):
+        return ComplexArray(ComplexArray._operand(o) * self._z)
+
+    def __truediv__(self, o):
+        """Divides instance element wise by o.
+
+        Parameters
+        ----------
+        o : ComplexArray, ComplexNumber, float or int
+            Complex numbers to be used as divisor
+
+        Returns
+        -------
+        ComplexArray
+            Element wise division of instance by o
+        """
+
+        return ComplexArray(self._z / ComplexArray._operand(o))
+
+    def __rtruediv__(self, o):
+        return ComplexArray(ComplexArray._operand(o) / self._z)
+
+    def __pow__(self, n):
+        """Returns the element wise n-th power of the instance.
+
+        Parameters
+        ----------
+        n : int or np.array of int
+            Power, either one for all elements or one per element
+
+        Returns
+        -------
+        ComplexArray
+            Element wise n-th power of instance
+        """
+
+        return ComplexArray(_pow_by_squaring(self._z, n))
+
+    def __neg__(self):
+        return ComplexArray(- self._z)
+
+    def __len__(self):
+        return len(self._z)
+
+    def __getitem__(self, key):
+        z = self._z[key]
+        if np.ndim(z) == 0:
+            return ComplexNumber(float(z.real), float(z.imag))
+        return ComplexArray(z)
+
+    def __iter__(self):
+        for re, im in zip(self._z.real.tolist(), self._z.imag.tolist()):
+            yield ComplexNumber(re, im)
+
+    def __str__(self):
+        return str(self._z)
+
+    def isclose(self, o):
+        """Returns a boolean np.array which is True where instance and o coincide up to a tolerance of 1e-09
+           in real and imaginary part."""
+        o = ComplexArray._operand(o)
+        return np.isclose(self._z.real, np.real(o), rtol=.0, atol=1e-09) \
+            & np.isclose(self._z.imag, np.imag(o), rtol=.0, atol=1e-09)
+
+    def __eq__(self, o):
+        if isinstance(o, ComplexArray) and o._z.shape != self._z.shape:
+            return False
+        try:
+            return bool(np.all(self.isclose(o)))
+        except TypeError:
+            return False
+
+    __hash__ = None
+
+    def copy(self):
+        """Returns a copy of the instance."""
+        return ComplexArray(self._z.copy())
+
+    def norm_sq(self):
+        """Returns the element wise squared norm of the instance."""
+        return self._z.real * self._z.real + self._z.imag * self._z.imag
+
+    def norm(self):
+        """Returns the element wise norm of the instance."""
+        return np.abs(self._z)
+
+    def conj(self):
+        """Returns the element wise complex conjugate of instance."""
+        return ComplexArray(np.conj(self._z))
+
+    def inv(self):
+        """Returns the element wise inverse of instance."""
+        return ComplexArray(1.0 / self._z)
+
+    def to_vec(self):
+        """Returns instance as np.array of shape (N, 2)."""
+        return np.stack((self._z.real, self._z.imag), axis=-1)
+
+    def from_vec(vec):
+        """Converts a float array of shape (N, 2) into a ComplexArray.
+
+        Parameters
+        ----------
+        vec : np.array
+            Input array whose last axis holds real and imaginary part
+
+        Returns
+        -------
+        ComplexArray
+            Input array converted to ComplexArray
+        """
+        vec = np.asarray(vec, dtype=np.float64)
+        assert vec.shape[-1] == 2, "vec has wrong dimension!"
+        return ComplexArray(vec[..., 0] + 1j * vec[..., 1])
+
+    def to_list(self):
+        """Returns instance as list of ComplexNumber."""
+        return list(self)
+
+    def from_list(numbers):
+        """Converts a list of ComplexNumber into a ComplexArray.
+
+        Parameters
+        ----------
+        numbers : list
+            List of ComplexNumber
+
+        Returns
+        -------
+        ComplexArray
+            List converted to ComplexArray
+        """
+        z = np.empty(len(numbers), dtype=np.complex128)
+        z.real = [n.re for n in numbers]
+        z.imag = [n.im for n in numbers]
+        return ComplexArray(z)
+
+def disk_to_plane(w):
+    """Returns the images of points w (complex or np.array of type complex) of the Poincare disc in the upper half
+       plane under the Cayley transform, mapping the origin to the imaginary unit."""
+    return 1.0j * (1.0 + w) / (1.0 - w)
+
+def plane_to_disk(z):
+    """Returns the images of points z (complex or np.array of type complex) of the upper half plane in the Poincare
+       disc, the inverse of disk_to_plane."""
+    return (z - 1.0j) / (z + 1.0j)
@@ -0,0 +1,356 @@
+import collections
+import math
+from hypgeo.complex_plane import *
+from hypgeo.geometry import GeodesicArray, HalfCircle, Vertical
+from hypgeo.moebius import MoebGen, MoebStack
+from hypgeo.polygon import HyperbolicPolygon
+from hypgeo.reduction import FundamentalDomain
+from hypgeo.words import WordEnumerator, _keys
+
+# images of the base point of a Dirichlet domain are kept if their distance to the real axis exceeds the estimate
+# of their rounding error by this factor
+_ROUNDING_MARGIN = 1e03
+
+def _matrices(generators):
+    """Returns the matrices of shape (N, 2, 2) of a list of MoebGen or a MoebStack asserting determinant 1."""
+    if not isinstance(generators, MoebStack):
+        assert all(isinstance(g, MoebGen) for g in generators), "generators are not of type \"MoebGen\"!"
+        generators = MoebStack.from_list(generators)
+    assert np.allclose(generators.Det, 1.0, rtol=.0, atol=1e-09), 'Only transformations of determinant 1 are supported!'
+    return generators.Matrices.reshape(- 1, 2, 2)
+
+def _inverses(m):
+    """Returns the inverses ((d, - b), (- c, a)) of matrices of determinant 1 of shape (N, 2, 2)."""
+    inv = np.empty_like(m)
+    inv[:, 0, 0], inv[:, 0, 1], inv[:, 1, 0], inv[:, 1, 1] = m[:, 1, 1], - m[:, 0, 1], - m[:, 1, 0], m[:, 0, 0]
+    return inv
+
+def _unique(m, tol):
+    """Returns the matrices of m without the identity and the ones defining the same transformation as a previous
+       one."""
+    first = dict.fromkeys(_keys(np.eye(2)[None], tol, True), - 1)
+    for i, key in enumerate(_keys(m, tol, True)):
+        first.setdefault(key, i)
+    return m[list(first.values())[1:]]
+
+def _products(sides, base, tol):
+    """Returns the products of the side pairings with the base elements (the generators and their inverses) from
+       both sides, the candidates of the next round of the expansion of a domain. Products of an element with its
+       inverse are dropped, as their rounding errors grow with the entries of the factors rather than with their
+       own."""
+    m = np.concatenate([np.matmul(sides[:, None], base[None]).reshape(- 1, 2, 2),
+        np.matmul(base[:, None], sides[None]).reshape(- 1, 2, 2)])
+    size_sides, size_base = np.max(np.abs(sides), axis=(1, 2)), np.max(np.abs(base), axis=(1, 2))
+    scale = np.concatenate([np.outer(size_sides, size_base).ravel(), np.outer(size_base, size_sides).ravel()])
+    trivial = np.max(np.abs(np.abs(m) - np.eye(2)), axis=(1, 2)) <= tol * np.maximum(scale, 1.0)
+    return m[~trivial]
+
+def _candidates(generators, length, tol):
+    """Returns the generators, their inverses and all elements given by words up to the given length."""
+    generators = _matrices(generators)
+    base = _unique(np.concatenate([generators, _inverses(generators)]), tol)
+    # the enumerator adds the inverse letters itself, so its words are freely reduced
+    words, moebs = WordEnumerator(MoebStack(generators), length, tol).enumerate()
+    return base, moebs.Matrices
+
+def _same(m0, m1, tol):
+    return sorted(_keys(m0, tol, True)) == sorted(_keys(m1, tol, True))
+
+def isometric_circles(moebs):
+    """Returns the isometric circles |cz + d| = 1, i.e. the half circles of center - d / c and radius 1 / |c|, of a
+       MoebStack of transformations of determinant 1 with c != 0 as GeodesicArray. The transformation g maps its
+       isometric circle onto the one of its inverse, the points inside onto points outside and vice versa."""
+    c, d = moebs.c, moebs.d
+    assert np.all(c != .0), "Transformations fixing infinity have no isometric circle!"
+    return GeodesicArray(np.zeros(len(c), dtype=bool), - d / c, 1.0 / np.abs(c))
+
+def _envelope(center, radius, lo, hi, tol):
+    """Returns the indices of the half circles on the upper envelope over [lo, hi] from left to right, together with
+       the lowest height of the envelope over [lo, hi] (0 if it does not cover [lo, hi]).
+
+       Circles contained in another one are dropped in one sweep over the circles sorted by their left endpoints.
+       Then both endpoints increase, so two remaining circles with overlapping shadows cross exactly once, the left
+       one lying above the right one left of the crossing. The envelope is built like a convex hull by a stack of
+       circles and the abscissas at which they take over: a circle whose successor takes over before the circle
+       itself does is hidden and removed."""
+    if len(center) == 0:
+        return np.zeros(0, dtype=np.int64), .0
+    left, right = center - radius, center + radius
+    order = np.lexsort((- right, left))
+    reach = np.maximum.accumulate(right[order])
+    order = order[np.concatenate([[True], right[order][1:] > reach[: - 1] + tol])]
+    order = order[(right[order] > lo + tol) & (left[order] < hi - tol)]
+
+    stack, start = [], []
+    for j in order.tolist():
+        x = left[j]
+        while len(stack) > 0:
+            s = stack[- 1]
+            if right[s] <= left[j] + tol:
+                break
+            x = .5 * (center[s] + center[j]) + .5 * (radius[s] ** 2 - radius[j] ** 2) / (center[j] - center[s])
+            if x <= start[- 1] + tol:
+                stack.pop()
+                start.pop()
+                x = left[j]
+                continue
+            break
+        stack.append(j)
+        start.append(x)
+
+    stack, start = np.array(stack, dtype=np.int64), np.array(start)
+    if len(stack) == 0:
+        return stack, .0
+    end = np.minimum(np.append(start[1:], np.inf), right[stack])
+    a, b = np.maximum(start, lo), np.minimum(end, hi)
+    on = b - a > tol
+    stack, a, b = stack[on], a[on], b[on]
+
+    # arcs are concave, so the envelope is lowest at the ends of the arcs, and 0 at gaps between them
+    c, r = center[stack], radius[stack]
+    heights = np.sqrt(np.maximum(np.concatenate([r * r - (a - c) ** 2, r * r - (b - c) ** 2]), .0))
+    covered = len(stack) > 0 and a[0] <= lo + tol and b[- 1] >= hi - tol and np.all(a[1:] <= b[: - 1] + tol)
+    return stack, float(np.min(heights)) if covered else .0
+
+def _translate(m, lo, width):
+    """Returns the products g t^s of the transformations g with c != 0 with the powers of the translation
+       t: z -> z + width moving their isometric circles into [lo, lo + width), together with the neighbouring
+       powers whose isometric circles still reach into [lo, lo + width)."""
+    a, c, d = m[:, 0, 0], m[:, 1, 0], m[:, 1, 1]
+    center, radius = - d / c, 1.0 / np.abs(c)
+    k = np.ceil(radius / width).astype(np.int64)
+    index = np.repeat(np.arange(len(m)), 2 * k + 1)
+    offset = np.arange(len(index)) - np.repeat(np.cumsum(2 * k + 1) - (k + 1), 2 * k + 1)
+    s = (np.floor((center - lo) / width)[index] + offset) * width
+
+    g = m[index].copy()
+    g[:, 0, 1] += a[index] * s
+    g[:, 1, 1] += c[index] * s
+    return g
+
+def ford_domain(generators, length=2, left=None, max_rounds=20, tol=1e-09):
+    """Returns the Ford domain of the group generated by transformations of determinant 1, the part of the exterior
+       of all isometric circles lying in a strip [left, left + T) if infinity is fixed by translations z -> z + T.
+       The sides of the domain are the isometric circles of the upper envelope, paired by the transformations they
+       belong to, and the vertical boundaries of the strip, paired by the translations.
+
+       The candidates are the elements of words up to the given length. In every round the envelope of the
+       candidates and the current sides is computed, then the products of the side pairings with the generators
+       and their inverses become the new candidates, except those whose circles lie below the lowest point of the
+       envelope. Rounds stop once the sides do not change anymore.
+
+    Parameters
+    ----------
+    generators : list, MoebStack
+        Generators (Moeb) of the group, which must not contain hyperbolic transformations fixing infinity
+    length : int
+        Maximal length of the words of the initial candidates
+    left : float
+        Left boundary of the strip, - T / 2 if None
+    max_rounds : int
+        Maximal number of rounds
+    tol : float
+        Tolerance of the comparison of matrices and abscissas
+
+    Returns
+    -------
+    FundamentalDomain
+        Fundamental polygon with its side pairings
+    """
+    base, candidates = _candidates(generators, length, tol)
+    sides, width = np.zeros((0, 2, 2)), None
+    for i in range(0, max_rounds):
+        m = _unique(np.concatenate([sides, candidates]), tol)
+        a, b, c, d = m[:, 0, 0], m[:, 0, 1], m[:, 1, 0], m[:, 1, 1]
+        fixing = np.abs(c) <= tol
+        assert np.allclose(np.abs(a[fixing]), 1.0, rtol=.0, atol=1e-06), \
+            'Groups with hyperbolic transformations fixing infinity are not supported!'
+        shifts = np.abs(b[fixing] / d[fixing])
+        shifts = shifts[shifts > tol]
+        if len(shifts) > 0:
+            width = float(np.min(shifts)) if width is None else min(width, float(np.min(shifts)))
+
+        m = m[~fixing]
+        if width is not None:
+            lo = - .5 * width if left is None else left
+            hi = lo + width
+            m = _unique(_translate(m, lo, width), tol)
+        else:
+            lo, hi = - np.inf, np.inf
+        on, floor = _envelope(- m[:, 1, 1] / m[:, 1, 0], 1.0 / np.abs(m[:, 1, 0]), lo, hi, tol)
+
+        converged = i > 0 and _same(m[on], sides, tol)
+        sides = m[on]
+        if converged:
+            break
+        candidates = _products(sides, base, tol)
+        candidates = candidates[np.abs(candidates[:, 1, 0]) * (floor + tol) < 1.0]
+
+    assert len(sides) > 0 or width is not None, "The group has no isometric circles!"
+    center, radius = - sides[:, 1, 1] / sides[:, 1, 0], 1.0 / np.abs(sides[:, 1, 0])
+    lines = [HalfCircle(float(r), float(x)) for x, r in zip(center, radius)]
+    pairings = list(MoebStack(sides))
+    top = 2.0 * float(np.max(radius, initial=.0)) + 1.0
+    if width is None:
+        interior = ComplexNumber(float(np.mean(center)), top)
+    else:
+        interior = ComplexNumber(.5 * (lo + hi), top)
+        lines = [Vertical(float(lo))] + lines + [Vertical(float(hi))]
+        t = MoebStack(np.array([[[1.0, width], [.0, 1.0]], [[1.0, - width], [.0, 1.0]]]))
+        pairings = [t[0]] + pairings + [t[1]]
+    return FundamentalDomain(HyperbolicPolygon(lines, interior, tol), pairings)
+
+def _bisectors(p, q, w, tol):
+    """Returns the geodesic lines of the points equidistant to p and q (complex np.array) as list of GeodesicLine,
+       given the images w of q in the Poincare disc around p. The bisectors are vertical lines if y_p = y_q, otherwise
+       their ideal endpoints are the ends (h +- i sqrt(1 - h^2)) w / h of the chords of the Klein model at distance
+       h = |w| from the center, mapped back to HPlus. 1 - h^2 = 4 Im(u) / |u + i|^2 is taken from the image
+       u = (q - Re(p)) / Im(p) of q to keep the ends accurate close to the unit circle."""
+    u = (q - p.real) / p.imag
+    h = np.abs(w)
+    s = 2.0 * np.sqrt(u.imag) / np.abs(u + 1.0j)
+    ends = [(h + 1.0j * sign * s) * w / h for sign in (- 1.0, 1.0)]
+    vertical = np.isclose(q.imag, p.imag, rtol=.0, atol=tol * np.maximum(q.imag, p.imag))
+    x0, x1 = (p.real + p.imag * np.real(1.0j * (1.0 + e) / (1.0 - e)) for e in ends)
+    x0, x1 = np.where(vertical, .5 * (p.real + q.real), x0), np.where(vertical, np.inf, x1)
+    return GeodesicArray.line_between(x0, x1).to_list()
+
+def _intersection(theta, g, tol):
+    """Returns the indices of the half planes <x, (cos theta, sin theta)> <= 1 - g of the Klein model whose boundary
+       chords bound their intersection with the unit disc in segments of positive length, in counterclockwise
+       order, together with the intersection given as tuple of the ends of its edges clipped to the unit disc and
+       the normals and distances of all of its edges (see _support).
+
+       The half planes are sorted by the angles of their normals and intersected with a deque as in the half plane
+       intersection for convex polygons, where a half plane bounded by a line through the last vertex is dropped.
+       A square around the unit disc keeps the intersection bounded. The chords are given by their distances g from
+       the unit circle, and the positions of vertices on them are expanded in g and the half angles between their
+       normals, which keeps them accurate for chords close to the unit circle (elements close to the limit set),
+       whose vertices cancel in coordinates."""
+    theta = np.concatenate([theta, [- .5 * math.pi, .0, .5 * math.pi, math.pi]])
+    g = np.concatenate([g, np.full(4, - 1.0)])
+    order = np.lexsort((- g, theta))
+    order = order[np.concatenate([[True], np.diff(theta[order]) > 1e-12])]
+    # chords close to the unit circle are compared relative to their distance from it
+    scale = np.clip(g * (2.0 - g), .0, 1.0)
+
+    def outside(k, i, j):
+        # <n_k, v> - (1 - g_k) for the vertex v of the chords i and j, where
+        # sin(A) + sin(B) - sin(A + B) = 4 sin(A / 2) sin(B / 2) sin((A + B) / 2)
+        a, b = theta[j] - theta[k], theta[k] - theta[i]
+        n = (4.0 * math.sin(.5 * a) * math.sin(.5 * b) * math.sin(.5 * (a + b)) - g[i] * math.sin(a)
+            - g[j] * math.sin(b) + g[k] * math.sin(a + b))
+        return n / math.sin(theta[j] - theta[i]) >= - tol * scale[k]
+
+    def position(k, j):
+        # position t of the vertex (1 - g_k + i t) n_k of the chords k and j on the chord k
+        a = theta[j] - theta[k]
+        return (2.0 * math.sin(.5 * a) ** 2 - g[j] + g[k] * math.cos(a)) / math.sin(a)
+
+    queue = collections.deque()
+    for k in order.tolist():
+        while len(queue) >= 2 and outside(k, queue[- 2], queue[- 1]):
+            queue.pop()
+        while len(queue) >= 2 and outside(k, queue[0], queue[1]):
+            queue.popleft()
+        queue.append(k)
+    while len(queue) >= 3 and outside(queue[0], queue[- 2], queue[- 1]):
+        queue.pop()
+    while len(queue) >= 3 and outside(queue[- 1], queue[0], queue[1]):
+        queue.popleft()
+
+    # the edge of queue[k] runs from the vertex with its predecessor to the vertex with its successor
+    queue = np.array(queue)
+    t0 = np.array([position(k, j) for k, j in zip(queue, np.roll(queue, 1))])
+    t1 = np.array([position(k, j) for k, j in zip(queue, np.roll(queue, - 1))])
+    half = np.sqrt(np.maximum(g[queue] * (2.0 - g[queue]), .0))
+    a, b = np.maximum(t0, - half), np.minimum(t1, half)
+    on = (b - a > tol * half) & (queue < len(theta) - 4)
+
+    # points of an edge are (h + i t) n for the normal n, the ends of the clipped edges and the arcs of the unit
+    # circle inside of the intersection bound its part in the unit disc
+    normal = np.cos(theta[queue]) + 1.0j * np.sin(theta[queue])
+    h = 1.0 - g[queue]
+    ends = np.concatenate([(h + 1.0j * a) * normal, (h + 1.0j * b) * normal])[np.tile(b > a, 2)]
+    return queue[on], (ends, normal, h)
+
+def _support(polygon, u, tol, chunk=4096):
+    """Returns the support function max <x, u> over the points x of a convex polygon in the unit disc for unit
+       directions u (complex np.array), evaluated in chunks of directions. The polygon is given as in
+       _intersection, the maximum is attained at the ends of its clipped edges or at u itself if u lies in it."""
+    ends, normal, h = polygon
+    result = np.empty(len(u))
+    for i in range(0, len(u), chunk):
+        v = np.conj(u[i: i + chunk, None])
+        inside = np.all((v * normal).real <= h + tol, axis=1)
+        result[i: i + chunk] = np.where(inside, 1.0, np.max((v * ends).real, axis=1, initial=- np.inf))
+    return result
+
+def dirichlet_domain(generators, base, length=2, max_rounds=20, tol=1e-09):
+    """Returns the Dirichlet domain of the group generated by transformations of determinant 1 around the point
+       base, the points which are at least as close to base as to any point of its orbit. The sides are the
+       bisectors of base and its images g(base), paired by the inverses of g.
+
+       Mapping base to the center of the Klein model turns the bisectors into chords and the domain into the
+       intersection of Euclidean half planes, which is computed after sorting the chords by the directions of their
+       normals. The candidates are expanded in rounds as in ford_domain, dropping the chords which do not cut the
+       current domain, i.e. whose distance from the center exceeds the support function of the domain in the
+       direction of their normal.
+
+    Parameters
+    ----------
+    generators : list, MoebStack
+        Generators (Moeb) of the group
+    base : ComplexNumber
+        Center of the domain, which must not be fixed by an element of the group but the identity
+    length : int
+        Maximal length of the words of the initial candidates
+    max_rounds : int
+        Maximal number of rounds
+    tol : float
+        Tolerance of the comparison of matrices and positions
+
+    Returns
+    -------
+    FundamentalDomain
+        Fundamental polygon with its side pairings
+    """
+    assert type(base) is ComplexNumber, "base is not of type \"ComplexNumber\"!"
+    assert base.im > .0, "base is not contained in HPlus!"
+    p = complex(base.re, base.im)
+    base_moebs, candidates = _candidates(generators, length, tol)
+    sides, polygon = np.zeros((0, 2, 2)), None
+    for i in range(0, max_rounds):
+        m = _unique(np.concatenate([sides, candidates]), tol)
+        # Im(g(p)) = Im(p) / |c p + d|^2 for determinant 1, which unlike the quotient does not cancel and stays
+        # positive for elements close to the limit set
+        den = m[:, 1, 0] * p + m[:, 1, 1]
+        q = ((m[:, 0, 0] * p + m[:, 0, 1]) / den).real + 1.0j * p.imag / np.abs(den) ** 2
+
+        # images of base in the Poincare disc around base, |w| = tanh(d / 2) is also the distance of the chord, whose
+        # distance 1 - h = (1 - h^2) / (1 + h) from the unit circle is taken from 1 - h^2 = 4 Im(u) / |u + i|^2
+        u = (q - p.real) / p.imag
+        w = (u - 1.0j) / (u + 1.0j)
+        h = np.abs(w)
+        assert np.all(h > tol), "base is fixed by an element of the group!"
+        g = 4.0 * u.imag / np.abs(u + 1.0j) ** 2 / (1.0 + h)
+
+        # the bisectors of images of base whose distance to the real axis is within the rounding of their position
+        # (elements close to the limit set) are lost in the rounding
+        error = np.finfo(np.float64).eps * (np.abs(m[:, 0, 0] * p) + np.abs(m[:, 0, 1]) + np.abs(q) *
+            (np.abs(m[:, 1, 0] * p) + np.abs(m[:, 1, 1]))) / np.abs(den)
+        keep = q.imag > _ROUNDING_MARGIN * error
+        m, q, w, h, g = m[keep], q[keep], w[keep], h[keep], g[keep]
+        if polygon is not None:
+            keep = h < _support(polygon, w / h, tol) + tol
+            m, q, w, h, g = m[keep], q[keep], w[keep], h[keep], g[keep]
+        on, polygon = _intersection(np.angle(w), g, tol)
+
+        converged = i > 0 and _same(m[on], sides, tol)
+        sides, images, chords = m[on], q[on], w[on]
+        if converged:
+            break
+        candidates = _products(sides, base_moebs, tol)
+
+    return FundamentalDomain(HyperbolicPolygon(_bisectors(p, images, chords, tol), base, tol),
+        list(MoebStack(_inverses(sides))))
@@ -0,0 +1,71 @@
+from hypgeo.complex_plane import *
+from hypgeo.complex_plane import _as_complex
+from hypgeo import geometry
+from hypgeo.moebius import MoebGen, MoebStack
+from hypgeo.transformations import ellip_0, ellip_0_batch, loxod, loxod_batch, parab, parab_batch
+
+class Flow(geometry.Flow):
+    """A class representing a one parameter family of Moebius transformations t -> moeb_param(t), which is evaluated
+       on whole time grids at once: batch maps an np.array of T flow parameters to the MoebStack of the T
+       transformations, typically by a closed form (see ellip_0_batch, loxod_batch and parab_batch), so that the
+       trajectories of N points are computed in one vectorized pass instead of T * N calls of Moeb."""
+
+    def __init__(self, moeb_param, batch=None):
+        """
+        Parameters
+        ----------
+        moeb_param : function
+            Maps a flow parameter (float) to a MoebGen
+        batch : function
+            Maps flow parameters (np.array of shape (T,)) to a MoebStack, if None moeb_param is evaluated for each
+            flow parameter
+        """
+
+        super().__init__(moeb_param)
+        self._batch = batch
+
+    def __call__(self, t, x=None):
+        """Returns the transformation for a flow parameter t, or the image of x under it. For an np.array of flow
+           parameters returns the MoebStack of the transformations, or the trajectories of x (see trajectories)."""
+        if np.ndim(t) == 0:
+            return super().__call__(t, x)
+        if x is not None:
+            return self.trajectories(t, x)
+        return self.stack(t)
+
+    def stack(self, t):
+        """Returns the transformations for the flow parameters t (np.array of shape (T,)) as MoebStack."""
+        t = np.atleast_1d(np.asarray(t, dtype=np.float64))
+        if self._batch is not None:
+            return self._batch(t)
+        return MoebStack.from_list([self._moeb_param(float(x)) for x in t])
+
+    def trajectories(self, t, z):
+        """Returns the trajectories of a batch of points.
+
+        Parameters
+        ----------
+        t : np.array
+            Flow parameters of shape (T,)
+        z : ComplexArray, np.array
+            N points given as ComplexArray, complex np.array of shape (N,) or float np.array of shape (N, 2)
+
+        Returns
+        -------
+        np.array
+            Complex np.array of shape (T, N) holding the images of the N points for the T flow parameters
+        """
+        return self.stack(t).outer(z)
+
+    def conj(self, o):
+        """Returns the flow t -> moeb_param(t).conj(o) conjugated with the Moebius transformation o, e.g. the
+           rotations around a point u are the rotations around the imaginary unit conjugated with moeb_to(u, _i)."""
+        assert isinstance(o, MoebGen), "o is not of type \"MoebGen\"!"
+        moeb_param, batch = self._moeb_param, self._batch
+        return Flow(lambda t: moeb_param(t).conj(o), None if batch is None else lambda t: batch(t).conj(o))
+
+# the one parameter subgroups of transformations
+
+rotation = Flow(ellip_0, ellip_0_batch)
+dilation = Flow(loxod, loxod_batch)
+translation = Flow(parab, parab_batch)
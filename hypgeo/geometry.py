@@ -1,15 +1,17 @@
 import enum
 from hypgeo.complex_plane import *
+from hypgeo.complex_plane import _quantize, _as_complex
 import math
 
 class GeodesicLine:
+    """Base class of geodesic lines in the upper half plane. Instances are immutable values."""
+
+    __slots__ = ()
+
     def line_trough(z0, z1):
-        assert z0 != z1, "z0 and z1 have to be different in order to determine a geodesic line in upper half plane!"
         assert type(z0) is ComplexNumber, "z0 is not of type \"ComplexNumber\"!"
         assert type(z1) is ComplexNumber, "z1 is not of type \"ComplexNumber\"!"
         assert z0 != z1, "A line in HPlus can only be determined by two different complex numbers!"
-        if z0.im:
-            dummy = .0
         assert z0.im > .0, "z0 is not contained in HPlus! Imaginary part is {}".format(str(z0.im))
         assert z1.im > .0, "z1 is not contained in HPlus! Imaginary part is {}".format(str(z1.im))
 
@@ -24,17 +26,49 @@ class GeodesicLine:
             radius = 1.0 / ( 2.0 * (abs(x1 - x0))) * math.sqrt(((x1 - x0) ** 2 + (y1 - y0) ** 2) * ((x1 - x0) ** 2 + (y1 + y0) ** 2))
             return HalfCircle(radius, center)
 
+    def line_between(x0, x1):
+        """Returns the geodesic line with the ideal endpoints x0 and x1.
+
+        Parameters
+        ----------
+        x0 : float
+            First endpoint on the real axis, math.inf for the point at infinity
+        x1 : float
+            Second endpoint on the real axis, math.inf for the point at infinity
+
+        Returns
+        -------
+        GeodesicLine
+            Vertical line if one of the endpoints is infinite, half circle otherwise
+        """
+        assert x0 != x1, "A line in HPlus can only be determined by two different endpoints!"
+        if math.isinf(x1):
+            return Vertical(x0)
+        elif math.isinf(x0):
+            return Vertical(x1)
+        return HalfCircle(.5 * abs(x1 - x0), .5 * (x0 + x1))
+
     def __init__(self):
         pass
 
 class Vertical(GeodesicLine):
+    __slots__ = ('_absc',)
+
     @property
     def Absc(self):
         return self._absc
 
+    @property
+    def Level(self):
+        return self.level
+
     def __init__(self, absc):
         self._absc = absc
 
+    def level(self, x, y):
+        """Returns the level function of instance, which is negative left and positive right of the line."""
+        return x - self._absc
+
     def __eq__(self, o):
         if type(o) != Vertical:
             return False
@@ -44,19 +78,26 @@ class Vertical(GeodesicLine):
             else: 
                 return False
 
-    def rnd(min_absc, max_absc, samples):
-        rnd_v = []
-        Absc = np.random.uniform(min_absc, max_absc, samples)
-
-        for absc in Absc:       
-            rnd_v.append(Vertical(absc))
+    def __hash__(self):
+        return hash(_quantize(self._absc))
 
-        return rnd_v
+    def rnd(min_absc, max_absc, samples, rng=None):
+        """Returns a GeodesicArray of n=samples random vertical lines with abscissa in [min_absc, max_absc], drawn by
+           rng (np.random.Generator) or the global numpy random state if None."""
+        rng = rng if rng is not None else np.random
+        return GeodesicArray(np.ones(samples, dtype=bool), rng.uniform(min_absc, max_absc, samples),
+            np.full(samples, np.inf))
 
     def get_two_points(self):
         return ComplexNumber(self._absc, 1.0), ComplexNumber(self._absc, 10.0)
 
+    def endpoints(self):
+        """Returns the ideal endpoints of instance on the real axis, math.inf standing for the point at infinity."""
+        return self._absc, math.inf
+
 class VerticalConj(Vertical):
+    __slots__ = ()
+
     def __init__(self, absc):
         Vertical.__init__(self, absc)
 
@@ -64,6 +105,8 @@ class VerticalConj(Vertical):
         return ComplexNumber(self._absc, - 1.0), ComplexNumber(self._absc, - 10.0)
 
 class HalfCircle(GeodesicLine):
+    __slots__ = ('_radius', '_center')
+
     @property
     def Radius(self):       
         return self._radius
@@ -74,17 +117,24 @@ class HalfCircle(GeodesicLine):
 
     @property
     def Level(self):
-        return self._level
+        return self.level
 
     def __init__(self, radius, center):
         self._radius = radius
         self._center = center
-        self._level = lambda x, y: (x - self._center) * (x - self._center) + (y - self._center) * (y - self._center) - self._radius * self._radius
+
+    def level(self, x, y):
+        """Returns the level function of instance, which is negative inside and positive outside of the circle."""
+        return (x - self._center) * (x - self._center) + y * y - self._radius * self._radius
 
     def get_two_points(self):
         return ComplexNumber(self._center + self._radius * math.sin(math.pi / 4.0), self._radius * math.cos(math.pi / 4.0)), \
                 ComplexNumber(self._center - self._radius * math.sin(math.pi / 4.0), self._radius * math.cos(math.pi / 4.0))
 
+    def endpoints(self):
+        """Returns the ideal endpoints of instance on the real axis."""
+        return self._center - self._radius, self._center + self._radius
+
     def __eq__(self, o):
         if type(o) != HalfCircle:
             return False
@@ -94,29 +144,186 @@ class HalfCircle(GeodesicLine):
             else: 
                 return False
 
-    def rnd(max_r, min_c, max_c, samples):
-        rnd_c = []
-        R, C = np.random.uniform(.0, max_r, samples), np.random.uniform(min_c, max_c, samples)
+    def __hash__(self):
+        return hash((_quantize(self._radius), _quantize(self._center)))
 
-        for i in range(0, samples):
-            rnd_c.append(HalfCircle(R[i], C[i]))
-
-        return rnd_c
+    def rnd(max_r, min_c, max_c, samples, rng=None):
+        """Returns a GeodesicArray of n=samples random half circles with radius in (0, max_r] and center in
+           [min_c, max_c], drawn by rng (np.random.Generator) or the global numpy random state if None."""
+        rng = rng if rng is not None else np.random
+        R, C = max_r - rng.uniform(.0, max_r, samples), rng.uniform(min_c, max_c, samples)
+        return GeodesicArray(np.zeros(samples, dtype=bool), C, R)
 
 unit_circle = HalfCircle(1.0, .0)
 def unit_circle_r(r):
     return HalfCircle(r, .0)
 
 class HalfCircleConj(HalfCircle):
+    __slots__ = ()
+
     def __init__(self, radius, center):
-        self._radius = radius
-        self._center = center
         HalfCircle.__init__(self, radius, center)
 
     def get_two_points(self):
         return ComplexNumber(self._center + self._radius * math.sin(math.pi / 4.0), - self._radius * math.cos(math.pi / 4.0)), \
                 ComplexNumber(self._center - self._radius * math.sin(math.pi / 4.0), - self._radius * math.cos(math.pi / 4.0))
 
+class GeodesicArray:
+    """A class representing a batch of geodesic lines in the upper half plane stored column wise: a mask marking the
+       vertical lines, their abscissa (vertical lines) or center (half circles) and their radius, which is np.inf
+       for vertical lines."""
+
+    @property
+    def IsVertical(self):
+        return self._vertical
+
+    @property
+    def Center(self):
+        return self._center
+
+    @property
+    def Radius(self):
+        return self._radius
+
+    def __init__(self, vertical, center, radius):
+        """
+        Parameters
+        ----------
+        vertical : np.array of bool
+            Mask which is True for vertical lines and False for half circles
+        center : np.array of float
+            Abscissa of vertical lines and center of half circles
+        radius : np.array of float
+            Radius of half circles, ignored for vertical lines
+        """
+
+        self._vertical = np.asarray(vertical, dtype=bool)
+        self._center = np.asarray(center, dtype=np.float64)
+        self._radius = np.where(self._vertical, np.inf, np.asarray(radius, dtype=np.float64))
+
+    def _from_columns(vertical, center, radius):
+        """Returns a GeodesicArray viewing the given columns without copying them, the radius of vertical lines has
+           to be np.inf already."""
+        lines = GeodesicArray.__new__(GeodesicArray)
+        lines._vertical, lines._center, lines._radius = vertical, center, radius
+        return lines
+
+    def line_trough(z0, z1):
+        """Returns the geodesic lines through the pairs of points z0 and z1.
+
+        Parameters
+        ----------
+        z0 : ComplexArray, np.array
+            First points given as ComplexArray, complex np.array of shape (N,) or float np.array of shape (N, 2)
+        z1 : ComplexArray, np.array
+            Second points in the same layout as z0
+
+        Returns
+        -------
+        GeodesicArray
+            Geodesic lines through z0 and z1, vertical where the real parts of z0 and z1 coincide up to 1e-09
+        """
+        z0, z1 = _as_complex(z0), _as_complex(z1)
+        x0, y0, x1, y1 = z0.real, z0.imag, z1.real, z1.imag
+        assert np.all(y0 > .0), "z0 is not contained in HPlus!"
+        assert np.all(y1 > .0), "z1 is not contained in HPlus!"
+        assert not np.any(np.isclose(x0, x1, rtol=.0, atol=1e-09) & np.isclose(y0, y1, rtol=.0, atol=1e-09)), \
+            "A line in HPlus can only be determined by two different complex numbers!"
+
+        vertical = np.isclose(x0, x1, rtol=.0, atol=1e-09)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            dx = x1 - x0
+            center = .5 * (y1 * y1 - y0 * y0 - x0 * x0 + x1 * x1) / dx
+            radius = 1.0 / (2.0 * np.abs(dx)) * np.sqrt((dx * dx + (y1 - y0) ** 2) * (dx * dx + (y1 + y0) ** 2))
+        return GeodesicArray(vertical, np.where(vertical, x0, center), radius)
+
+    def line_between(x0, x1):
+        """Returns the geodesic lines with the ideal endpoints x0 and x1.
+
+        Parameters
+        ----------
+        x0 : np.array
+            First endpoints on the real axis, np.inf for the point at infinity
+        x1 : np.array
+            Second endpoints on the real axis, np.inf for the point at infinity
+
+        Returns
+        -------
+        GeodesicArray
+            Geodesic lines between x0 and x1, vertical where one of the endpoints is infinite
+        """
+        x0, x1 = np.asarray(x0, dtype=np.float64), np.asarray(x1, dtype=np.float64)
+        assert not np.any(x0 == x1), "A line in HPlus can only be determined by two different endpoints!"
+        inf_0, inf_1 = np.isinf(x0), np.isinf(x1)
+        vertical = inf_0 | inf_1
+        with np.errstate(invalid='ignore'):
+            return GeodesicArray(vertical, np.where(inf_1, x0, np.where(inf_0, x1, .5 * (x0 + x1))), .5 * np.abs(x1 - x0))
+
+    def endpoints(self):
+        """Returns the ideal endpoints of the lines as pair of np.array, np.inf standing for the point at infinity."""
+        return np.where(self._vertical, self._center, self._center - self._radius), \
+            np.where(self._vertical, np.inf, self._center + self._radius)
+
+    def __len__(self):
+        return len(self._vertical)
+
+    def __getitem__(self, key):
+        if np.ndim(self._vertical[key]) > 0:
+            return GeodesicArray(self._vertical[key], self._center[key], self._radius[key])
+        elif self._vertical[key]:
+            return Vertical(self._center[key].item())
+        return HalfCircle(self._radius[key].item(), self._center[key].item())
+
+    def __iter__(self):
+        for i in range(0, len(self._vertical)):
+            yield self[i]
+
+    def get_two_points(self):
+        """Returns two distinct points on each line as pair of ComplexArray."""
+        s = self._radius * math.sin(math.pi / 4.0)
+        with np.errstate(invalid='ignore'):
+            z0 = np.where(self._vertical, self._center + 1.0j, self._center + s + 1.0j * s)
+            z1 = np.where(self._vertical, self._center + 10.0j, self._center - s + 1.0j * s)
+        return ComplexArray(z0), ComplexArray(z1)
+
+    def isclose(self, o):
+        """Returns a boolean np.array which is True where the lines of instance and o coincide up to a tolerance
+           of 1e-09 in abscissa, center and radius."""
+        o = o if isinstance(o, GeodesicArray) else GeodesicArray.from_list([o])
+        return (self._vertical == o.IsVertical) & np.isclose(self._center, o.Center, rtol=.0, atol=1e-09) \
+            & (self._vertical | np.isclose(self._radius, o.Radius, rtol=.0, atol=1e-09))
+
+    def __eq__(self, o):
+        if not isinstance(o, GeodesicArray) and type(o) is not Vertical and type(o) is not HalfCircle:
+            return False
+        if isinstance(o, GeodesicArray) and len(o) != len(self):
+            return False
+        return bool(np.all(self.isclose(o)))
+
+    __hash__ = None
+
+    def to_list(self):
+        """Returns instance as list of Vertical and HalfCircle."""
+        return list(self)
+
+    def from_list(lines):
+        """Converts a list of Vertical and HalfCircle into a GeodesicArray.
+
+        Parameters
+        ----------
+        lines : list
+            List of Vertical and HalfCircle
+
+        Returns
+        -------
+        GeodesicArray
+            List converted to GeodesicArray
+        """
+        vertical = np.array([isinstance(l, Vertical) for l in lines], dtype=bool)
+        center = np.array([l.Absc if isinstance(l, Vertical) else l.Center for l in lines], dtype=np.float64)
+        radius = np.array([np.inf if isinstance(l, Vertical) else l.Radius for l in lines], dtype=np.float64)
+        return GeodesicArray(vertical, center, radius)
+
 class Position(enum.Enum):
     IN = 1
     OUT = 2
@@ -130,18 +337,61 @@ def opposite(position):
     else:
         return Position.ON
 
+def _levels(vertical, center, radius, z):
+    """Returns the level functions of the geodesic lines given column wise by vertical, center and radius (arrays of
+       shape (M, 1)) evaluated at the points z (np.array of type complex of shape (N,)) as matrix of shape (M, N).
+       The level (|z - c|^2 - r^2) / 2r of a half circle is normalized by its diameter, so that near the line both
+       levels approximate the signed euclidean distance to it."""
+    x, y = z.real, z.imag
+    with np.errstate(invalid='ignore'):
+        return np.where(vertical, x - center, ((x - center) * (x - center) + y * y - radius * radius) / (2.0 * radius))
+
+def _classify(levels, tol):
+    """Returns the positions (values of Position) encoded by the signs of levels as np.array of type int8."""
+    return np.where(levels < - tol, np.int8(Position.IN.value),
+        np.where(levels > tol, np.int8(Position.OUT.value), np.int8(Position.ON.value))).astype(np.int8)
+
 class HalfSpace:
-    def __init__(self, line):
+    """A class representing the half spaces bounded by a geodesic line. The half space is the inside of a half
+       circle or the left side of a vertical line, and the respective other side for its complement."""
+
+    @property
+    def Line(self):
+        return self._line
+
+    @property
+    def IsComplement(self):
+        return self._sign < .0
+
+    @property
+    def Sign(self):
+        return self._sign
+
+    def __init__(self, line, complement=False):
+        """
+        Parameters
+        ----------
+        line : GeodesicLine
+            Geodesic line bounding the half space
+        complement : bool
+            Whether the half space lies outside of the half circle or right of the vertical line
+        """
+
         self._line = line
-        
+        self._sign = - 1.0 if complement else 1.0
+
+    def complement(self):
+        """Returns the complementary half space of instance."""
+        return HalfSpace(self._line, not self.IsComplement)
+
     def position(self, x):
         if type(x) is np.array or type(x) is np.ndarray or type(x) is list:
             assert len(x) == 2, "z has wrong dimension!"
         elif type(x) is ComplexNumber:
-            x = x.ToVector()
+            x = x.to_vec()
         else:
             raise Exception("Argument z is neither of type array nor type ComplexNumber!") 
-        level = self._line.Level(x[0], x[1])
+        level = self._sign * self._line.Level(x[0], x[1])
 
         if level < .0:
             return Position.IN
@@ -149,22 +399,114 @@ class HalfSpace:
             return Position.ON
         else:
             return Position.OUT
-                    
-    def rnd(min_re, max_re, max_im, samples):
-        rnd_z = []
-        Re, Im = np.random.uniform(min_re, max_re, samples), np.random.uniform(.0, max_im, samples)
 
-        for i in range(0, samples):
-            rnd_z.append(ComplexNumber(Re[i], Im[i]))
-
-        return rnd_z
+    def _columns(spaces):
+        lines = GeodesicArray.from_list([h.Line for h in spaces])
+        sign = np.array([h.Sign for h in spaces])
+        return lines.IsVertical[:, None], lines.Center[:, None], lines.Radius[:, None], sign[:, None]
+
+    def levels(self, z):
+        """Returns the level function of instance for a batch of points, which is negative inside and positive
+           outside of the half space. Near the line it approximates the signed euclidean distance to the line.
+
+        Parameters
+        ----------
+        z : ComplexArray, np.array
+            Points given as ComplexArray, complex np.array of shape (N,) or float np.array of shape (N, 2)
+
+        Returns
+        -------
+        np.array
+            Level function at the points
+        """
+        vertical, center, radius, sign = HalfSpace._columns([self])
+        return (sign * _levels(vertical, center, radius, _as_complex(z)))[0]
+
+    def position_batch(self, z, tol=1e-09):
+        """Classifies a batch of points as inside, outside or on the boundary of instance.
+
+        Parameters
+        ----------
+        z : ComplexArray, np.array
+            Points given as ComplexArray, complex np.array of shape (N,) or float np.array of shape (N, 2)
+        tol : float
+            Points whose level function is within tol of zero, i.e. about within the euclidean distance tol of the
+            line, lie on the boundary
+
+        Returns
+        -------
+        np.array
+            Positions of the points as np.array of type int8 holding the values of Position
+        """
+        return _classify(self.levels(z), tol)
+
+    def position_matrix(spaces, z, tol=1e-09):
+        """Classifies a batch of points with respect to several half spaces.
+
+        Parameters
+        ----------
+        spaces : list
+            List of M half spaces
+        z : ComplexArray, np.array
+            N points given as ComplexArray, complex np.array of shape (N,) or float np.array of shape (N, 2)
+        tol : float
+            Points whose level function is within tol of zero, i.e. about within the euclidean distance tol of the
+            line, lie on the boundary
+
+        Returns
+        -------
+        np.array
+            Positions of the points with respect to each half space as np.array of type int8 and shape (M, N)
+            holding the values of Position
+        """
+        vertical, center, radius, sign = HalfSpace._columns(spaces)
+        return _classify(sign * _levels(vertical, center, radius, _as_complex(z)), tol)
+
+    def intersection(spaces, z, tol=1e-09):
+        """Classifies a batch of points with respect to the intersection of several half spaces.
+
+        Parameters
+        ----------
+        spaces : list
+            List of half spaces
+        z : ComplexArray, np.array
+            Points given as ComplexArray, complex np.array of shape (N,) or float np.array of shape (N, 2)
+        tol : float
+            Points whose level function is within tol of zero, i.e. about within the euclidean distance tol of the
+            line, lie on the boundary
+
+        Returns
+        -------
+        np.array
+            Positions of the points as np.array of type int8 holding the values of Position: IN if the point lies
+            inside of all half spaces, OUT if it lies outside of at least one and ON otherwise
+        """
+        positions = HalfSpace.position_matrix(spaces, z, tol)
+        return np.where(np.any(positions == Position.OUT.value, axis=0), np.int8(Position.OUT.value),
+            np.where(np.all(positions == Position.IN.value, axis=0), np.int8(Position.IN.value),
+            np.int8(Position.ON.value))).astype(np.int8)
+
+    def rnd(min_re, max_re, max_im, samples, rng=None):
+        """Returns a ComplexArray of n=samples random points of HPlus with real part in [min_re, max_re] and
+           imaginary part in (0, max_im], see ComplexNumber.rnd_in_HPlus."""
+        return ComplexNumber.rnd_in_HPlus(min_re, max_re, max_im, samples, rng)
 
 class Flow:
+    """A class representing a one parameter family of Moebius transformations t -> moeb_param(t), e.g. ellip_0,
+       loxod or parab. See hypgeo.flow for the evaluation on whole time grids."""
+
     def __init__(self, moeb_param):
         self._moeb_param = moeb_param
 
-    def __call__(t, x=None):
-        if x != None:
+    def __call__(self, t, x=None):
+        if x is not None:
             return self._moeb_param(t)(x)
         else:
             return self._moeb_param(t)
+
+def polygon_center(vertices):
+    """Returns a point inside of the convex polygon with the given vertices (np.array of type complex), the image
+       of the mean of the vertices in the Klein model, where geodesic polygons are Euclidean polygons."""
+    w = plane_to_disk(vertices)
+    k = np.mean(2.0 * w / (1.0 + np.abs(w) ** 2))
+    return disk_to_plane(k / (1.0 + math.sqrt(1.0 - abs(k) ** 2)))
@@ -0,0 +1,334 @@
+"""Lazy composition of Moebius transformations.
+
+A LazyMoeb records the word of letters of a composition instead of multiplying matrices at every step. Adjacent
+inverse letters cancel while the word is built, and the matrix is only evaluated when the transformation is applied
+or compared. Letters are the transformations registered in an Alphabet.
+
+Words are stored as height balanced binary trees whose leaves are the letters and whose inner nodes are the products
+of their subtrees. Nodes are immutable and shared: a product refers to the trees of its factors, so that common
+prefixes (and any other common subwords) of many words are stored and evaluated once, and powers by repeated
+squaring take logarithmically many nodes. Every node caches its matrix once evaluated, and nodes are released with the
+last word referring to them. evaluate_all contracts thousands of pending words in one batch."""
+import collections
+from hypgeo.backend import renormalize
+from hypgeo.complex_plane import *
+from hypgeo.moebius import MoebGen, MoebStack, _inv_matrices
+from hypgeo.words import _keys
+
+class _Node:
+    """A node of the tree of a word, either a letter (leaf) or the product of the words of its children."""
+
+    __slots__ = ('left', 'right', 'letter', 'first', 'last', 'length', 'height', 'matrix', 'inverse')
+
+    def __init__(self, left=None, right=None, letter=None, matrix=None):
+        self.left, self.right, self.letter, self.matrix, self.inverse = left, right, letter, matrix, None
+        if letter is not None:
+            self.first, self.last, self.length, self.height = letter, letter, 1, 1
+        else:
+            self.first, self.last = left.first, right.last
+            self.length, self.height = left.length + right.length, max(left.height, right.height) + 1
+
+def _balanced(left, right):
+    """Returns the product of left and right, whose heights differ by at most 2, rotated to a balanced tree."""
+    if left.height > right.height + 1:
+        if left.left.height >= left.right.height:
+            return _Node(left.left, _Node(left.right, right))
+        return _Node(_Node(left.left, left.right.left), _Node(left.right.right, right))
+    if right.height > left.height + 1:
+        if right.right.height >= right.left.height:
+            return _Node(_Node(left, right.left), right.right)
+        return _Node(_Node(left, right.left.left), _Node(right.left.right, right.right))
+    return _Node(left, right)
+
+def _join(left, right):
+    """Returns the balanced tree of the concatenation of the words of left and right (None for the empty word),
+       descending along the taller tree down to the height of the other one."""
+    if left is None or right is None:
+        return right if left is None else left
+    if left.height > right.height + 1:
+        return _balanced(left.left, _join(left.right, right))
+    if right.height > left.height + 1:
+        return _balanced(_join(left, right.left), right.right)
+    return _Node(left, right)
+
+def _drop_first(node):
+    if node.letter is not None:
+        return None
+    return _join(_drop_first(node.left), node.right)
+
+def _drop_last(node):
+    if node.letter is not None:
+        return None
+    return _join(node.left, _drop_last(node.right))
+
+def _letters(node):
+    """Returns the word of node (None for the empty word) as tuple of letters."""
+    word, stack = [], [node] if node is not None else []
+    while len(stack) > 0:
+        node = stack.pop()
+        if node.letter is not None:
+            word.append(node.letter)
+        else:
+            stack += [node.right, node.left]
+    return tuple(word)
+
+def _contract(nodes, batch_size=65536):
+    """Evaluates the matrices of nodes and of all their descendants which are not cached yet, where the products of
+       all nodes of the same height are computed as one batched matrix product, renormalized afterwards."""
+    levels, seen, stack = collections.defaultdict(list), set(), [n for n in nodes if n is not None]
+    while len(stack) > 0:
+        node = stack.pop()
+        if node.matrix is None and id(node) not in seen:
+            seen.add(id(node))
+            levels[node.height].append(node)
+            stack += [node.left, node.right]
+    for height in sorted(levels):
+        level = levels[height]
+        for start in range(0, len(level), batch_size):
+            batch = level[start: start + batch_size]
+            m = renormalize(np.matmul(np.array([n.left.matrix for n in batch]), np.array([n.right.matrix
+                for n in batch])))
+            for node, matrix in zip(batch, m):
+                node.matrix = matrix
+
+class Alphabet:
+    """A class holding the letters of lazy words. Letter 2k stands for the k-th registered transformation and letter
+       2k + 1 for its inverse, unless the transformation is an involution (M^2 = +- I), which is its own inverse.
+       Transformations whose coefficients agree up to the tolerance are the same letter, and a transformation
+       agreeing with the inverse of a registered one is the inverse letter. The alphabet only holds the letters,
+       the words built over it are released with the last LazyMoeb referring to them."""
+
+    @property
+    def Letters(self):
+        return MoebStack(self._table())
+
+    def __init__(self, tol=1e-09):
+        """
+        Parameters
+        ----------
+        tol : float
+            Tolerance of the comparison of the coefficients of letters
+        """
+        self._tol = tol
+        self._letters = {}
+        self._leaves = []
+        self._inverses = []
+        self._table_cache = None
+
+    def __len__(self):
+        return len(self._leaves)
+
+    def letter(self, moeb):
+        """Returns the letter of moeb (MoebGen), registering moeb and its inverse if it is new."""
+        assert isinstance(moeb, MoebGen), "moeb is not of type \"MoebGen\"!"
+        m = np.array([[moeb.a, moeb.b], [moeb.c, moeb.d]])
+        key = _keys(m[None], self._tol, False)[0]
+        if key not in self._letters:
+            letter, inv = len(self._leaves), _inv_matrices(m)
+            atol = self._tol * max(1.0, np.max(np.abs(m))) ** 2
+            involution = any(np.allclose(m @ m, s * np.eye(2), rtol=.0, atol=atol) for s in [1.0, - 1.0])
+            self._letters[key] = letter
+            self._letters.setdefault(_keys(inv[None], self._tol, False)[0], letter if involution else letter + 1)
+            self._leaves += [_Node(letter=letter, matrix=m), _Node(letter=letter + 1, matrix=inv)]
+            self._inverses += [letter, letter + 1] if involution else [letter + 1, letter]
+            self._table_cache = None
+        return self._letters[key]
+
+    def inverse(self, letter):
+        """Returns the letter of the inverse of letter."""
+        return self._inverses[letter]
+
+    def _table(self):
+        """Returns the matrices of all letters followed by the identity as np.array."""
+        if self._table_cache is None:
+            self._table_cache = np.array([leaf.matrix for leaf in self._leaves] + [np.eye(2)]).reshape(- 1, 2, 2)
+        return self._table_cache
+
+    def _tree(self, word):
+        """Returns the balanced tree of the freely reduced word (sequence of letters), None if it is empty."""
+        reduced = []
+        for letter in word:
+            if len(reduced) > 0 and reduced[- 1] == self._inverses[letter]:
+                reduced.pop()
+            else:
+                reduced.append(letter)
+
+        def build(start, end):
+            if end - start == 1:
+                return self._leaves[reduced[start]]
+            middle = (start + end) // 2
+            return _Node(build(start, middle), build(middle, end))
+        return build(0, len(reduced)) if len(reduced) > 0 else None
+
+    def _multiply(self, left, right):
+        """Returns the tree of the product of the words of left and right, cancelling inverse letters at the
+           junction."""
+        while left is not None and right is not None and left.last == self._inverses[right.first]:
+            left, right = _drop_last(left), _drop_first(right)
+        return _join(left, right)
+
+    def _inverse(self, node):
+        """Returns the tree of the inverse of the word of node, the mirrored tree of inverse letters, cached in
+           node."""
+        if node is None:
+            return None
+        if node.inverse is None:
+            if node.letter is not None:
+                node.inverse = self._leaves[self._inverses[node.letter]]
+            else:
+                node.inverse = _Node(self._inverse(node.right), self._inverse(node.left))
+        return node.inverse
+
+    def evaluate(self, word):
+        """Returns the matrix of a word (tuple of letters) as np.array of shape (2, 2)."""
+        node = self._tree(int(letter) for letter in word)
+        _contract([node])
+        return node.matrix if node is not None else np.eye(2)
+
+_alphabet = Alphabet()
+
+class LazyMoeb:
+    """A class representing a product of Moebius transformations by its freely reduced word over an Alphabet,
+       evaluated on demand. Instances are immutable values referring to the tree of their word."""
+
+    __slots__ = ('_node', '_alphabet')
+
+    @property
+    def Word(self):
+        return _letters(self._node)
+
+    @property
+    def Alphabet(self):
+        return self._alphabet
+
+    def __init__(self, word=(), alphabet=None):
+        """
+        Parameters
+        ----------
+        word : tuple
+            Letters of the product from left to right, the identity if empty
+        alphabet : Alphabet
+            Alphabet of the letters, the shared default alphabet if None
+        """
+        self._alphabet = alphabet if alphabet is not None else _alphabet
+        self._node = self._alphabet._tree(int(letter) for letter in word)
+
+    def __len__(self):
+        return self._node.length if self._node is not None else 0
+
+    def _of(self, node):
+        moeb = LazyMoeb.__new__(LazyMoeb)
+        moeb._node, moeb._alphabet = node, self._alphabet
+        return moeb
+
+    def _operand(self, o):
+        if isinstance(o, MoebGen):
+            return self._of(self._alphabet._leaves[self._alphabet.letter(o)])
+        assert isinstance(o, LazyMoeb), "%s is not of type \"MoebGen\" or \"LazyMoeb\"!" % str(o)
+        assert o.Alphabet is self._alphabet, "Words of different alphabets cannot be composed!"
+        return o
+
+    def inv(self):
+        """Returns the (group) inverse of instance, the reversed word of inverse letters."""
+        return self._of(self._alphabet._inverse(self._node))
+
+    def __mul__(self, o):
+        """Right multiplicates instance with o, cancelling inverse letters at the junction. The trees of both words
+           are shared by the product, which takes time logarithmic in their lengths per cancelled letter.
+
+        Parameters
+        ----------
+        o : LazyMoeb or MoebGen
+            Moebius transformation multiplied with instance from right, registered as letter if a MoebGen
+
+        Returns
+        -------
+        LazyMoeb
+            Right multiplication of instance with o
+        """
+        return self._of(self._alphabet._multiply(self._node, self._operand(o)._node))
+
+    def conj(self, o):
+        """Returns the (group) conjugation of instance with o, i.e. o^-1 * instance * o."""
+        o = self._operand(o)
+        return o.inv() * self * o
+
+    def __truediv__(self, o):
+        """Multiplies instance from left with the inverse of o."""
+        return self * self._operand(o).inv()
+
+    def __pow__(self, n):
+        """Returns the n-th power of instance by repeated squaring, whose tree shares the squares and thus has
+           O(log n) nodes more than the one of instance."""
+        n = int(n)
+        base = self if n >= 0 else self.inv()
+        n = abs(n)
+        pow = self._of(None)
+        while n > 0:
+            if n & 1:
+                pow = pow * base
+            n >>= 1
+            if n > 0:
+                base = base * base
+        return pow
+
+    def _matrix(self):
+        _contract([self._node])
+        return self._node.matrix if self._node is not None else np.eye(2)
+
+    def evaluate(self):
+        """Returns the product of instance as Moeb, MoebConj or MoebGen according to the determinant."""
+        return MoebStack(self._matrix()[None])[0]
+
+    def __call__(self, z):
+        """Applies the evaluated product of instance to z (see MoebGen.__call__)."""
+        return self.evaluate()(z)
+
+    def isclose(self, o, tol=1e-09):
+        """Returns whether the evaluated products of instance and o (LazyMoeb or MoebGen) coincide up to tol,
+           without evaluation if they share their tree."""
+        if isinstance(o, LazyMoeb) and o.Alphabet is self._alphabet and o._node is self._node:
+            return True
+        m = o.evaluate() if isinstance(o, LazyMoeb) else o
+        return bool(np.all(np.isclose(self._matrix(), [[m.a, m.b], [m.c, m.d]], rtol=.0, atol=tol)))
+
+    def __eq__(self, o):
+        if not isinstance(o, LazyMoeb) and not isinstance(o, MoebGen):
+            return False
+        return self.isclose(o)
+
+    __hash__ = None
+
+    def __str__(self):
+        """Returns a string representation of of instance."""
+        return "LazyMoeb({})".format(list(self.Word))
+
+def lazy(moeb, alphabet=None):
+    """Returns the transformation moeb (MoebGen) as LazyMoeb of a single letter of alphabet (the shared default
+       alphabet if None)."""
+    return LazyMoeb((), alphabet) * moeb
+
+def evaluate_all(moebs, batch_size=65536):
+    """Evaluates many lazy products of the same alphabet at once. The nodes of the trees of all words which are not
+       evaluated yet are contracted level by level, from the leaves to the roots, by batched matrix products of
+       their children, renormalized after each step. Nodes shared by several words are evaluated once.
+
+    Parameters
+    ----------
+    moebs : list
+        LazyMoeb of the same alphabet
+    batch_size : int
+        Maximal number of nodes contracted at once
+
+    Returns
+    -------
+    MoebStack
+        Products of the words
+    """
+    if len(moebs) == 0:
+        return MoebStack(np.zeros((0, 2, 2)))
+    alphabet = moebs[0].Alphabet
+    assert all(m.Alphabet is alphabet for m in moebs), "Words of different alphabets cannot be evaluated together!"
+    _contract([m._node for m in moebs], batch_size)
+    return MoebStack(np.array([m._node.matrix if m._node is not None else np.eye(2) for m in moebs]).reshape(- 1,
+        2, 2))
@@ -0,0 +1,184 @@
+import math
+from hypgeo.complex_plane import *
+from hypgeo.complex_plane import _as_complex
+from hypgeo.moebius import MoebGen, MoebStack, MoebType
+
+def _scalar(*z):
+    return all(type(x) is ComplexNumber or type(x) is RootOfUnity for x in z)
+
+def _complex(z):
+    return complex(z.re, z.im)
+
+def _coefficients(moebs):
+    """Returns the coefficients of a MoebGen (as floats) or a MoebStack (as np.array) asserting determinant 1."""
+    if isinstance(moebs, MoebStack):
+        assert np.allclose(moebs.Det, 1.0, rtol=.0, atol=1e-09), 'Only transformations of determinant 1 are supported!'
+        return moebs.a, moebs.b, moebs.c, moebs.d
+    assert isinstance(moebs, MoebGen), "moebs is not of type \"MoebGen\" or \"MoebStack\"!"
+    assert math.isclose(moebs.a * moebs.d - moebs.b * moebs.c, 1.0, abs_tol=1e-09), \
+        'Only transformations of determinant 1 are supported!'
+    return moebs.a, moebs.b, moebs.c, moebs.d
+
+def distance(z, w):
+    """Returns the hyperbolic distance of the points z and w, computed as 2 asinh(|z - w| / (2 sqrt(y_z y_w))),
+       which unlike the arccosh formula keeps its relative precision for close points and points near the real axis.
+
+    Parameters
+    ----------
+    z : ComplexNumber, ComplexArray, np.array
+        Point or batch of points given as ComplexArray, complex np.array or float np.array of shape (N, 2)
+    w : ComplexNumber, ComplexArray, np.array
+        Point or batch of points broadcastable against z
+
+    Returns
+    -------
+    float, np.array
+        Distance for two ComplexNumber, otherwise np.array of distances
+    """
+    if _scalar(z, w):
+        return 2.0 * math.asinh(abs(_complex(z) - _complex(w)) / (2.0 * math.sqrt(z.im * w.im)))
+    z = _complex(z) if _scalar(z) else _as_complex(z)
+    w = _complex(w) if _scalar(w) else _as_complex(w)
+    return 2.0 * np.arcsinh(np.abs(z - w) / (2.0 * np.sqrt(np.imag(z) * np.imag(w))))
+
+def cross_ratio(z1, z2, z3, z4):
+    """Returns the cross ratio (z1 - z3)(z2 - z4) / ((z2 - z3)(z1 - z4)), which is invariant under Moebius
+       transformations of determinant 1, for four points or four broadcastable batches of points."""
+    if _scalar(z1, z2, z3, z4):
+        z1, z2, z3, z4 = _complex(z1), _complex(z2), _complex(z3), _complex(z4)
+        r = (z1 - z3) * (z2 - z4) / ((z2 - z3) * (z1 - z4))
+        return ComplexNumber(r.real, r.imag)
+    z1, z2, z3, z4 = (_complex(z) if _scalar(z) else _as_complex(z) for z in (z1, z2, z3, z4))
+    return (z1 - z3) * (z2 - z4) / ((z2 - z3) * (z1 - z4))
+
+def classify(moebs, tol=1e-09):
+    """Returns the type of a transformation of determinant 1 (MoebType) by its trace as MoebGen.classify, or for a
+       MoebStack the types as np.array of type int8 holding the values of MoebType."""
+    a, b, c, d = _coefficients(moebs)
+    if not isinstance(moebs, MoebStack):
+        return moebs.classify()
+    trace = np.abs(a + d)
+    return np.where(np.isclose(trace, 2.0, rtol=.0, atol=tol), np.int8(MoebType.PARABOLIC.value),
+        np.where(trace < 2.0, np.int8(MoebType.ELLIPTIC.value), np.int8(MoebType.HYPERBOLIC.value))).astype(np.int8)
+
+def translation_length(moebs):
+    """Returns the translation length 2 acosh(|tr| / 2) of transformations of determinant 1 along their axis, which
+       is 0 for elliptic and parabolic transformations. Returns a float for a MoebGen and an np.array for a
+       MoebStack."""
+    a, b, c, d = _coefficients(moebs)
+    if not isinstance(moebs, MoebStack):
+        return 2.0 * math.acosh(max(abs(a + d) / 2.0, 1.0))
+    return 2.0 * np.arccosh(np.maximum(np.abs(a + d) / 2.0, 1.0))
+
+def fixed_points(moebs, tol=1e-09):
+    """Returns the fixed points of transformations of determinant 1 in the closure of HPlus, the roots of
+       c z^2 + (d - a) z - b = 0. Hyperbolic transformations have a repelling and an attracting fixed point on the
+       real axis (returned in this order), computed without cancellation from the root of larger modulus and the
+       product of the roots. Parabolic transformations have one fixed point on the real axis and elliptic ones one
+       in HPlus, which are returned twice. The point at infinity is returned as complex(inf, 0).
+
+    Parameters
+    ----------
+    moebs : MoebGen or MoebStack
+        Transformations of determinant 1
+    tol : float
+        Transformations whose absolute trace is within tol of 2 are parabolic
+
+    Returns
+    -------
+    (complex, complex) or (np.array, np.array)
+        Fixed points, as pair of complex np.array for a MoebStack
+    """
+    a, b, c, d = (np.asarray(x, dtype=np.float64) for x in _coefficients(moebs))
+
+    # normalize to positive trace, then the multiplier at a fixed point z is 1 / (c z + d)^2 = 4 / (tr +- root)^2
+    sign = np.where(a + d < .0, - 1.0, 1.0)
+    a, b, c, d = sign * a, sign * b, sign * c, sign * d
+    trace = a + d
+    root = np.sqrt(np.maximum(trace * trace - 4.0, .0))
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # hyperbolic: q is the root of larger modulus (times c), the other one follows from their product - b / c
+        q = .5 * ((a - d) + np.where(a >= d, root, - root))
+        large, small = q / c, - b / q
+        repelling, attracting = np.where(a >= d, small, large), np.where(a >= d, large, small)
+
+        # parabolic and elliptic: the double root, respectively the root in HPlus
+        parabolic = np.where(c == .0, np.inf, (a - d) / (2.0 * c))
+        elliptic = ((a - d) + 1.0j * np.sign(c) * np.sqrt(np.maximum(4.0 - trace * trace, .0))) / (2.0 * c)
+
+    is_parabolic = np.isclose(trace, 2.0, rtol=.0, atol=tol)
+    z_0 = np.where(is_parabolic, parabolic, np.where(trace < 2.0, elliptic, repelling)).astype(np.complex128)
+    z_1 = np.where(is_parabolic, parabolic, np.where(trace < 2.0, elliptic, attracting)).astype(np.complex128)
+    z_0 = np.where(np.isinf(z_0.real), np.inf + .0j, z_0)
+    z_1 = np.where(np.isinf(z_1.real), np.inf + .0j, z_1)
+    if isinstance(moebs, MoebStack):
+        return z_0, z_1
+    return complex(z_0), complex(z_1)
+
+def _tangents(z, w):
+    """Returns the unit tangent vectors at z of the geodesic segments from z to w (complex np.array)."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        center = .5 * (np.abs(w) ** 2 - np.abs(z) ** 2) / (w.real - z.real)
+        t = np.where(np.isclose(z.real, w.real, rtol=.0, atol=1e-12), 1.0j * np.sign(w.imag - z.imag),
+            - 1.0j * (z - center) * np.sign(w.real - z.real))
+    return t / np.abs(t)
+
+def angles(vertices):
+    """Returns the interior angles of convex hyperbolic polygons.
+
+    Parameters
+    ----------
+    vertices : ComplexArray, np.array
+        Vertices of a polygon as ComplexArray or complex np.array of shape (P,), or of a batch of polygons as complex
+        np.array of shape (B, P), in clockwise or counterclockwise order
+
+    Returns
+    -------
+    np.array
+        Interior angles at the vertices, of the same shape as vertices
+    """
+    v = _as_complex(vertices) if isinstance(vertices, ComplexArray) else np.asarray(vertices, dtype=np.complex128)
+    t_prev, t_next = _tangents(v, np.roll(v, 1, axis=- 1)), _tangents(v, np.roll(v, - 1, axis=- 1))
+    return np.abs(np.angle(t_next / t_prev))
+
+def area(vertices):
+    """Returns the hyperbolic area (n - 2) pi - sum of the interior angles (Gauss-Bonnet) of convex polygons given as
+       in angles, as float for a single polygon and as np.array for a batch."""
+    a = angles(vertices)
+    result = (a.shape[- 1] - 2) * math.pi - np.sum(a, axis=- 1)
+    return float(result) if np.ndim(result) == 0 else result
+
+def disc_area(radius):
+    """Returns the hyperbolic area 4 pi sinh(r / 2)^2 of discs of hyperbolic radius r."""
+    return 4.0 * math.pi * np.sinh(np.asarray(radius) / 2.0) ** 2
+
+def pairwise_blocks(z, w, block=4096):
+    """Yields the pairwise distance matrix of the batches z (N points) and w (M points) in tiles (i, j, D), where
+       D = distance(z[i: i + block], w[j: j + block]) is of shape at most (block, block), so that memory is bounded
+       by the tile size."""
+    z, w = _as_complex(z), _as_complex(w)
+    for i in range(0, len(z), block):
+        zi = z[i: i + block, None]
+        for j in range(0, len(w), block):
+            yield i, j, distance(zi, w[None, j: j + block])
+
+def pairwise(z, w, block=4096, out=None):
+    """Returns the matrix of shape (N, M) of the distances of the points z (N points) and w (M points), computed
+       blockwise (see pairwise_blocks). out may be a preallocated array, e.g. a numpy.memmap, to hold the result."""
+    out = out if out is not None else np.empty((len(_as_complex(z)), len(_as_complex(w))))
+    for i, j, D in pairwise_blocks(z, w, block):
+        out[i: i + D.shape[0], j: j + D.shape[1]] = D
+    return out
+
+def nearest(z, w, block=4096):
+    """Returns for each point of z the index of the nearest point of w and its distance as pair of np.array,
+       computed blockwise without forming the full distance matrix."""
+    z = _as_complex(z)
+    index, dist = np.zeros(len(z), dtype=np.int64), np.full(len(z), np.inf)
+    for i, j, D in pairwise_blocks(z, w, block):
+        k = np.argmin(D, axis=1)
+        d = D[np.arange(len(D)), k]
+        better = d < dist[i: i + len(D)]
+        index[i: i + len(D)][better], dist[i: i + len(D)][better] = k[better] + j, d[better]
+    return index, dist
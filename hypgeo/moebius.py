@@ -1,10 +1,99 @@
+import enum
 import numpy as np
 from hypgeo.complex_plane import *
+from hypgeo.complex_plane import _as_complex, _like, _quantize
 from hypgeo.geometry import *
+from hypgeo.backend import DOUBLE_DOUBLE, FLOAT64, backend as _backend_of, dd_matmul, dd_pow, get_backend, renormalize, \
+    renormalized
+
+# ideal points whose image has a denominator c * x + d that vanishes up to this tolerance relative to the
+# magnitude of its terms (or c relative to a for the point at infinity) are mapped to the point at infinity
+_INFINITY_TOL = 1e-09
+
+# number of unnormalized products after which the coefficients of a PreciseMoeb are rescaled to determinant +- 1
+_RENORMALIZE_EVERY = 16
+
+def _map_ideal(a, b, c, d, x):
+    """Returns the images of points x on the ideal boundary (real axis with np.inf as the point at infinity) under the
+       transformations with coefficients a, b, c, d. All arguments may be arrays of matching shapes."""
+    x = np.asarray(x, dtype=np.float64)
+    inf = np.isinf(x)
+    x = np.where(inf, .0, x)
+    num = np.where(inf, a, a * x + b)
+    den = np.where(inf, c, c * x + d)
+    at_inf = np.abs(den) <= _INFINITY_TOL * np.where(inf, np.abs(a), np.abs(c * x) + np.abs(d))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(at_inf, np.inf, num / den)
+
+class MoebType(enum.Enum):
+    ELLIPTIC = 1
+    PARABOLIC = 2
+    HYPERBOLIC = 3
+
+def _eigen_pow(a, b, c, d, n, tol):
+    """Returns the n-th powers of transformations M = ((a, b), (c, d)) of determinant 1 in closed form from the powers
+       of their eigenvalues, together with a boolean mask of the powers whose estimated entry wise relative error is
+       below tol. Hyperbolic powers are lambda^n P + lambda^-n (Id - P) with the spectral projector
+       P = (M - lambda^-1 Id) / (lambda - lambda^-1), elliptic ones cos(n theta) Id + sin(n theta) (M - cos theta Id)
+       / sin theta and parabolic ones Id + n (M - Id). The estimate bounds the rounding of the terms (which may
+       cancel, e.g. in the small entries of powers of transformations close to the identity), of the angles and of
+       the determinant. All arguments may be arrays of matching shapes.
+
+    Returns
+    -------
+    (np.array, np.array)
+        Powers of shape (..., 2, 2) and mask of the accurate ones
+    """
+    a, b, c, d = (np.asarray(x, dtype=np.float64) for x in (a, b, c, d))
+    n = np.asarray(n, dtype=np.float64)
+    m = np.stack((a, b, c, d), axis=- 1).reshape(a.shape + (2, 2))
+    eye = np.eye(2)
+    s = (a + d) / 2.0
+    disc = ((a - d) ** 2 + 4.0 * b * c) / 4.0
+    norm = np.max(np.abs(m), axis=(- 2, - 1))
+    eps = np.finfo(np.float64).eps
+
+    with np.errstate(all='ignore'):
+        # hyperbolic: eigenvalues lambda = sigma e^phi and 1 / lambda
+        sigma = np.where(s < .0, - 1.0, 1.0)
+        r = np.sqrt(np.where(disc > .0, disc, 1.0))
+        phi = np.arcsinh(r)
+        lam = s + sigma * r
+        lam_inv = 1.0 / lam
+        gap = lam - lam_inv
+        P = (m - lam_inv[..., None, None] * eye) / gap[..., None, None]
+        l_n, l_inv_n = sigma ** n * np.exp(n * phi), sigma ** n * np.exp(- n * phi)
+        hyper = l_n[..., None, None] * P + l_inv_n[..., None, None] * (eye - P)
+        hyper_err = (1.0 + np.abs(n) * phi) * (np.abs(l_n) + np.abs(l_inv_n)) * \
+            (1.0 + (norm + np.abs(lam) + np.abs(lam_inv)) / np.abs(gap))
+
+        # elliptic: eigenvalues e^(+- i theta)
+        sin_theta = np.sqrt(np.where(disc < .0, - disc, 1.0))
+        theta = np.arctan2(sin_theta, s)
+        ellip = np.cos(n * theta)[..., None, None] * eye + \
+            (np.sin(n * theta) / sin_theta)[..., None, None] * (m - s[..., None, None] * eye)
+        ellip_err = (1.0 + np.abs(n) * theta) * (1.0 + (norm + 1.0) / sin_theta)
+
+        # parabolic
+        parab = eye + n[..., None, None] * (m - eye)
+        parab_err = 1.0 + np.abs(n) * (1.0 + norm)
+
+        is_hyper, is_ellip = (disc > .0)[..., None, None], (disc < .0)[..., None, None]
+        pow = np.where(is_hyper, hyper, np.where(is_ellip, ellip, parab))
+        err = np.where(disc > .0, hyper_err, np.where(disc < .0, ellip_err, parab_err))
+
+        # rounding of the terms and the deviation of the determinant from 1, which the closed form ignores
+        bound = 8.0 * eps * err + np.abs(n) * np.abs((a * d - b * c) - 1.0) * np.max(np.abs(pow), axis=(- 2, - 1))
+        accurate = np.all(bound[..., None, None] <= tol * np.abs(pow), axis=(- 2, - 1)) & np.all(np.isfinite(pow),
+            axis=(- 2, - 1))
+    return pow, accurate
 
 class MoebGen:
-    """A class representing general Moebius transformations (of the connected unit component) and their operation on the upper half plane."""
-    
+    """A class representing general Moebius transformations (of the connected unit component) and their operation on the upper half plane.
+       Instances are immutable values."""
+
+    __slots__ = ('_a', '_b', '_c', '_d', '_det')
+
     @property
     def a(self):
         return self._a
@@ -27,6 +116,8 @@ class MoebGen:
 
     def IsGenMoeb(op):
         def _op(inst, o):
+            if isinstance(o, MoebStack):
+                return NotImplemented
             assert isinstance(o, MoebGen), "%s is not of type \"MoebGen\"!" % str(o)
             return op(inst, o)
         return _op
@@ -59,24 +150,87 @@ class MoebGen:
         self._det = self._a * self._d - self._b * self._c
 
     def __call__(self, z):
-        if type(z) is np.array or type(z) is np.ndarray:
-            assert len(z) == 2, "z has wrong dimension!"
-            z = ComplexNumber(z[0], z[1])
-        if isinstance(z, GeodesicLine):
-            return self.map_line(z)
-        assert type(z) is ComplexNumber, 'z has to be a complex number!'
+        if type(z) is not ComplexNumber:
+            if isinstance(z, ComplexArray):
+                return self.apply(z)
+            if type(z) is np.array or type(z) is np.ndarray:
+                assert len(z) == 2, "z has wrong dimension!"
+                z = ComplexNumber(z[0], z[1])
+            if isinstance(z, GeodesicLine):
+                return self.map_line(z)
+            if isinstance(z, GeodesicArray):
+                return self.map_lines(z)
+            assert type(z) is ComplexNumber, 'z has to be a complex number!'
+
+        x, y = z.re, z.im
+        if math.isclose(self._det, - 1.0, abs_tol=1e-09):
+            y = - y
+        return ComplexNumber(x * self._a + self._b, y * self._a)._truediv(ComplexNumber(x * self._c + self._d, y * self._c))
+
+    def apply(self, z):
+        """Applies instance to a batch of points in one vectorized evaluation.
+
+        Parameters
+        ----------
+        z : ComplexArray, np.array
+            Points given as ComplexArray, complex np.array of shape (N,) or float np.array of shape (N, 2)
 
+        Returns
+        -------
+        ComplexArray, np.array
+            Images of the points in the same layout as z
+        """
+        w = _as_complex(z)
         if math.isclose(self._det, - 1.0, abs_tol=1e-09):
-            z = z.conj()
-        return (z * self._a + self._b) / (z * self._c + self._d)
+            w = np.conj(w)
+        return _like((self._a * w + self._b) / (self._c * w + self._d), z)
 
     def clone(self):
         return MoebGen(self._a, self._b, self._c, self._d)
 
-    def map_line(self, l):  
-        z_0, z_1 = l.get_two_points()      
-        u_0, u_1 = MoebGen.__call__(self, z_0), MoebGen.__call__(self, z_1)
-        return GeodesicLine.line_trough(u_0, u_1)
+    def map_line(self, l):
+        """Maps the geodesic line l by mapping its ideal endpoints on the real axis and the point at infinity.
+
+        Parameters
+        ----------
+        l : GeodesicLine
+            Geodesic line to be mapped
+
+        Returns
+        -------
+        GeodesicLine
+            Image of l under instance transformation
+        """
+        x_0, x_1 = l.endpoints()
+        return GeodesicLine.line_between(self._map_ideal(x_0), self._map_ideal(x_1))
+
+    def _map_ideal(self, x):
+        if math.isinf(x):
+            if abs(self._c) <= _INFINITY_TOL * abs(self._a):
+                return math.inf
+            return self._a / self._c
+
+        den = self._c * x + self._d
+        if abs(den) <= _INFINITY_TOL * (abs(self._c * x) + abs(self._d)):
+            return math.inf
+        return (self._a * x + self._b) / den
+
+    def map_lines(self, lines):
+        """Maps a whole batch of geodesic lines in one vectorized pass over their ideal endpoints.
+
+        Parameters
+        ----------
+        lines : GeodesicArray
+            Geodesic lines to be mapped
+
+        Returns
+        -------
+        GeodesicArray
+            Images of the lines under instance transformation
+        """
+        x_0, x_1 = lines.endpoints()
+        return GeodesicArray.line_between(_map_ideal(self._a, self._b, self._c, self._d, x_0),
+            _map_ideal(self._a, self._b, self._c, self._d, x_1))
 
     def inv(self):
         """Returns the (group) inverse of instance."""
@@ -96,6 +250,9 @@ class MoebGen:
         Moeb
             Right multiplication of instance transformation with o
         """ 
+        # other backends than float64 compute the product in their arithmetic, rounded to float64
+        if get_backend() is not FLOAT64:
+            return MoebGen(*(float(x) for x in (PreciseMoeb.from_moeb(self) * o).Coefficients))
         return MoebGen(self._a * o.a + self._b * o.c, self._a * o.b + self._b * o.d, 
             self._c * o.a + self._d * o.c, self._c * o.b + self._d * o.d)
 
@@ -143,20 +300,68 @@ class MoebGen:
         Moeb
             N-th power of instance transformation with o
         """ 
-
-        if n > 0:
-            pow = self.clone()
-            for i in range(1, n):
-                pow *= self
-        elif n == 0:
+        # other backends than float64 compute the power in their arithmetic, before any float64 shortcut
+        n = int(n)
+        if get_backend() is not FLOAT64:
+            return MoebGen(*(float(x) for x in (PreciseMoeb.from_moeb(self) ** n).Coefficients))
+        if n == 0:
             return moeb_id
-        else:
-            pow = self.clone().inv()
-            inv = self.inv().clone()
-            for i in range(1, - n):
-                pow *= inv
 
-        return pow
+        # transformations of determinant +- 1 are renormalized after every squaring against the drift of the
+        # determinant
+        unit = math.isclose(abs(self._det), 1.0, abs_tol=1e-09)
+        base = self.clone() if n > 0 else self.inv()
+        n = abs(n)
+        pow = None
+        while True:
+            if n & 1:
+                pow = base if pow is None else pow * base
+                pow = MoebGen(*renormalized(FLOAT64, pow.a, pow.b, pow.c, pow.d)) if unit else pow
+            n >>= 1
+            if n == 0:
+                return pow
+            base = base * base
+            base = MoebGen(*renormalized(FLOAT64, base.a, base.b, base.c, base.d)) if unit else base
+
+    def pow_batch(self, n, closed_form=False, tol=1e-12):
+        """Returns the n-th powers of instance transformation for a whole array of exponents.
+
+        Parameters
+        ----------
+        n : np.array of int
+            Powers
+        closed_form : bool
+            Whether transformations of determinant 1 are powered in closed form from the powers of their eigenvalues
+            (see _eigen_pow). Powers whose estimated relative error exceeds tol are computed by repeated squaring, as
+            are all powers if the global backend is not float64.
+        tol : float
+            Bound of the estimated relative error of the entries of closed form powers
+
+        Returns
+        -------
+        MoebStack
+            Stack of the n-th powers of instance transformation, one for each exponent
+        """
+        n = np.asarray(n)
+        assert np.issubdtype(n.dtype, np.integer), "Power has to be an array of integers!"
+        pow = MoebStack(np.broadcast_to(_matrices(self), n.shape + (2, 2)))
+        if not closed_form or get_backend() is not FLOAT64 or not math.isclose(self._det, 1.0, abs_tol=1e-09):
+            return pow ** n
+        m, accurate = _eigen_pow(self._a, self._b, self._c, self._d, n, tol)
+        if not np.all(accurate):
+            m[~ accurate] = (pow[~ accurate] ** n[~ accurate]).Matrices
+        return MoebStack(m)
+
+    def classify(self):
+        """Returns whether instance transformation is elliptic, parabolic or hyperbolic, determined by its trace."""
+        assert math.isclose(self._det, 1.0, abs_tol=1e-09), 'Only transformations of determinant 1 can be classified!'
+        trace = abs(self._a + self._d)
+        if math.isclose(trace, 2.0, abs_tol=1e-09):
+            return MoebType.PARABOLIC
+        elif trace < 2.0:
+            return MoebType.ELLIPTIC
+        else:
+            return MoebType.HYPERBOLIC
 
     def __str__(self):
         """Returns a string representation of of instance."""
@@ -171,59 +376,48 @@ class MoebGen:
         else:
             return False
 
+    def __hash__(self):
+        """Returns the hash of the coefficients quantized to the equality tolerance. As for ComplexNumber, equal
+           instances near the boundary of a grid cell may hash differently."""
+        return hash((_quantize(self._a), _quantize(self._b), _quantize(self._c), _quantize(self._d)))
+
 moeb_id = MoebGen(1.0, .0, .0, 1.0)
 
 class Moeb(MoebGen):
+    __slots__ = ()
+
     def __init__(self, a, b, c, d):
         #check if a * d - b * c = 1
         assert math.isclose(a * d - b * c, 1.0, abs_tol=1e-09), 'Coefficients do not satisfy determinant condition!'
         MoebGen.__init__(self, a, b, c, d)
     
-    def rnd(min, max, samples):
-        rnd_moeb = []
-
-        for i in range(0, samples):
-            coeffs = np.random.uniform(min, max, 4)
-            det = coeffs[0] * coeffs[3] - coeffs[1] * coeffs[2]
-            while det == .0:
-                coeffs = np.random.uniform(min, max, 4)
-            if det < .0:
-                coeffs[0] *= - 1.0
-                coeffs[1] *= - 1.0
-                det = coeffs[0] * coeffs[3] - coeffs[1] * coeffs[2]
-            coeffs = coeffs / math.sqrt(det)
-            rnd_moeb.append(Moeb(coeffs[0], coeffs[1], coeffs[2], coeffs[3]))
-
-        return rnd_moeb
+    def rnd(min, max, samples, rng=None):
+        """Returns a MoebStack of n=samples random Moebius transformations whose coefficients (before
+           normalization to determinant 1) are bounded by min from below and by max from above."""
+        return MoebStack.rnd(min, max, samples, 1.0, rng)
 
     def plot(self, rectanlge):
         return None
 
 class MoebConj(MoebGen):
     """A class representing Moebius transformations (of the second connected component) and their operation on the upper half plane."""
+
+    __slots__ = ()
+
     def __init__(self, a, b, c, d):
         #check if a * d - b * c = - 1
         assert math.isclose(a * d - b * c, - 1.0, abs_tol=1e-09), 'Coefficients do not satisfy determinant condition!'
         MoebGen.__init__(self, a, b, c, d)
     
-    def rnd(min, max, samples):
-        rnd_moeb = []
-
-        for i in range(0, samples):
-            coeffs = np.random.uniform(min, max, 4)
-            det = coeffs[0] * coeffs[3] - coeffs[1] * coeffs[2]
-            while det == .0:
-                coeffs = np.random.uniform(min, max, 4)
-            if det > .0:
-                coeffs[0] *= - 1.0
-                coeffs[1] *= - 1.0
-                det = coeffs[0] * coeffs[3] - coeffs[1] * coeffs[2]
-            coeffs = coeffs / math.sqrt(- det)
-            rnd_moeb.append(MoebConj(coeffs[0], coeffs[1], coeffs[2], coeffs[3]))
-
-        return rnd_moeb
+    def rnd(min, max, samples, rng=None):
+        """Returns a MoebStack of n=samples random Moebius transformations of the second connected component
+           whose coefficients (before normalization to determinant -1) are bounded by min from below and by
+           max from above."""
+        return MoebStack.rnd(min, max, samples, - 1.0, rng)
 
 class MoebCorr(Moeb):
+    __slots__ = ('_rho',)
+
     def __init__(self, a, b, c, d, rho):
         self._rho = rho
         Moeb.__init__(self, a, b, c, d)
@@ -241,8 +435,503 @@ class MoebCorr(Moeb):
         v = w_y
         return ComplexNumber(u, v)
 
+class PreciseMoeb:
+    """A class representing Moebius transformations whose coefficients are numbers of a numeric backend (see
+       hypgeo.backend), chosen per object, for long compositions whose float64 products drift. Products of
+       determinant +- 1 are renormalized after every few compositions in the floating point backends. Instances are
+       immutable values."""
+
+    __slots__ = ('_a', '_b', '_c', '_d', '_backend', '_depth')
+
+    @property
+    def a(self):
+        return self._a
+
+    @property
+    def b(self):
+        return self._b
+
+    @property
+    def c(self):
+        return self._c
+
+    @property
+    def d(self):
+        return self._d
+
+    @property
+    def Det(self):
+        return self._a * self._d - self._b * self._c
+
+    @property
+    def Backend(self):
+        return self._backend
+
+    @property
+    def Coefficients(self):
+        return self._a, self._b, self._c, self._d
+
+    def __init__(self, a, b, c, d, backend=None):
+        """
+        Parameters
+        ----------
+        a, b, c, d : float or number of the backend
+            Coefficients of the matrix representation ((a, b), (c, d))
+        backend : Backend or str
+            Numeric backend (or its name) of the coefficients, the global backend if None
+        """
+        self._backend = _backend_of(backend) if backend is not None else get_backend()
+        with self._backend.context():
+            self._a, self._b, self._c, self._d = (self._backend.number(x) for x in (a, b, c, d))
+        self._depth = 0
+
+    def from_moeb(moeb, backend=None):
+        """Returns the MoebGen moeb with coefficients converted into the numbers of backend."""
+        assert isinstance(moeb, MoebGen), "moeb is not of type \"MoebGen\"!"
+        return PreciseMoeb(moeb.a, moeb.b, moeb.c, moeb.d, backend)
+
+    def _of(self, a, b, c, d, depth):
+        """Returns a transformation of the backend of instance, renormalized once depth exceeds the interval."""
+        moeb = PreciseMoeb.__new__(PreciseMoeb)
+        moeb._backend, moeb._depth = self._backend, depth
+        if depth >= _RENORMALIZE_EVERY:
+            a, b, c, d = renormalized(self._backend, a, b, c, d)
+            moeb._depth = 0
+        moeb._a, moeb._b, moeb._c, moeb._d = a, b, c, d
+        return moeb
+
+    def _operand(self, o):
+        if isinstance(o, MoebGen):
+            return PreciseMoeb(o.a, o.b, o.c, o.d, self._backend)
+        assert isinstance(o, PreciseMoeb), "%s is not of type \"MoebGen\" or \"PreciseMoeb\"!" % str(o)
+        assert o.Backend.Name == self._backend.Name, "Transformations of different backends cannot be composed!"
+        return o
+
+    def inv(self):
+        """Returns the (group) inverse of instance."""
+        with self._backend.context():
+            det = self.Det
+            return self._of(self._d / det, - self._b / det, - self._c / det, self._a / det, self._depth + 1)
+
+    def __mul__(self, o):
+        """Right multiplicates instance transformation with o.
+
+        Parameters
+        ----------
+        o : PreciseMoeb or MoebGen
+            Moebius transformation multiplied with instance from right, converted into the backend of instance
+
+        Returns
+        -------
+        PreciseMoeb
+            Right multiplication of instance transformation with o
+        """
+        o = self._operand(o)
+        with self._backend.context():
+            return self._of(self._a * o.a + self._b * o.c, self._a * o.b + self._b * o.d,
+                self._c * o.a + self._d * o.c, self._c * o.b + self._d * o.d, self._depth + o._depth + 1)
+
+    def __rmul__(self, o):
+        return self._operand(o) * self
+
+    def conj(self, o):
+        """Returns the (group) conjugation of instance transformation with o, i.e. o^-1 * instance * o."""
+        o = self._operand(o)
+        return o.inv() * self * o
+
+    def __truediv__(self, o):
+        """Multiplies instance from left with the inverse of o."""
+        return self * self._operand(o).inv()
+
+    def __pow__(self, n):
+        """Returns the n-th power of instance transformation computed by repeated squaring in the backend.
+
+        Parameters
+        ----------
+        n : int
+            Power
+
+        Returns
+        -------
+        PreciseMoeb
+            N-th power of instance transformation
+        """
+        n = int(n)
+        base = self if n >= 0 else self.inv()
+        n = abs(n)
+        pow = PreciseMoeb(1.0, .0, .0, 1.0, self._backend)
+        while n > 0:
+            if n & 1:
+                pow = pow * base
+            n >>= 1
+            if n > 0:
+                base = base * base
+        return pow
+
+    def renormalize(self):
+        """Returns instance rescaled to determinant +- 1 (unchanged if its determinant is not close to +- 1)."""
+        return self._of(self._a, self._b, self._c, self._d, _RENORMALIZE_EVERY)
+
+    def to_moeb(self):
+        """Returns instance renormalized and rounded to floats as Moeb or MoebConj according to the determinant,
+           or as MoebGen if the rounded coefficients do not satisfy the determinant condition."""
+        a, b, c, d = (self._backend.to_float(x) for x in self.renormalize().Coefficients)
+        det = a * d - b * c
+        if math.isclose(det, 1.0, abs_tol=1e-09):
+            return Moeb(a, b, c, d)
+        if math.isclose(det, - 1.0, abs_tol=1e-09):
+            return MoebConj(a, b, c, d)
+        return MoebGen(a, b, c, d)
+
+    def __call__(self, z):
+        """Returns the image of a ComplexNumber z computed in the backend before rounding, other arguments are
+           mapped by the rounded transformation (see to_moeb)."""
+        if type(z) is not ComplexNumber:
+            return self.to_moeb()(z)
+        with self._backend.context():
+            x, y = self._backend.number(z.re), self._backend.number(z.im)
+            det = self.Det
+            # transformations of negative determinant are applied to the conjugate
+            p, q = self._a * x + self._b, self._c * x + self._d
+            denominator = q * q + self._c * self._c * y * y
+            re = (p * q + self._a * self._c * y * y) / denominator
+            im = (det if det > 0 else - det) * y / denominator
+            return ComplexNumber(self._backend.to_float(re), self._backend.to_float(im))
+
+    def isclose(self, o, tol=1e-09):
+        """Returns whether the coefficients of instance and o (PreciseMoeb or MoebGen) coincide up to tol relative
+           to their magnitude if it exceeds 1, compared in the backend of instance."""
+        o = self._operand(o)
+        with self._backend.context():
+            diff = max(abs(self._backend.to_float(x - y)) for x, y in zip(self.Coefficients, o.Coefficients))
+        scale = max(1.0, max(abs(self._backend.to_float(x)) for x in self.Coefficients))
+        return diff <= tol * scale
+
+    def __eq__(self, o):
+        if not isinstance(o, PreciseMoeb) and not isinstance(o, MoebGen):
+            return False
+        if isinstance(o, PreciseMoeb) and o.Backend.Name != self._backend.Name:
+            return False
+        return self.isclose(o)
+
+    __hash__ = None
+
+    def __str__(self):
+        """Returns a string representation of of instance."""
+        return "((a = {}, b={}), (c = {}, d={}))".format(self._a, self._b, self._c, self._d)
+
+def _matmul(x, y):
+    """Returns the matrix products of two stacks of 2x2 float matrices (broadcast against each other) computed in the
+       arithmetic of the global backend and rounded to float64."""
+    if get_backend() is FLOAT64:
+        return np.matmul(x, y)
+    if get_backend() is DOUBLE_DOUBLE:
+        hi, lo = dd_matmul((x, np.zeros(x.shape)), (y, np.zeros(y.shape)))
+        return hi + lo
+    x, y = np.broadcast_arrays(x, y)
+    return np.array([[float(c) for c in (PreciseMoeb(*p.ravel()) * PreciseMoeb(*q.ravel())).Coefficients]
+        for p, q in zip(x.reshape(-1, 2, 2), y.reshape(-1, 2, 2))]).reshape(x.shape)
+
+def _inv_matrices(m):
+    """Returns the inverses of a stack of 2x2 matrices of shape (..., 2, 2) via their adjugates."""
+    det = m[..., 0, 0] * m[..., 1, 1] - m[..., 0, 1] * m[..., 1, 0]
+    inv = np.empty_like(m)
+    inv[..., 0, 0] = m[..., 1, 1] / det
+    inv[..., 0, 1] = - m[..., 0, 1] / det
+    inv[..., 1, 0] = - m[..., 1, 0] / det
+    inv[..., 1, 1] = m[..., 0, 0] / det
+    return inv
+
+def _matrices(o):
+    """Returns the matrix representation of a MoebGen or MoebStack."""
+    if isinstance(o, MoebStack):
+        return o.Matrices
+    assert isinstance(o, MoebGen), "%s is not of type \"MoebGen\" or \"MoebStack\"!" % str(o)
+    return np.array([[o.a, o.b], [o.c, o.d]])
+
+class MoebStack:
+    """A class representing a stack of N general Moebius transformations stored as np.array of shape (N, 2, 2),
+       whose group operations are evaluated element wise (or broadcasted) over the whole stack."""
+
+    @property
+    def a(self):
+        return self._m[..., 0, 0]
+
+    @property
+    def b(self):
+        return self._m[..., 0, 1]
+
+    @property
+    def c(self):
+        return self._m[..., 1, 0]
+
+    @property
+    def d(self):
+        return self._m[..., 1, 1]
+
+    @property
+    def Det(self):
+        return self.a * self.d - self.b * self.c
+
+    @property
+    def Matrices(self):
+        return self._m
+
+    def __init__(self, m):
+        """
+        Parameters
+        ----------
+        m : np.array
+            Matrix representations ((a, b), (c, d)) of the Moebius transformations, of shape (N, 2, 2)
+        """
+
+        self._m = np.asarray(m, dtype=np.float64)
+        assert self._m.shape[-2:] == (2, 2), "m has wrong dimension!"
+
+    def identity(samples):
+        """Returns a MoebStack holding n=samples copies of the identity."""
+        return MoebStack(np.broadcast_to(np.eye(2), (samples, 2, 2)).copy())
+
+    def __len__(self):
+        return len(self._m)
+
+    def __getitem__(self, key):
+        m = self._m[key]
+        if m.ndim > 2:
+            return MoebStack(m)
+
+        a, b, c, d = m[0, 0].item(), m[0, 1].item(), m[1, 0].item(), m[1, 1].item()
+        det = a * d - b * c
+        if math.isclose(det, 1.0, abs_tol=1e-09):
+            return Moeb(a, b, c, d)
+        elif math.isclose(det, - 1.0, abs_tol=1e-09):
+            return MoebConj(a, b, c, d)
+        return MoebGen(a, b, c, d)
+
+    def __iter__(self):
+        for i in range(0, len(self._m)):
+            yield self[i]
 
+    def apply(self, z):
+        """Applies each transformation of the stack to the matching point of a batch of points.
 
+        Parameters
+        ----------
+        z : ComplexArray, np.array
+            Points given as ComplexArray, complex np.array of shape (N,) or float np.array of shape (N, 2).
+            A single point is broadcasted over the stack.
+
+        Returns
+        -------
+        ComplexArray, np.array
+            Images of the points in the same layout as z
+        """
+        w = _as_complex(z)
+        w = np.where(np.isclose(self.Det, - 1.0, rtol=.0, atol=1e-09), np.conj(w), w)
+        return _like((self.a * w + self.b) / (self.c * w + self.d), z)
+
+    def __call__(self, z):
+        if isinstance(z, GeodesicArray):
+            return self.map_lines(z)
+        return self.apply(z)
 
+    def outer(self, z):
+        """Applies every transformation of the stack to every point of a batch of points in one vectorized evaluation.
+
+        Parameters
+        ----------
+        z : ComplexArray, np.array
+            N points given as ComplexArray, complex np.array of shape (N,) or float np.array of shape (N, 2)
+
+        Returns
+        -------
+        np.array
+            Complex np.array of shape (T, N) holding the images of the points under the T transformations
+        """
+        w = _as_complex(z)[None, :]
+        a, b, c, d = self.a[:, None], self.b[:, None], self.c[:, None], self.d[:, None]
+        w = np.where(np.isclose(a * d - b * c, - 1.0, rtol=.0, atol=1e-09), np.conj(w), w)
+        return (a * w + b) / (c * w + d)
 
+    def map_lines(self, lines):
+        """Maps each geodesic line of a batch by the matching transformation of the stack.
+
+        Parameters
+        ----------
+        lines : GeodesicArray
+            Geodesic lines to be mapped, a single line is broadcasted over the stack
+
+        Returns
+        -------
+        GeodesicArray
+            Images of the lines
+        """
+        x_0, x_1 = lines.endpoints()
+        return GeodesicArray.line_between(_map_ideal(self.a, self.b, self.c, self.d, x_0),
+            _map_ideal(self.a, self.b, self.c, self.d, x_1))
+
+    def inv(self):
+        """Returns the element wise (group) inverse of instance."""
+        return MoebStack(_inv_matrices(self._m))
+
+    def __mul__(self, o):
+        """Right multiplicates the transformations of instance element wise with o.
+
+        Parameters
+        ----------
+        o : MoebStack or MoebGen
+            Moebius transformations multiplied with instance from right, a single MoebGen is broadcasted
 
+        Returns
+        -------
+        MoebStack
+            Element wise right multiplication of instance with o
+        """
+        return MoebStack(_matmul(self._m, _matrices(o)))
+
+    def __rmul__(self, o):
+        return MoebStack(_matmul(_matrices(o), self._m))
+
+    def conj(self, o):
+        """Returns the element wise (group) conjugation of instance with o.
+
+        Parameters
+        ----------
+        o : MoebStack or MoebGen
+            Moebius transformations used in conjugation of instance
+
+        Returns
+        -------
+        MoebStack
+            Element wise conjugation of instance by multiplying o from the right and its inverse from the left
+        """
+        m = _matrices(o)
+        return MoebStack(_matmul(_matmul(_inv_matrices(m), self._m), m))
+
+    def __truediv__(self, o):
+        """Multiplies instance element wise from left with the inverse of o.
+
+        Parameters
+        ----------
+        o : MoebStack or MoebGen
+            Moebius transformations to be inverted and multiplied from left with instance
+
+        Returns
+        -------
+        MoebStack
+            Element wise left division of instance by o
+        """
+        return MoebStack(_matmul(self._m, _inv_matrices(_matrices(o))))
+
+    def __pow__(self, n):
+        """Returns the element wise n-th power of instance computed by repeated squaring.
+
+        Parameters
+        ----------
+        n : int or np.array of int
+            Power, either one for all transformations or one per transformation
+
+        Returns
+        -------
+        MoebStack
+            Element wise n-th power of instance
+        """
+        n = np.asarray(n)
+        assert np.issubdtype(n.dtype, np.integer), "Power has to be an integer or an array of integers!"
+        n = np.broadcast_to(n, np.broadcast_shapes(n.shape, self._m.shape[:-2]))
+        base = np.where((n < 0)[..., None, None], _inv_matrices(self._m), self._m)
+        n = np.abs(n)
+        if get_backend() is DOUBLE_DOUBLE:
+            hi, lo = dd_pow((base, np.zeros(base.shape)), n)
+            return MoebStack(hi + lo)
+        if get_backend() is not FLOAT64:
+            base = np.broadcast_to(base, n.shape + (2, 2))
+            return MoebStack(np.array([[float(x) for x in (PreciseMoeb(*m.ravel()) ** int(k)).Coefficients]
+                for m, k in zip(base.reshape(-1, 2, 2), n.ravel())]).reshape(n.shape + (2, 2)))
+
+        # transformations of determinant +- 1 are renormalized after every squaring against the drift of the
+        # determinant
+        unit = np.broadcast_to(np.isclose(np.abs(self.Det), 1.0, rtol=.0, atol=1e-09), n.shape)
+        base = np.broadcast_to(base, n.shape + (2, 2)).copy()
+        pow = np.broadcast_to(np.eye(2), base.shape).copy()
+        while np.any(n):
+            odd = (n & 1).astype(bool)
+            pow[odd] = np.matmul(pow[odd], base[odd])
+            pow[odd & unit] = renormalize(pow[odd & unit])
+            n = n >> 1
+            base = np.matmul(base, base)
+            base[unit] = renormalize(base[unit])
+        return MoebStack(pow)
+
+    def __str__(self):
+        """Returns a string representation of of instance."""
+        return str(self._m)
+
+    def isclose(self, o):
+        """Returns a boolean np.array which is True where the coefficients of instance and o coincide up to a
+           tolerance of 1e-09."""
+        return np.all(np.isclose(self._m, _matrices(o), rtol=.0, atol=1e-09), axis=(-2, -1))
+
+    def __eq__(self, o):
+        if not isinstance(o, MoebGen) and not isinstance(o, MoebStack):
+            return False
+        if isinstance(o, MoebStack) and o.Matrices.shape != self._m.shape:
+            return False
+        return bool(np.all(self.isclose(o)))
+
+    __hash__ = None
+
+    def to_list(self):
+        """Returns instance as list of Moeb, MoebConj or MoebGen according to the determinant."""
+        return list(self)
+
+    def from_list(moebs):
+        """Converts a list of MoebGen into a MoebStack.
+
+        Parameters
+        ----------
+        moebs : list
+            List of MoebGen
+
+        Returns
+        -------
+        MoebStack
+            List converted to MoebStack
+        """
+        return MoebStack(np.array([[[m.a, m.b], [m.c, m.d]] for m in moebs], dtype=np.float64).reshape(-1, 2, 2))
+
+    def rnd(min, max, samples, det=1.0, rng=None):
+        """Returns a MoebStack of n=samples random Moebius transformations whose coefficients (before
+           normalization) are bounded by min from below and by max from above.
+
+        Parameters
+        ----------
+        min : float
+            lower boundary for the randomly generated coefficients
+        max : float
+            upper boundary for the randomly generated coefficients
+        samples : int
+            Number of transformations
+        det : float
+            Determinant of the generated transformations, either 1.0 or -1.0
+        rng : np.random.Generator
+            Random number generator, the global numpy random state if None
+
+        Returns
+        -------
+        MoebStack
+            Stack of n=samples random Moebius transformations of determinant det
+        """
+        rng = rng if rng is not None else np.random
+        coeffs = rng.uniform(min, max, (samples, 4))
+        dets = coeffs[:, 0] * coeffs[:, 3] - coeffs[:, 1] * coeffs[:, 2]
+        while np.any(dets == .0):
+            zero = dets == .0
+            coeffs[zero] = rng.uniform(min, max, (np.count_nonzero(zero), 4))
+            dets = coeffs[:, 0] * coeffs[:, 3] - coeffs[:, 1] * coeffs[:, 2]
+
+        # flipping the sign of the first row flips the sign of the determinant
+        flip = np.sign(dets) != np.sign(det)
+        coeffs[flip, 0:2] *= - 1.0
+        coeffs /= np.sqrt(np.abs(dets))[:, None]
+        return MoebStack(coeffs.reshape(samples, 2, 2))
@@ -0,0 +1,189 @@
+import os
+import concurrent.futures
+from multiprocessing import shared_memory
+
+from hypgeo.complex_plane import *
+from hypgeo.complex_plane import _as_complex, _like
+from hypgeo.geometry import GeodesicArray, HalfSpace
+from hypgeo.moebius import MoebGen, MoebStack
+
+def _attach(name):
+    """Attaches to an existing shared memory block without handing it over to the resource tracker of the worker,
+       as the block is owned (and unlinked) by the calling process."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)
+
+def _worker(kernel, args, inputs, outputs, lo, hi):
+    """Runs kernel on the rows lo, ..., hi - 1 of the input buffers and writes its results into the matching part
+       (along the given axis) of the output buffers. Buffers are passed as tuples (name, shape, dtype[, axis])."""
+    blocks = [_attach(name) for name, shape, dtype in inputs] + [_attach(o[0]) for o in outputs]
+    try:
+        x = [np.ndarray(shape, dtype=dtype, buffer=b.buf)[lo: hi] for b, (name, shape, dtype) in zip(blocks, inputs)]
+        results = kernel(*args, *x)
+        for b, (name, shape, dtype, axis), result in zip(blocks[len(inputs):], outputs, results):
+            out = np.ndarray(shape, dtype=dtype, buffer=b.buf)
+            out[(slice(None),) * axis + (slice(lo, hi),)] = result
+            del out
+        del x
+    finally:
+        for b in blocks:
+            b.close()
+
+def _apply_moeb(moeb, z):
+    return (moeb.apply(z),)
+
+def _apply_stack(m, z):
+    return (MoebStack(m).apply(z),)
+
+def _line_trough(z0, z1):
+    lines = GeodesicArray.line_trough(z0, z1)
+    return lines.IsVertical, lines.Center, lines.Radius
+
+def _position_batch(space, tol, z):
+    return (space.position_batch(z, tol),)
+
+def _position_matrix(spaces, tol, z):
+    return (HalfSpace.position_matrix(spaces, z, tol),)
+
+class Executor:
+    """A class executing batched Moebius and geometry operations on a process pool. Inputs are copied once into
+       shared memory blocks, the workers read their shard of rows from there and write their results directly into
+       shared output blocks, so that no array is pickled. Every shard is processed by the same vectorized code as the
+       serial path, hence the results are identical.
+
+       Inputs with less than 2 * min_shard rows are processed serially in the calling process. Instances should be
+       used as context manager, or be shut down explicitly, to terminate the worker processes."""
+
+    @property
+    def Workers(self):
+        return self._workers
+
+    def __init__(self, workers=None, min_shard=65536):
+        """
+        Parameters
+        ----------
+        workers : int
+            Number of worker processes, the number of CPUs if None
+        min_shard : int
+            Minimal number of rows per shard
+        """
+
+        self._workers = workers if workers is not None else (os.cpu_count() or 1)
+        assert self._workers >= 1, "At least one worker is needed!"
+        self._min_shard = min_shard
+        self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+
+    def shutdown(self):
+        """Terminates the worker processes."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def _shards(self, n):
+        shards = min(self._workers, n // self._min_shard)
+        return np.linspace(0, n, shards + 1).astype(np.int64) if shards > 1 else None
+
+    def _run(self, kernel, args, inputs, outputs, bounds):
+        """Runs kernel on the shards given by bounds. inputs is a list of np.array sharded along their first axis,
+           outputs a list of tuples (shape, dtype, axis) of the results sharded along the given axis."""
+        if self._pool is None:
+            self._pool = concurrent.futures.ProcessPoolExecutor(self._workers)
+
+        blocks = []
+        try:
+            specs_in, specs_out, arrays_out = [], [], []
+            for x in inputs:
+                x = np.ascontiguousarray(x)
+                b = shared_memory.SharedMemory(create=True, size=max(x.nbytes, 1))
+                blocks.append(b)
+                np.ndarray(x.shape, dtype=x.dtype, buffer=b.buf)[...] = x
+                specs_in.append((b.name, x.shape, x.dtype.str))
+            for shape, dtype, axis in outputs:
+                b = shared_memory.SharedMemory(create=True, size=max(int(np.prod(shape)) * np.dtype(dtype).itemsize, 1))
+                blocks.append(b)
+                specs_out.append((b.name, shape, np.dtype(dtype).str, axis))
+                arrays_out.append(np.ndarray(shape, dtype=dtype, buffer=b.buf))
+
+            futures = [self._pool.submit(_worker, kernel, args, specs_in, specs_out, int(lo), int(hi))
+                for lo, hi in zip(bounds[: - 1], bounds[1:])]
+            for f in futures:
+                f.result()
+            return [a.copy() for a in arrays_out]
+        finally:
+            arrays_out = None
+            for b in blocks:
+                b.close()
+                b.unlink()
+
+    def apply(self, moebs, z):
+        """Applies a Moebius transformation to a batch of points, or a stack of transformations element wise.
+
+        Parameters
+        ----------
+        moebs : MoebGen or MoebStack
+            Transformation applied to all points or stack of N transformations
+        z : ComplexArray, np.array
+            N points given as ComplexArray, complex np.array of shape (N,) or float np.array of shape (N, 2)
+
+        Returns
+        -------
+        ComplexArray, np.array
+            Images of the points in the same layout as z
+        """
+        w = _as_complex(z)
+        bounds = self._shards(len(w))
+        if bounds is None:
+            return moebs.apply(z)
+        if isinstance(moebs, MoebStack):
+            assert len(moebs) == len(w), "moebs and z have different lengths!"
+            result, = self._run(_apply_stack, (), [moebs.Matrices, w], [(w.shape, np.complex128, 0)], bounds)
+        else:
+            assert isinstance(moebs, MoebGen), "moebs is not of type \"MoebGen\" or \"MoebStack\"!"
+            result, = self._run(_apply_moeb, (moebs,), [w], [(w.shape, np.complex128, 0)], bounds)
+        return _like(result, z)
+
+    def line_trough(self, z0, z1):
+        """Returns the geodesic lines through the pairs of points z0 and z1, see GeodesicArray.line_trough."""
+        z0, z1 = _as_complex(z0), _as_complex(z1)
+        assert len(z0) == len(z1), "z0 and z1 have different lengths!"
+        bounds = self._shards(len(z0))
+        if bounds is None:
+            return GeodesicArray.line_trough(z0, z1)
+        vertical, center, radius = self._run(_line_trough, (), [z0, z1],
+            [(z0.shape, np.bool_, 0), (z0.shape, np.float64, 0), (z0.shape, np.float64, 0)], bounds)
+        return GeodesicArray(vertical, center, radius)
+
+    def position(self, spaces, z, tol=1e-09):
+        """Classifies a batch of points with respect to one or several half spaces.
+
+        Parameters
+        ----------
+        spaces : HalfSpace or list
+            Half space, see HalfSpace.position_batch, or list of M half spaces, see HalfSpace.position_matrix
+        z : ComplexArray, np.array
+            N points given as ComplexArray, complex np.array of shape (N,) or float np.array of shape (N, 2)
+        tol : float
+            Points whose level function is within tol of zero lie on the boundary
+
+        Returns
+        -------
+        np.array
+            Positions of type int8 of shape (N,) for a single half space and of shape (M, N) for a list
+        """
+        w = _as_complex(z)
+        bounds = self._shards(len(w))
+        if type(spaces) is HalfSpace:
+            if bounds is None:
+                return spaces.position_batch(w, tol)
+            return self._run(_position_batch, (spaces, tol), [w], [(w.shape, np.int8, 0)], bounds)[0]
+        if bounds is None:
+            return HalfSpace.position_matrix(spaces, w, tol)
+        return self._run(_position_matrix, (spaces, tol), [w], [((len(spaces), len(w)), np.int8, 1)], bounds)[0]
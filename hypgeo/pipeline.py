@@ -0,0 +1,279 @@
+import itertools
+
+from hypgeo.complex_plane import *
+from hypgeo.complex_plane import _as_complex
+from hypgeo.geometry import HalfSpace
+from hypgeo.polygon import HyperbolicPolygon
+from hypgeo.storage import Kind, Writer, info, load
+
+class Chunk:
+    """A class representing a chunk of a point stream: the points as complex np.array of shape (N,) together with
+       named columns of per point data of length N added by the stages of a pipeline."""
+
+    @property
+    def Points(self):
+        return self._points
+
+    @property
+    def Columns(self):
+        return self._columns
+
+    def __init__(self, points, **columns):
+        """
+        Parameters
+        ----------
+        points : ComplexArray, np.array
+            Points given as ComplexArray, complex np.array of shape (N,) or float np.array of shape (N, 2)
+        columns : np.array
+            Per point data of length N
+        """
+
+        self._points = _as_complex(points)
+        self._columns = columns
+
+    def __len__(self):
+        return len(self._points)
+
+    def __getitem__(self, name):
+        return self._columns[name]
+
+    def replace(self, points=None, **columns):
+        """Returns a chunk with the points replaced (if not None) and the given columns added or replaced."""
+        return Chunk(self._points if points is None else points, **{**self._columns, **columns})
+
+# sources yielding chunks
+
+def sample(min_re, max_re, max_im, samples=None, chunk_size=65536, rng=None):
+    """Yields chunks of points uniformly distributed in the rectangle [min_re, max_re] x (0, max_im] of HPlus.
+
+    Parameters
+    ----------
+    min_re : float
+        Lower boundary of the real parts
+    max_re : float
+        Upper boundary of the real parts
+    max_im : float
+        Upper boundary of the imaginary parts
+    samples : int
+        Total number of points, unbounded if None
+    chunk_size : int
+        Number of points per chunk
+    rng : np.random.Generator
+        Random number generator, a new default generator if None
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    for start in itertools.count(0, chunk_size):
+        if samples is not None and start >= samples:
+            return
+        n = chunk_size if samples is None else min(chunk_size, samples - start)
+        yield Chunk(rng.uniform(min_re, max_re, n) + 1.0j * (max_im - rng.uniform(.0, max_im, n)))
+
+def read(path, chunk_size=65536):
+    """Yields chunks of the points stored in the container at path (see hypgeo.storage), which is memory mapped so
+       that only the current chunk is read into memory."""
+    kind, count = info(path)
+    assert kind == Kind.POINTS, "Container does not hold points!"
+    points = load(path).Values
+    for start in range(0, count, chunk_size):
+        yield Chunk(np.array(points[start: start + chunk_size]))
+
+def iterate(iterable, chunk_size=65536):
+    """Yields chunks of fixed size (except the last one) of the points of an iterable of ComplexNumber, complex
+       numbers or batches of points (ComplexArray or np.array)."""
+    buffer, size = [], 0
+    for item in iterable:
+        if type(item) is ComplexNumber:
+            item = np.array([complex(item.re, item.im)])
+        elif np.isscalar(item):
+            item = np.array([complex(item)])
+        else:
+            item = _as_complex(item)
+        # the buffer holds less than chunk_size points, it is filled up from the front of item, then chunks are
+        # sliced from item and only its short tail is kept, so that every point is copied once
+        start = 0
+        if size > 0:
+            start = min(chunk_size - size, len(item))
+            buffer.append(np.array(item[: start]))
+            size += start
+            if size < chunk_size:
+                continue
+            yield Chunk(np.concatenate(buffer))
+            buffer, size = [], 0
+        end = start + (len(item) - start) // chunk_size * chunk_size
+        for offset in range(start, end, chunk_size):
+            yield Chunk(np.array(item[offset: offset + chunk_size]))
+        if end < len(item):
+            buffer, size = [np.array(item[end:])], len(item) - end
+    if size > 0:
+        yield Chunk(np.concatenate(buffer))
+
+# stages mapping chunks to chunks
+
+class Apply:
+    """Stage applying a Moebius transformation (MoebGen) to the points."""
+
+    def __init__(self, moeb):
+        self._moeb = moeb
+
+    def __call__(self, chunk):
+        return chunk.replace(self._moeb.apply(chunk.Points))
+
+class Reduce:
+    """Stage reducing the points into a fundamental domain (FundamentalDomain). Adds the columns 'converged' and
+       'length' holding the convergence mask and the number of applied pairings, and the matrices of the accumulated
+       transformations of shape (N, 2, 2) as column 'moebs' if moebs is True."""
+
+    def __init__(self, domain, max_iter=1000, moebs=False):
+        self._domain = domain
+        self._max_iter = max_iter
+        self._moebs = moebs
+
+    def __call__(self, chunk):
+        r = self._domain.reduce(chunk.Points, self._max_iter)
+        columns = {'converged': r.Converged, 'length': np.sum(r.Powers, axis=1)}
+        if self._moebs:
+            columns['moebs'] = r.Moebs.Matrices
+        return chunk.replace(r.Points, **columns)
+
+class Classify:
+    """Stage classifying the points with respect to a HalfSpace, the intersection of a list of HalfSpace or a
+       HyperbolicPolygon. Adds the positions (values of Position) as column name."""
+
+    def __init__(self, region, name='position', tol=1e-09):
+        self._region = region
+        self._name = name
+        self._tol = tol
+
+    def __call__(self, chunk):
+        if type(self._region) is HyperbolicPolygon:
+            positions = self._region.positions(chunk.Points)
+        elif type(self._region) is HalfSpace:
+            positions = self._region.position_batch(chunk.Points, self._tol)
+        else:
+            positions = HalfSpace.intersection(self._region, chunk.Points, self._tol)
+        return chunk.replace(**{self._name: positions})
+
+class Filter:
+    """Stage keeping the points for which predicate (a function of the chunk returning a boolean mask) is True."""
+
+    def __init__(self, predicate):
+        self._predicate = predicate
+
+    def __call__(self, chunk):
+        mask = self._predicate(chunk)
+        return Chunk(chunk.Points[mask], **{name: column[mask] for name, column in chunk.Columns.items()})
+
+# sinks consuming chunks
+
+class Histogram:
+    """Sink accumulating the two dimensional histogram of the real and imaginary parts of the points."""
+
+    def __init__(self, bins, range):
+        """
+        Parameters
+        ----------
+        bins : int or (int, int)
+            Number of bins along the real and imaginary axis
+        range : ((float, float), (float, float))
+            Boundaries of the bins along the real and imaginary axis, points outside are ignored
+        """
+
+        self._bins = bins
+        self._range = range
+        self._counts = None
+        self._edges = None
+
+    def consume(self, chunk):
+        counts, x, y = np.histogram2d(chunk.Points.real, chunk.Points.imag, self._bins, self._range)
+        if self._counts is None:
+            self._counts, self._edges = counts.astype(np.int64), (x, y)
+        else:
+            self._counts += counts.astype(np.int64)
+
+    def result(self):
+        """Returns the counts of shape (bins_x, bins_y) and the bin edges along both axes."""
+        return self._counts, self._edges
+
+class Count:
+    """Sink counting the values of an integer column, e.g. the positions added by Classify."""
+
+    def __init__(self, name='position', length=4):
+        self._name = name
+        self._counts = np.zeros(length, dtype=np.int64)
+
+    def consume(self, chunk):
+        counts = np.bincount(chunk[self._name].astype(np.int64), minlength=len(self._counts))
+        if len(counts) > len(self._counts):
+            self._counts = np.concatenate([self._counts, np.zeros(len(counts) - len(self._counts), dtype=np.int64)])
+        self._counts[: len(counts)] += counts
+
+    def result(self):
+        return self._counts
+
+class Write:
+    """Sink appending the points to the container at path (see hypgeo.storage)."""
+
+    def __init__(self, path, append=False):
+        self._writer = Writer(path, Kind.POINTS, append)
+
+    def consume(self, chunk):
+        self._writer.append(chunk.Points)
+
+    def result(self):
+        self._writer.close()
+        return self._writer.Count
+
+class Collect:
+    """Sink concatenating all chunks into one, for streams fitting into memory."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def consume(self, chunk):
+        self._chunks.append(chunk)
+
+    def result(self):
+        if len(self._chunks) == 0:
+            return Chunk(np.zeros(0, dtype=np.complex128))
+        names = self._chunks[0].Columns.keys()
+        return Chunk(np.concatenate([c.Points for c in self._chunks]),
+            **{name: np.concatenate([c[name] for c in self._chunks]) for name in names})
+
+class Pipeline:
+    """A class representing a stream of point chunks from a source through a sequence of stages. Pipelines are
+       lazy: chunks are pulled from the source one at a time and passed through all stages, so memory is bounded by
+       the chunk size independent of the length of the stream."""
+
+    def __init__(self, source, stages=()):
+        """
+        Parameters
+        ----------
+        source : iterable
+            Iterable of Chunk, e.g. sample, read or iterate
+        stages : list
+            Functions mapping a Chunk to a Chunk, e.g. Apply, Reduce, Classify or Filter
+        """
+
+        self._source = source
+        self._stages = list(stages)
+
+    def then(self, stage):
+        """Returns the pipeline extended by stage."""
+        return Pipeline(self._source, self._stages + [stage])
+
+    def __iter__(self):
+        for chunk in self._source:
+            if not isinstance(chunk, Chunk):
+                chunk = Chunk(chunk)
+            for stage in self._stages:
+                chunk = stage(chunk)
+            yield chunk
+
+    def run(self, *sinks):
+        """Feeds all chunks into the sinks (objects with methods consume(chunk) and result()) and returns their
+           results, a single result for a single sink."""
+        for chunk in self:
+            for sink in sinks:
+                sink.consume(chunk)
+        results = tuple(sink.result() for sink in sinks)
+        return results[0] if len(results) == 1 else results
@@ -0,0 +1,173 @@
+from hypgeo.complex_plane import *
+from hypgeo.complex_plane import _as_complex
+from hypgeo.geometry import *
+from hypgeo.geometry import _levels, _classify
+
+def _pad(vertical, radius, tol):
+    """Returns the distance beyond the shadow of a geodesic line on the real axis from which on its level function
+       exceeds 2 * tol for all points of HPlus, including some slack for rounding."""
+    with np.errstate(invalid='ignore'):
+        pad = np.where(vertical, 2.0 * tol, 4.0 * radius * tol / (np.sqrt(radius * radius + 4.0 * radius * tol) + radius))
+    return pad
+
+class HyperbolicPolygon:
+    """A class representing a convex hyperbolic polygon in the upper half plane as intersection of the half spaces
+       given by its ordered sides. A point is IN the polygon if it lies inside of all sides, OUT if it lies outside
+       of at least one and ON otherwise.
+
+       For fast point location the real axis is cut into bins at the (slightly widened) shadows of the sides. In each
+       bin a side either has a fixed position for all points above the bin, or is active, i.e. its half circle spans
+       the bin. Points are located by binary search for their bin and only tested against the active sides of it."""
+
+    @property
+    def Sides(self):
+        return self._sides
+
+    @property
+    def Lines(self):
+        return self._lines
+
+    @property
+    def Signs(self):
+        return self._sign
+
+    @property
+    def Tolerance(self):
+        return self._tol
+
+    def __init__(self, sides, interior=None, tol=1e-09):
+        """
+        Parameters
+        ----------
+        sides : list
+            Ordered list of HalfSpace, or of GeodesicLine if interior is given
+        interior : ComplexNumber
+            Point in the interior of the polygon fixing on which side of each geodesic line the polygon lies
+        tol : float
+            Points whose level function with respect to a side is within tol of zero, i.e. about within the euclidean
+            distance tol of it, lie on that side
+        """
+
+        assert len(sides) > 0, "A polygon needs at least one side!"
+        if interior is not None:
+            assert type(interior) is ComplexNumber, "interior is not of type \"ComplexNumber\"!"
+            spaces = []
+            for line in sides:
+                h = HalfSpace(line)
+                position = h.position(interior)
+                assert position != Position.ON, "interior lies on the side {}!".format(str(line))
+                spaces.append(h if position == Position.IN else h.complement())
+            sides = spaces
+        else:
+            assert all(type(h) is HalfSpace for h in sides), "sides are not of type \"HalfSpace\"!"
+
+        self._sides = list(sides)
+        self._tol = tol
+        self._lines = GeodesicArray.from_list([h.Line for h in self._sides])
+        self._sign = np.array([h.Sign for h in self._sides])
+        self._build_index()
+
+    def _build_index(self):
+        vertical, center, radius = self._lines.IsVertical, self._lines.Center, self._lines.Radius
+        pad = _pad(vertical, radius, self._tol)
+        slack = 4.0 * np.finfo(np.float64).eps * (np.abs(center) + np.where(vertical, .0, radius))
+        lo = np.where(vertical, center, center - radius) - pad - slack
+        hi = np.where(vertical, center, center + radius) + pad + slack
+
+        # bin j covers [breaks[j - 1], breaks[j]), side s is active in the bins p_s + 1, ..., q_s
+        self._breaks = np.unique(np.concatenate([lo, hi]))
+        bins = len(self._breaks) + 1
+        p, q = np.searchsorted(self._breaks, lo), np.searchsorted(self._breaks, hi)
+
+        # first side (in order) lying outside for all points above the bin: the sides outside on the left of their
+        # shadow cover the bins 0, ..., p_s, the ones outside on the right cover q_s + 1, ..., bins - 1
+        left_out = np.where(vertical, self._sign < .0, self._sign > .0)
+        right_out = self._sign > .0
+        sides = np.arange(len(self._sides))
+        left, right = np.full(bins, len(sides)), np.full(bins, len(sides))
+        np.minimum.at(left, p[left_out], sides[left_out])
+        np.minimum.at(right, q[right_out] + 1, sides[right_out])
+        self._first_out = np.minimum(np.minimum.accumulate(left[:: - 1])[:: - 1], np.minimum.accumulate(right))
+        self._out = self._first_out < len(sides)
+
+        # active sides of each bin in compressed sparse row layout
+        length = q - p
+        total = int(np.sum(length))
+        side = np.repeat(sides, length)
+        offset = np.arange(total) - np.repeat(np.cumsum(length) - length, length)
+        active_bin = np.repeat(p + 1, length) + offset
+        order = np.argsort(active_bin, kind='stable')
+        self._active = side[order]
+        self._ptr = np.concatenate([[0], np.cumsum(np.bincount(active_bin, minlength=bins))])
+
+    def __len__(self):
+        return len(self._sides)
+
+    def _locate(self, z, excluded=False):
+        """Returns the bins of the points z (complex np.array), the indices of the points not excluded by their bin
+           (all points if excluded is True) and for these all pairs (point, active side) together with their
+           positions."""
+        bins = np.searchsorted(self._breaks, z.real, side='right')
+        todo = np.arange(len(z)) if excluded else np.flatnonzero(~self._out[bins])
+
+        # pair every remaining point with the active sides of its bin
+        start, count = self._ptr[bins[todo]], self._ptr[bins[todo] + 1] - self._ptr[bins[todo]]
+        total = int(np.sum(count))
+        point = np.repeat(np.arange(len(todo)), count)
+        offset = np.arange(total) - np.repeat(np.cumsum(count) - count, count)
+        side = self._active[np.repeat(start, count) + offset]
+
+        lines = self._lines
+        levels = self._sign[side] * _levels(lines.IsVertical[side], lines.Center[side], lines.Radius[side],
+            z[todo][point])
+        return bins, todo, point, side, _classify(levels, self._tol)
+
+    def positions(self, z):
+        """Locates a batch of points with respect to the polygon.
+
+        Parameters
+        ----------
+        z : ComplexArray, np.array
+            Points given as ComplexArray, complex np.array of shape (N,) or float np.array of shape (N, 2)
+
+        Returns
+        -------
+        np.array
+            Positions of the points as np.array of type int8 holding the values of Position
+        """
+        z = _as_complex(z)
+        bins, todo, point, side, pair = self._locate(z)
+        result = np.full(len(z), Position.OUT.value, dtype=np.int8)
+        out = np.bincount(point, weights=pair == Position.OUT.value, minlength=len(todo)) > 0
+        on = np.bincount(point, weights=pair == Position.ON.value, minlength=len(todo)) > 0
+        result[todo] = np.where(out, Position.OUT.value, np.where(on, Position.ON.value, Position.IN.value))
+        return result
+
+    def violations(self, z):
+        """Returns for a batch of points the index of the first side (in the order of Sides) they lie outside of.
+
+        Parameters
+        ----------
+        z : ComplexArray, np.array
+            Points given as ComplexArray, complex np.array of shape (N,) or float np.array of shape (N, 2)
+
+        Returns
+        -------
+        np.array
+            Indices of the first violated side as np.array of type int64, - 1 for points in the closed polygon
+        """
+        z = _as_complex(z)
+        bins, todo, point, side, pair = self._locate(z, True)
+        result = self._first_out[bins]
+        out = (pair == Position.OUT.value) & (side < result[point])
+        np.minimum.at(result, todo[point[out]], side[out])
+        return np.where(result < len(self._sides), result, - 1)
+
+    def position(self, z):
+        """Returns the Position of the point z (ComplexNumber) with respect to the polygon."""
+        assert type(z) is ComplexNumber, "z is not of type \"ComplexNumber\"!"
+        return Position(int(self.positions(np.array([complex(z.re, z.im)]))[0]))
+
+    def contains(self, z):
+        """Returns a boolean np.array which is True for the points of the batch z lying in the closed polygon."""
+        return self.positions(z) != Position.OUT.value
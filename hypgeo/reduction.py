@@ -0,0 +1,179 @@
+from hypgeo.complex_plane import *
+from hypgeo.complex_plane import _as_complex, _like
+from hypgeo.moebius import MoebGen, MoebStack
+from hypgeo.polygon import HyperbolicPolygon
+
+def _translations(g, power):
+    """Returns the powers of the translations g (matrices ((a, b), (0, a)) of shape (N, 2, 2), a = +- 1)."""
+    sign = np.where((g[:, 0, 0] < .0) & (power % 2.0 == 1.0), - 1.0, 1.0)
+    t = np.zeros_like(g)
+    t[:, 0, 0], t[:, 1, 1] = sign, sign
+    t[:, 0, 1] = sign * power * g[:, 0, 1] / g[:, 0, 0]
+    return t
+
+class Reduction:
+    """A class holding the result of the reduction of a batch of N points into a fundamental domain: the reduced
+       points, the accumulated transformations mapping the original points onto them and the words of side indices
+       whose pairings were applied, from first to last, together with their exponents."""
+
+    @property
+    def Points(self):
+        return self._points
+
+    @property
+    def Moebs(self):
+        return self._moebs
+
+    @property
+    def Words(self):
+        return self._words
+
+    @property
+    def Powers(self):
+        return self._powers
+
+    @property
+    def Lengths(self):
+        return self._lengths
+
+    @property
+    def Converged(self):
+        return self._converged
+
+    def __init__(self, points, moebs, words, powers, converged):
+        """
+        Parameters
+        ----------
+        points : ComplexArray, np.array
+            Reduced points in the layout of the input points
+        moebs : MoebStack
+            Transformations mapping the input points onto the reduced points
+        words : np.array
+            Indices of the applied side pairings of shape (N, L), padded with - 1
+        powers : np.array
+            Exponents of the applied side pairings of shape (N, L), padded with 0
+        converged : np.array
+            Boolean mask which is True for the points which landed in the domain
+        """
+
+        self._points = points
+        self._moebs = moebs
+        self._words = words
+        self._powers = powers
+        self._lengths = np.count_nonzero(words >= 0, axis=1)
+        self._converged = converged
+
+    def __len__(self):
+        return len(self._converged)
+
+    def word(self, i):
+        """Returns the word of the i-th point as list of side indices, each repeated according to its exponent."""
+        return np.repeat(self._words[i, : self._lengths[i]], self._powers[i, : self._lengths[i]]).tolist()
+
+class FundamentalDomain:
+    """A class representing a fundamental domain of a group of Moebius transformations given by a polygon and one
+       side pairing per side. The pairing of a side is the transformation applied to points lying outside of that
+       side, e.g. the translation z -> z + 1 for the side x = - 1 / 2 of the modular group.
+
+       Translations paired with vertical sides are applied with the exponent moving the point across the side in a
+       single step, so that points far out in a cusp do not cost one iteration per translation."""
+
+    @property
+    def Polygon(self):
+        return self._polygon
+
+    @property
+    def Pairings(self):
+        return self._pairings
+
+    def __init__(self, polygon, pairings):
+        """
+        Parameters
+        ----------
+        polygon : HyperbolicPolygon
+            Fundamental polygon
+        pairings : list, MoebStack
+            Side pairings (Moeb, MoebConj or MoebGen) in the order of the sides of the polygon
+        """
+
+        assert type(polygon) is HyperbolicPolygon, "polygon is not of type \"HyperbolicPolygon\"!"
+        if not isinstance(pairings, MoebStack):
+            assert all(isinstance(g, MoebGen) for g in pairings), "pairings are not of type \"MoebGen\"!"
+            pairings = MoebStack.from_list(pairings)
+        assert len(pairings) == len(polygon), "There has to be exactly one pairing per side!"
+
+        self._polygon = polygon
+        self._pairings = pairings
+        self._conj = np.isclose(pairings.Det, - 1.0, rtol=.0, atol=1e-09)
+
+        # translations z -> z + t moving points outside of a vertical side towards it
+        a, b, c, d = pairings.a, pairings.b, pairings.c, pairings.d
+        self._shift = np.where(np.isclose(c, .0, rtol=.0, atol=1e-09) & np.isclose(a, d, rtol=.0, atol=1e-09)
+            & ~self._conj, b / np.where(d == .0, 1.0, d), .0)
+        self._shift = np.where(polygon.Lines.IsVertical & (polygon.Signs * self._shift < .0), self._shift, .0)
+
+    def word_to_moeb(self, word):
+        """Returns the transformation g_{w_k} * ... * g_{w_1} of a word (w_1, ..., w_k) of side indices."""
+        m = np.eye(2)
+        for w in word:
+            if w < 0:
+                break
+            m = self._pairings.Matrices[w] @ m
+        return MoebStack(m[None])[0]
+
+    def reduce(self, z, max_iter=1000):
+        """Maps a batch of points into the fundamental domain by repeatedly applying the pairing of the first
+           violated side. Points landing in the domain drop out of the iteration.
+
+        Parameters
+        ----------
+        z : ComplexArray, np.array
+            Points given as ComplexArray, complex np.array of shape (N,) or float np.array of shape (N, 2)
+        max_iter : int
+            Maximal number of pairings applied to a point
+
+        Returns
+        -------
+        Reduction
+            Reduced points, accumulated transformations and words
+        """
+        w = _as_complex(z).copy()
+        m = MoebStack.identity(len(w)).Matrices
+        pairings = self._pairings.Matrices
+        converged = np.zeros(len(w), dtype=bool)
+        steps = []
+        absc = self._polygon.Lines.Center
+
+        # working copies of the points and transformations still to be reduced
+        active = np.arange(len(w))
+        w_act, m_act = w, m.copy()
+        for i in range(0, max_iter + 1):
+            side = self._polygon.violations(w_act)
+            done = side < 0
+            if np.any(done):
+                w[active[done]], m[active[done]] = w_act[done], m_act[done]
+                converged[active[done]] = True
+                keep = ~done
+                active, side, w_act, m_act = active[keep], side[keep], w_act[keep], m_act[keep]
+            if len(active) == 0 or i == max_iter:
+                break
+
+            g = pairings[side]
+            shift = self._shift[side]
+            power = np.ones(len(side))
+            jump = np.flatnonzero(shift != .0)
+            if len(jump) > 0:
+                power[jump] = np.maximum(np.ceil(np.abs(w_act.real[jump] - absc[side[jump]]) / np.abs(shift[jump])),
+                    1.0)
+                g[jump] = _translations(g[jump], power[jump])
+            u = np.where(self._conj[side], np.conj(w_act), w_act)
+            w_act = (g[:, 0, 0] * u + g[:, 0, 1]) / (g[:, 1, 0] * u + g[:, 1, 1])
+            m_act = np.matmul(g, m_act)
+            steps.append((active, side, power.astype(np.int64)))
+
+        w[active], m[active] = w_act, m_act
+        words = np.full((len(w), len(steps)), - 1, dtype=np.int64)
+        powers = np.zeros((len(w), len(steps)), dtype=np.int64)
+        for k, (index, side, power) in enumerate(steps):
+            words[index, k], powers[index, k] = side, power
+        return Reduction(_like(w, z), MoebStack(m), words, powers, converged)
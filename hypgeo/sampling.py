@@ -0,0 +1,76 @@
+import math
+from hypgeo.complex_plane import *
+from hypgeo.complex_plane import _as_complex
+from hypgeo.geometry import GeodesicArray, polygon_center
+from hypgeo.polygon import HyperbolicPolygon
+
+def _distance(z, w):
+    return np.arccosh(1.0 + np.abs(z - w) ** 2 / (2.0 * z.imag * w.imag))
+
+def disc(center, radius, samples, rng=None):
+    """Returns random points uniformly distributed with respect to the hyperbolic area in a hyperbolic disc.
+
+    Parameters
+    ----------
+    center : ComplexNumber
+        Center of the disc
+    radius : float
+        Hyperbolic radius of the disc
+    samples : int
+        Number of points
+    rng : np.random.Generator
+        Random number generator, the global numpy random state if None
+
+    Returns
+    -------
+    ComplexArray
+        Random points in the disc
+    """
+    assert type(center) is ComplexNumber, "center is not of type \"ComplexNumber\"!"
+    assert center.im > .0, "center is not contained in HPlus!"
+    rng = rng if rng is not None else np.random
+
+    # the area of the disc of radius r is 4 pi sinh(r / 2)^2, invert its distribution function
+    u, phi = rng.uniform(.0, 1.0, samples), rng.uniform(.0, 2.0 * math.pi, samples)
+    r = 2.0 * np.arcsinh(np.sqrt(u) * math.sinh(radius / 2.0))
+
+    # points of the Poincare disk around 0 mapped onto HPlus around i, then moved to center
+    z = disk_to_plane(np.tanh(r / 2.0) * np.exp(1.0j * phi))
+    return ComplexArray(center.re + center.im * z)
+
+def polygon(vertices, samples, rng=None):
+    """Returns random points uniformly distributed with respect to the hyperbolic area in a convex hyperbolic polygon,
+       drawn by rejection from the smallest disc around a center of the polygon containing all vertices.
+
+    Parameters
+    ----------
+    vertices : ComplexArray, np.array
+        Vertices of the convex polygon in HPlus, either in clockwise or counterclockwise order
+    samples : int
+        Number of points
+    rng : np.random.Generator
+        Random number generator, the global numpy random state if None
+
+    Returns
+    -------
+    ComplexArray
+        Random points in the polygon
+    """
+    v = _as_complex(vertices)
+    assert len(v) >= 3, "A polygon needs at least three vertices!"
+    assert np.all(v.imag > .0), "vertices are not contained in HPlus!"
+    c = polygon_center(v)
+    sides = GeodesicArray.line_trough(v, np.roll(v, - 1))
+    P = HyperbolicPolygon(sides.to_list(), ComplexNumber(c.real, c.imag))
+    center, radius = ComplexNumber(c.real, c.imag), float(np.max(_distance(v, c)))
+
+    points, count, rate = [], 0, 1.0
+    while count < samples:
+        # draw enough candidates for the remaining points at the observed acceptance rate
+        n = int(1.1 * (samples - count) / rate) + 16
+        z = disc(center, radius, n, rng).Values
+        z = z[P.contains(z)]
+        rate = max(len(z) / n, 1e-03)
+        points.append(z[: samples - count])
+        count += len(points[- 1])
+    return ComplexArray(np.concatenate(points) if len(points) > 0 else np.zeros(0, dtype=np.complex128))
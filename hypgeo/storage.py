@@ -0,0 +1,168 @@
+"""Binary container format for large batches of points, Moebius transformations and geodesic lines.
+
+A file consists of a header of 64 bytes followed by fixed size records in little endian byte order:
+
+    offset  size  content
+    0       8     magic bytes b'HYPGEO\\x00\\x00'
+    8       2     format version (uint16)
+    10      2     kind of the records, value of Kind (uint16)
+    12      4     size of a record in bytes (uint32)
+    16      8     number of records (uint64)
+    24      16    numpy dtype string of the record fields, ASCII, zero padded
+    40      24    reserved, zero
+
+Points are stored as complex128, Moebius transformations as their matrices ((a, b), (c, d)) of float64 and geodesic
+lines as packed records of a kind mask (bool, True for vertical lines), the abscissa or center and the radius, which
+is inf for vertical lines (float64 each). Files are read through numpy.memmap without copying the records, and can
+be extended by appending records in chunks, the number of records in the header is updated after the records have
+been written."""
+import enum
+import os
+import struct
+
+from hypgeo.complex_plane import *
+from hypgeo.complex_plane import _as_complex
+from hypgeo.geometry import GeodesicArray
+from hypgeo.moebius import MoebStack
+
+_MAGIC = b'HYPGEO\x00\x00'
+_VERSION = 1
+_HEADER = struct.Struct('<8sHHIQ16s24x')
+HEADER_SIZE = _HEADER.size
+
+class Kind(enum.Enum):
+    POINTS = 1
+    MOEBS = 2
+    LINES = 3
+
+_DTYPES = {
+    Kind.POINTS: np.dtype('<c16'),
+    Kind.MOEBS: np.dtype(('<f8', (2, 2))),
+    Kind.LINES: np.dtype([('vertical', '?'), ('center', '<f8'), ('radius', '<f8')]),
+}
+
+def _kind(data):
+    if isinstance(data, MoebStack):
+        return Kind.MOEBS
+    elif isinstance(data, GeodesicArray):
+        return Kind.LINES
+    return Kind.POINTS
+
+def _records(kind, data):
+    """Returns data (ComplexArray or np.array of points, MoebStack or GeodesicArray) as np.array of records."""
+    if kind == Kind.POINTS:
+        return np.ascontiguousarray(_as_complex(data), dtype=_DTYPES[kind])
+    elif kind == Kind.MOEBS:
+        assert isinstance(data, MoebStack), "data is not of type \"MoebStack\"!"
+        return np.ascontiguousarray(data.Matrices.reshape(-1, 2, 2), dtype='<f8')
+    assert isinstance(data, GeodesicArray), "data is not of type \"GeodesicArray\"!"
+    records = np.empty(len(data), dtype=_DTYPES[kind])
+    records['vertical'], records['center'], records['radius'] = data.IsVertical, data.Center, data.Radius
+    return records
+
+def _read_header(f):
+    magic, version, kind, size, count, dtype = _HEADER.unpack(f.read(HEADER_SIZE))
+    assert magic == _MAGIC, "File is not a hypgeo container!"
+    assert version == _VERSION, "Unsupported format version {}!".format(version)
+    kind = Kind(kind)
+    assert size == _DTYPES[kind].itemsize, "Record size does not match kind {}!".format(kind.name)
+    return kind, count
+
+def _write_header(f, kind, count):
+    dtype = _DTYPES[kind]
+    descr = (dtype.base.str if dtype.fields is None else ','.join(dtype[n].str for n in dtype.names)).encode('ascii')
+    f.seek(0)
+    f.write(_HEADER.pack(_MAGIC, _VERSION, kind.value, dtype.itemsize, count, descr))
+
+def info(path):
+    """Returns the kind and the number of records of the container at path."""
+    with open(path, 'rb') as f:
+        return _read_header(f)
+
+def load(path, mode='r'):
+    """Maps the records of the container at path into memory without copying them.
+
+    Parameters
+    ----------
+    path : str
+        Path of the container
+    mode : str
+        Mode of numpy.memmap, 'r' for read only access and 'r+' to modify the records in place
+
+    Returns
+    -------
+    ComplexArray, MoebStack or GeodesicArray
+        Records backed by a numpy.memmap of the file
+    """
+    kind, count = info(path)
+    dtype = _DTYPES[kind]
+    if count == 0:
+        records = np.empty(0, dtype=dtype)
+    else:
+        records = np.memmap(path, dtype=dtype, mode=mode, offset=HEADER_SIZE, shape=(count,))
+
+    if kind == Kind.POINTS:
+        return ComplexArray(records)
+    elif kind == Kind.MOEBS:
+        return MoebStack(records)
+    return GeodesicArray._from_columns(records['vertical'], records['center'], records['radius'])
+
+def save(path, data):
+    """Writes data (ComplexArray or np.array of points, MoebStack or GeodesicArray) into a new container at path."""
+    with Writer(path, _kind(data)) as writer:
+        writer.append(data)
+
+class Writer:
+    """A class appending records in chunks to a container. Use as context manager, or close explicitly."""
+
+    @property
+    def Kind(self):
+        return self._kind
+
+    @property
+    def Count(self):
+        return self._count
+
+    def __init__(self, path, kind=None, append=False):
+        """
+        Parameters
+        ----------
+        path : str
+            Path of the container
+        kind : Kind
+            Kind of the records, required for new containers
+        append : bool
+            Whether records are appended to an existing container at path instead of creating a new one
+        """
+
+        if append and os.path.exists(path):
+            # the header is validated before the container is opened for writing, which does not leak on failure
+            self._kind, self._count = info(path)
+            assert kind is None or kind == self._kind, "Container holds records of kind {}!".format(self._kind.name)
+            self._file = open(path, 'r+b')
+            # drop records which were written without being counted in the header
+            self._file.truncate(HEADER_SIZE + self._count * _DTYPES[self._kind].itemsize)
+        else:
+            assert type(kind) is Kind, "kind is not of type \"Kind\"!"
+            self._file = open(path, 'w+b')
+            self._kind, self._count = kind, 0
+            _write_header(self._file, self._kind, self._count)
+
+    def append(self, data):
+        """Appends data (ComplexArray or np.array of points, MoebStack or GeodesicArray) to the container."""
+        records = _records(self._kind, data)
+        self._file.seek(HEADER_SIZE + self._count * _DTYPES[self._kind].itemsize)
+        self._file.write(records.tobytes())
+        self._file.flush()
+        self._count += len(records)
+        _write_header(self._file, self._kind, self._count)
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
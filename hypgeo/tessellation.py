@@ -0,0 +1,158 @@
+import math
+from hypgeo.complex_plane import *
+from hypgeo.complex_plane import _as_complex
+from hypgeo.geometry import GeodesicArray, polygon_center
+from hypgeo.moebius import MoebStack
+from hypgeo.transformations import refl_batch
+
+def regular_polygon(p, q):
+    """Returns the vertices of the regular hyperbolic p-gon with interior angles 2 pi / q, the tile of the {p, q}
+       tiling, centered at the imaginary unit.
+
+    Parameters
+    ----------
+    p : int
+        Number of vertices
+    q : int
+        Number of tiles meeting at each vertex, 1 / p + 1 / q < 1 / 2
+
+    Returns
+    -------
+    ComplexArray
+        Vertices in counterclockwise order
+    """
+    assert p >= 3 and q >= 3, "p and q have to be at least 3!"
+    assert p * q > 2 * (p + q), "{{{}, {}}} is not a hyperbolic tiling!".format(p, q)
+    R = math.acosh(1.0 / (math.tan(math.pi / p) * math.tan(math.pi / q)))
+    return ComplexArray(disk_to_plane(math.tanh(R / 2.0) * np.exp(2.0j * math.pi * np.arange(p) / p)))
+
+def _apply(m, z):
+    """Applies the stack of transformations m of shape (N, 2, 2) to the points z of shape (P,), returning an array
+       of shape (N, P)."""
+    a, b, c, d = (m[:, i, j, None] for i, j in [(0, 0), (0, 1), (1, 0), (1, 1)])
+    z = np.where((a * d - b * c) < .0, np.conj(z)[None], z[None])
+    return (a * z + b) / (c * z + d)
+
+class Tessellation:
+    """A class generating the tessellation of the upper half plane by the images of a base polygon under the group
+       generated by the reflections along its sides, e.g. the {p, q} tiling for the base polygon regular_polygon(p, q).
+
+       Every tile but the base polygon has a parent, its neighbor whose center is closest to the center of the base
+       polygon (the one across the side of lowest index on ties). The reflection along a side separating the centers
+       of a tile and of the base polygon decreases their distance, so the parent is one reflection closer to the base
+       polygon and the tiles form a tree. A tile is only generated from its parent, which needs no index of the tiles
+       generated so far. The tree is traversed depth first in batches, once per depth, so that memory is bounded by
+       the maximal depth times the batch size, and the tiles are emitted in the order of their depth."""
+
+    @property
+    def Vertices(self):
+        return self._vertices
+
+    @property
+    def Sides(self):
+        return self._sides
+
+    @property
+    def Center(self):
+        return self._center
+
+    def __init__(self, vertices, max_depth, min_size=.0, batch_size=65536, tol=1e-09):
+        """
+        Parameters
+        ----------
+        vertices : ComplexArray, np.array
+            Vertices of the convex base polygon in HPlus, either in clockwise or counterclockwise order. The
+            reflections along the sides have to generate a discrete group with the base polygon as fundamental
+            domain, i.e. all interior angles have to be of the form pi / n
+        max_depth : int
+            Maximal number of reflections applied to the base polygon
+        min_size : float
+            Tiles whose Euclidean extent (maximal width or height) in HPlus is below min_size are neither emitted nor
+            reflected. This prunes the tiles accumulating at the real axis, those towards infinity are only bounded by
+            max_depth
+        batch_size : int
+            Maximal number of tiles per emitted batch
+        tol : float
+            Relative tolerance of the comparison of the distances of neighbors from the center
+        """
+
+        self._vertices = ComplexArray(_as_complex(vertices))
+        v = self._vertices.Values
+        assert len(v) >= 3, "A polygon needs at least three vertices!"
+        assert np.all(v.imag > .0), "vertices are not contained in HPlus!"
+        self._sides = GeodesicArray.line_trough(v, np.roll(v, - 1))
+        self._reflections = refl_batch(self._sides).Matrices
+        self._center = polygon_center(v)
+        self._max_depth = max_depth
+        self._min_size = min_size
+        self._batch_size = batch_size
+        self._tol = tol
+
+    def _size(self, vertices):
+        return np.maximum(np.ptp(vertices.real, axis=1), np.ptp(vertices.imag, axis=1))
+
+    def _children(self, moebs, sides):
+        """Returns the transformations and the sides towards their parents of the children of the tiles moebs, whose
+           sides towards their parents are sides (- 1 for the base polygon), together with their vertices."""
+        p, c = len(self._sides), self._center
+
+        # reflect along every side except the one shared with the parent
+        side = np.tile(np.arange(p), len(moebs))
+        parent = np.repeat(np.arange(len(moebs)), p)
+        keep = side != sides[parent]
+        side, parent = side[keep], parent[keep]
+        cand = np.matmul(moebs[parent], self._reflections[side])
+
+        # the centers of all neighbors of the candidates, the neighbor across side is the parent the candidate has
+        # been generated from. Neighbors are ordered by the cosh of the distance of their centers to the center,
+        # then by the real and imaginary parts of their centers, which unlike the indices of the sides do not depend
+        # on the transformation representing a tile if the base polygon is symmetric
+        neighbors = np.matmul(cand[:, None], self._reflections[None]).reshape(- 1, 2, 2)
+        z = _apply(neighbors, np.array([c]))[:, 0].reshape(len(cand), p)
+        row = np.arange(len(cand))
+        keys = [1.0 + np.abs(z - c) ** 2 / (2.0 * z.imag * c.imag), z.real / z.imag, np.log(z.imag)]
+        scales = [keys[0], np.ones(z.shape), np.ones(z.shape)]
+        closer, tie = np.zeros(z.shape, dtype=bool), np.ones(z.shape, dtype=bool)
+        for key, scale in zip(keys, scales):
+            difference = key - key[row, side][:, None]
+            closer |= tie & (difference < - self._tol * scale)
+            tie &= np.abs(difference) <= self._tol * scale
+        new = ~np.any(closer, axis=1)
+
+        cand, side = cand[new], side[new]
+        vertices = _apply(cand, self._vertices.Values)
+        if self._min_size > .0:
+            large = self._size(vertices) >= self._min_size
+            cand, side, vertices = cand[large], side[large], vertices[large]
+        return cand, side, vertices
+
+    def levels(self):
+        """Yields batches (depth, vertices, moebs) of the tiles in the order of their depth, where vertices is a
+           complex np.array of shape (B, p) and moebs is the MoebStack of the B transformations mapping the base
+           polygon onto the tiles."""
+        yield 0, self._vertices.Values[None].copy(), MoebStack(np.eye(2)[None])
+
+        chunk = max(1, self._batch_size // len(self._sides))
+        for depth in range(1, self._max_depth + 1):
+            found = False
+            stack = [(1, np.eye(2)[None], np.full(1, - 1))]
+            while len(stack) > 0:
+                d, moebs, sides = stack.pop()
+                cand, side, vertices = self._children(moebs, sides)
+                if len(cand) == 0:
+                    continue
+                if d == depth:
+                    found = True
+                    for start in range(0, len(cand), self._batch_size):
+                        yield depth, vertices[start: start + self._batch_size], \
+                            MoebStack(cand[start: start + self._batch_size])
+                else:
+                    stack += [(d + 1, cand[start: start + chunk], side[start: start + chunk])
+                        for start in range(0, len(cand), chunk)]
+            if not found:
+                return
+
+    def __iter__(self):
+        """Yields the vertices of the tiles in batches as complex np.array of shape (B, p)."""
+        for depth, vertices, moebs in self.levels():
+            yield vertices
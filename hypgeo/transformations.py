@@ -1,8 +1,11 @@
 import math
-from hypgeo.complex_plane import _i, ComplexNumber
-from hypgeo.moebius import Moeb, MoebConj
-from hypgeo.geometry import Vertical, HalfCircle, unit_circle
+import numpy as np
+from hypgeo.complex_plane import _i, _as_complex, ComplexNumber
+from hypgeo.moebius import Moeb, MoebConj, MoebStack
+from hypgeo.geometry import Vertical, HalfCircle, GeodesicArray, unit_circle
+from hypgeo.cache import memoize
 
+@memoize
 def moeb_to(z0, z1):
     """Returns the Moebius transformation mapping the complex number z0 to z1.
 
@@ -31,6 +34,11 @@ def moeb_to(z0, z1):
 
     return Moeb(a, b, c, d)
 
+def _stack(a, b, c, d):
+    """Returns the MoebStack of the matrices ((a, b), (c, d)) for broadcastable arrays of coefficients."""
+    a, b, c, d = np.broadcast_arrays(a, b, c, d)
+    return MoebStack(np.stack([np.stack([a, b], axis=- 1), np.stack([c, d], axis=- 1)], axis=- 2))
+
 def ellip_0(t):
     """Returns an element of the one parameter group of Moebius rotations (element of elliptic transformations) 
        around imaginary unit.
@@ -65,6 +73,37 @@ def ellip(t, u):
     """
     return ellip_0(t).conj(moeb_to(u, _i))
       
+def ellip_batch(t, u, z=None):
+    """Returns the Moebius rotations ellip(t, u) for arrays of flow parameters and centers of rotation, computed in
+       closed form: conjugating ellip_0(t) with the transformation mapping u = x + iy to the imaginary unit yields
+       ((cos t - x / y sin t, |u|^2 / y sin t), (- sin t / y, cos t + x / y sin t)).
+
+    Parameters
+    ----------
+    t : float, np.array
+        Flow parameters
+    u : ComplexNumber, ComplexArray, np.array
+        Centers of rotation given as ComplexNumber, ComplexArray or complex np.array, broadcastable against t, e.g.
+        t[:, None] and u[None, :] for all combinations of T flow parameters and U centers
+    z : ComplexArray, np.array
+        Points (complex np.array) broadcastable against t and u, which are mapped instead of returning the rotations
+
+    Returns
+    -------
+    MoebStack or np.array
+        Rotations of shape broadcast(t, u) + (2, 2), or the images of z as complex np.array if z is not None
+    """
+    u = complex(u.re, u.im) if type(u) is ComplexNumber else _as_complex(u)
+    t = np.asarray(t, dtype=np.float64)
+    x, y = np.real(u), np.imag(u)
+    cos, sin = np.cos(t), np.sin(t)
+    s = sin / y
+    a, b, c, d = cos - x * s, (x * x + y * y) * s, - s, cos + x * s
+    if z is not None:
+        w = _as_complex(z)
+        return (a * w + b) / (c * w + d)
+    return _stack(a, b, c, d)
+
 def loxod(t):
     """Returns an element of the one parameter group of Moebius loxodromic transformations (dilatation in y-direction). 
 
@@ -95,6 +134,34 @@ def parab(t):
     """
     return Moeb(1.0, t, .0, 1.0) 
 
+def ellip_0_batch(t):
+    """Returns the Moebius rotations around the imaginary unit for a grid of flow parameters, see ellip_0.
+
+    Parameters
+    ----------
+    t : np.array
+        Flow parameters of shape (T,)
+
+    Returns
+    -------
+    MoebStack
+        Rotations ellip_0(t) for all flow parameters
+    """
+    t = np.asarray(t, dtype=np.float64)
+    return _stack(np.cos(t), np.sin(t), - np.sin(t), np.cos(t))
+
+def loxod_batch(t):
+    """Returns the dilatations in y-direction for a grid of flow parameters (np.array of shape (T,)) as MoebStack,
+       see loxod."""
+    t = np.asarray(t, dtype=np.float64)
+    return _stack(np.exp(.5 * t), .0, .0, np.exp(- .5 * t))
+
+def parab_batch(t):
+    """Returns the translations in x-direction for a grid of flow parameters (np.array of shape (T,)) as MoebStack,
+       see parab."""
+    t = np.asarray(t, dtype=np.float64)
+    return _stack(1.0, t, .0, 1.0)
+
 def refl_0(R):
     """Returns the Moebius reflection along the half circle centered at (0,0) of radius R.
 
@@ -142,6 +209,7 @@ def refl_line(x):
     """
     return MoebConj()
 
+@memoize
 def line_to_line(l_0, l_1):
     """Returns the Moebius transformation mapping the geodesic line l_0 to l_1.
 
@@ -259,6 +327,7 @@ def circ_to_circ(c_0, c_1):
     
     return moeb_to(ComplexNumber(c0, r0), ComplexNumber(c1, r1))
 
+@memoize
 def refl(l):
     """Returns the Moebius reflection along the geodesic line l.
 
@@ -272,4 +341,29 @@ def refl(l):
     Moeb
         Moebius reflection along the geodesic line l
     """
-    return refl_0(1.0).conj(line_to_line(l, unit_circle))
\ No newline at end of file
+    return refl_0(1.0).conj(line_to_line(l, unit_circle))
+
+def refl_batch(lines):
+    """Returns the Moebius reflections along a batch of geodesic lines.
+
+    Parameters
+    ----------
+    lines : GeodesicArray
+        Geodesic lines as reflection centers
+
+    Returns
+    -------
+    MoebStack
+        Moebius reflections (of determinant - 1) along the lines
+    """
+    assert isinstance(lines, GeodesicArray), "lines is not of type \"GeodesicArray\"!"
+    vertical, c = lines.IsVertical, lines.Center
+    r = np.where(vertical, 1.0, lines.Radius)
+
+    # z -> 2c - conj(z) for vertical lines and z -> c + r^2 / (conj(z) - c) for half circles
+    m = np.empty((len(lines), 2, 2))
+    m[:, 0, 0] = np.where(vertical, - 1.0, c / r)
+    m[:, 0, 1] = np.where(vertical, 2.0 * c, (r * r - c * c) / r)
+    m[:, 1, 0] = np.where(vertical, .0, 1.0 / r)
+    m[:, 1, 1] = np.where(vertical, 1.0, - c / r)
+    return MoebStack(m)
@@ -0,0 +1,170 @@
+import unittest
+import math
+import fractions
+import numpy as np
+
+from hypgeo.complex_plane import ComplexNumber
+from hypgeo.moebius import Moeb, MoebConj, MoebGen, MoebStack, PreciseMoeb
+from hypgeo.transformations import ellip_0, loxod
+from hypgeo.words import WordEnumerator
+from hypgeo import backend
+
+NUMBER_TESTS = 1000
+
+def _exact(x):
+    return fractions.Fraction(float(x[0])) + fractions.Fraction(float(x[1]))
+
+class TestDoubleDouble(unittest.TestCase):
+    def test_error_free_transformations(self):
+        a, b = np.random.uniform(- 1e03, 1e03, NUMBER_TESTS), np.random.uniform(- 1e03, 1e03, NUMBER_TESTS)
+        s, e = backend.two_sum(a, b)
+        p, f = backend.two_prod(a, b)
+        for i in range(0, NUMBER_TESTS):
+            x, y = fractions.Fraction(a[i]), fractions.Fraction(b[i])
+            self.assertEqual(fractions.Fraction(s[i]) + fractions.Fraction(e[i]), x + y)
+            self.assertEqual(fractions.Fraction(p[i]) + fractions.Fraction(f[i]), x * y)
+
+    def test_arithmetic(self):
+        x, y = backend.DoubleDouble(1.0) / 3.0, backend.DoubleDouble(2.0).sqrt()
+        self.assertLess(abs(_exact((x.hi, x.lo)) - fractions.Fraction(1, 3)), 1e-31)
+        self.assertLess(abs(_exact(((y * y).hi, (y * y).lo)) - 2), 1e-30)
+        self.assertEqual(float(x + x - x), float(x))
+        self.assertTrue(- x < x and x > 0)
+
+    def test_pow(self):
+        # integer matrices of determinant 1, whose powers are exact in the exact backend
+        m = np.array([[[2.0, 1.0], [1.0, 1.0]], [[1.0, 1.0], [.0, 1.0]], [[3.0, 2.0], [1.0, 1.0]]])
+        n = np.array([60, 1000, 40])
+        hi, lo = backend.dd_pow((m, np.zeros(m.shape)), n)
+        for i in range(0, len(m)):
+            p = PreciseMoeb(*m[i].ravel(), backend='exact') ** int(n[i])
+            for x, (j, k) in zip(p.Coefficients, [(0, 0), (0, 1), (1, 0), (1, 1)]):
+                self.assertLessEqual(abs(_exact((hi[i, j, k], lo[i, j, k])) - x), 1e-28 * max(1, abs(x)))
+
+class TestRenormalization(unittest.TestCase):
+    def test_renormalize(self):
+        M = Moeb.rnd(- 2, + 2, NUMBER_TESTS).Matrices
+        D = M * (1.0 + np.random.uniform(- 1e-07, 1e-07, NUMBER_TESTS))[:, None, None]
+        R = MoebStack(backend.renormalize(D))
+        S = R.Det[np.abs(D[:, 0, 0] * D[:, 1, 1]) + np.abs(D[:, 0, 1] * D[:, 1, 0]) <= 1e02]
+        self.assertTrue(np.allclose(S, 1.0, rtol=.0, atol=1e-13))
+        self.assertTrue(np.array_equal(backend.renormalize(2.0 * M), 2.0 * M))
+
+    def test_deep_products(self):
+        # 2 * 10^4 compositions of elliptic transformations, as float64 products their determinant drifts
+        T = np.random.uniform(.0, 2.0 * math.pi, 20000)
+        g = PreciseMoeb(1.0, .0, .0, 1.0, 'double-double')
+        for t in T:
+            g = g * ellip_0(t)
+        self.assertAlmostEqual(float(g.Det), 1.0, delta=1e-20)
+        r = g.to_moeb()
+        self.assertIsInstance(r, Moeb)
+        self.assertTrue(g.isclose(ellip_0(float(math.fsum(T) % (2.0 * math.pi))), 1e-09))
+
+    def test_pow(self):
+        for t in np.random.uniform(.0, 2.0 * math.pi, 100):
+            g = ellip_0(float(t))
+            p = MoebStack.from_list([g]) ** np.array([10 ** 15])
+            self.assertAlmostEqual(float(p.Det[0]), 1.0, delta=1e-12)
+            self.assertIsInstance(p[0], Moeb)
+
+    def test_words(self):
+        words, moebs = WordEnumerator([ellip_0(1.0), ellip_0(math.sqrt(2.0))], 12).enumerate()
+        self.assertTrue(np.allclose(moebs.Det, 1.0, rtol=.0, atol=1e-12))
+
+class TestBackends(unittest.TestCase):
+    def test_using(self):
+        self.assertIs(backend.get_backend(), backend.FLOAT64)
+        with backend.using('double-double') as b:
+            self.assertIs(b, backend.DOUBLE_DOUBLE)
+            self.assertIs(backend.get_backend(), backend.DOUBLE_DOUBLE)
+            self.assertIs(PreciseMoeb(1.0, .0, .0, 1.0).Backend, backend.DOUBLE_DOUBLE)
+        self.assertIs(backend.get_backend(), backend.FLOAT64)
+        try:
+            with backend.using('exact'):
+                raise ValueError()
+        except ValueError:
+            pass
+        self.assertIs(backend.get_backend(), backend.FLOAT64)
+
+    def test_global_pow(self):
+        M = Moeb.rnd(- 2, + 2, 100)
+        N = np.random.randint(- 10, 11, 100)
+        P = M ** N
+        for name in ['double-double', 'exact']:
+            with backend.using(name):
+                Q = M ** N
+                g = M[0] ** int(N[0])
+            self.assertTrue(np.allclose(P.Matrices, Q.Matrices, rtol=1e-06, atol=1e-09))
+            self.assertTrue(np.allclose([g.a, g.b, g.c, g.d], P.Matrices[0].ravel(), rtol=1e-06, atol=1e-09))
+
+    def test_global_product(self):
+        M, N = Moeb.rnd(- 2, + 2, 100), Moeb.rnd(- 2, + 2, 100)
+        with backend.using('exact'):
+            P = M * N
+            g = M[0] * N[0]
+        with backend.using('double-double'):
+            Q = M * N
+            h = M[0] * N[0]
+
+        # products rounded once from the exact ones, unlike the float64 products
+        self.assertTrue(np.array_equal(P.Matrices, Q.Matrices))
+        self.assertEqual([g.a, g.b, g.c, g.d], P.Matrices[0].ravel().tolist())
+        self.assertEqual([h.a, h.b, h.c, h.d], P.Matrices[0].ravel().tolist())
+        self.assertFalse(np.array_equal(P.Matrices, (M * N).Matrices))
+        self.assertTrue(np.allclose(P.Matrices, (M * N).Matrices, rtol=1e-12, atol=1e-12))
+
+    def test_global_deep_pow(self):
+        # [[2, 1], [1, 1]] ** n = [[F(2n + 1), F(2n)], [F(2n), F(2n - 1)]] with Fibonacci numbers beyond 2^53
+        F = [0, 1]
+        while len(F) < 82:
+            F.append(F[- 1] + F[- 2])
+        for name in ['double-double', 'exact']:
+            with backend.using(name):
+                g = Moeb(2.0, 1.0, 1.0, 1.0) ** 40
+                S = MoebStack.from_list([Moeb(2.0, 1.0, 1.0, 1.0)]) ** np.array([- 40])
+            self.assertEqual([g.a, g.b, g.c, g.d], [float(F[81]), float(F[80]), float(F[80]), float(F[79])])
+            self.assertEqual(S.Matrices[0].ravel().tolist(), [float(F[79]), - float(F[80]), - float(F[80]),
+                float(F[81])])
+
+        # exact powers of this depth grow to millions of bits, only the double-double one is checked
+        with backend.using('double-double'):
+            h = loxod(- 9.98e-5) ** - 97756
+        # powers of the rounded coefficients of loxod, whose small entry cancels in float64 closed forms (the
+        # renormalization of double-double powers moves them by up to n times the rounding of the determinant)
+        self.assertAlmostEqual(h.d / math.exp(- 97756 * math.log(loxod(- 9.98e-5).d)), 1.0, delta=1e-11)
+        self.assertAlmostEqual(h.a / math.exp(- 97756 * math.log(loxod(- 9.98e-5).a)), 1.0, delta=1e-11)
+
+    def test_exact_sqrt(self):
+        e = backend.EXACT
+        self.assertEqual(e.sqrt(fractions.Fraction(9, 4)), fractions.Fraction(3, 2))
+        for x in [fractions.Fraction(2), fractions.Fraction(1, 10 ** 30), fractions.Fraction(3 * 10 ** 40, 7)]:
+            r = e.sqrt(x)
+            self.assertLessEqual(r * r, x)
+            self.assertLess(abs(r * r / x - 1), fractions.Fraction(2, 2 ** e.Precision))
+        with self.assertRaises(TypeError):
+            backend.Backend()
+
+    def test_precise_moeb(self):
+        M, N = Moeb.rnd(- 2, + 2, 100), MoebConj.rnd(- 2, + 2, 100)
+        z = ComplexNumber(.5, 2.0)
+        for name in ['float64', 'double-double', 'exact']:
+            for i in range(0, 100):
+                g, h = PreciseMoeb.from_moeb(M[i], name), PreciseMoeb.from_moeb(N[i], name)
+                self.assertTrue((g * h).isclose(M[i] * N[i], 1e-06))
+                self.assertIsInstance((g * h).to_moeb(), MoebConj)
+                self.assertTrue((g / g).isclose(MoebGen(1.0, .0, .0, 1.0), 1e-09))
+                self.assertTrue(g.conj(h).isclose(M[i].conj(N[i]), 1e-06))
+                w, v = h(z), N[i](z)
+                self.assertAlmostEqual(w.re, v.re, delta=1e-06 * max(1.0, abs(v.re)))
+                self.assertAlmostEqual(w.im, v.im, delta=1e-06 * max(1.0, abs(v.im)))
+
+    @unittest.skipIf(backend.mpmath is None, "mpmath is not installed")
+    def test_mpmath(self):
+        g = PreciseMoeb(2.0, 1.0, 1.0, 1.0, backend.MPMath(60)) ** 80
+        p = PreciseMoeb(2.0, 1.0, 1.0, 1.0, 'exact') ** 80
+        for x, y in zip(g.Coefficients, p.Coefficients):
+            self.assertAlmostEqual(float(x) / float(y), 1.0, delta=1e-15)
+
+if __name__ == '__main__':
+    unittest.main()
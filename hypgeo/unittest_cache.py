@@ -0,0 +1,53 @@
+import unittest
+
+from hypgeo import cache
+from hypgeo.complex_plane import ComplexNumber
+from hypgeo.geometry import HalfCircle, Vertical
+from hypgeo.transformations import refl, line_to_line, moeb_to
+
+NUMBER_TESTS = 1000
+
+class TestCache(unittest.TestCase):
+    def test_results(self):
+        C = HalfCircle.rnd(10.0, - 10.0, + 10.0, NUMBER_TESTS)
+        V = Vertical.rnd(- 10.0, + 10.0, NUMBER_TESTS)
+        Z = ComplexNumber.rnd(.0, + 50, NUMBER_TESTS)
+
+        with cache.cached():
+            for i in range(0, NUMBER_TESTS):
+                self.assertEqual(refl(C[i]).clone(), refl.__wrapped__(C[i]).clone())
+                self.assertEqual(line_to_line(C[i], V[i]).clone(), line_to_line.__wrapped__(C[i], V[i]).clone())
+                self.assertEqual(moeb_to(Z[i], Z[i - 1]).clone(), moeb_to.__wrapped__(Z[i], Z[i - 1]).clone())
+
+    def test_statistics(self):
+        c = HalfCircle(2.0, 1.0)
+
+        with cache.cached() as lru:
+            refl(c)
+            hits, misses, _, _ = lru.info()
+            refl(c)
+            refl(HalfCircle(2.0 + 1e-12, 1.0))
+            self.assertEqual(lru.info().hits, hits + 2)
+            self.assertEqual(lru.info().misses, misses)
+            self.assertIs(refl(c), refl(c))
+            refl(Vertical(1.0))
+            self.assertGreater(lru.info().misses, misses)
+
+    def test_eviction(self):
+        with cache.cached(maxsize=10) as lru:
+            for z in ComplexNumber.rnd(.0, + 50, 100):
+                moeb_to(z, ComplexNumber(.0, 1.0))
+            self.assertEqual(lru.info().currsize, 10)
+            self.assertEqual(lru.info().misses, 100)
+
+    def test_scope(self):
+        self.assertIsNone(cache.cache_info())
+        with cache.cached():
+            self.assertIsNotNone(cache.cache_info())
+            with cache.cached(maxsize=5):
+                self.assertEqual(cache.cache_info().maxsize, 5)
+            self.assertNotEqual(cache.cache_info().maxsize, 5)
+        self.assertIsNone(cache.cache_info())
+
+if __name__ == '__main__':
+    unittest.main()
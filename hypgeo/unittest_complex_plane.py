@@ -1,7 +1,8 @@
 import unittest
 import sys
+import math
 import numpy as np
-from hypgeo.complex_plane import _i, ComplexNumber, RootOfUnity
+from hypgeo.complex_plane import _i, ComplexNumber, ComplexArray, RootOfUnity, disk_to_plane, plane_to_disk
 from hypgeo.helpers.field import *
 
 NUMBER_TESTS = 1000
@@ -77,10 +78,104 @@ class TestComplexNumber(unittest.TestCase):
             self.assertEqual((A[i] * B[i]).conj(), A[i].conj() * B[i].conj())
             self.assertEqual((A[i] / B[i]).conj(), A[i].conj() / B[i].conj())
 
+    def test_real_operands(self):
+        Z = ComplexNumber.rnd(-50, +50, NUMBER_TESTS)
+
+        for z in Z:
+            self.assertEqual(z + 2, z + ComplexNumber(2.0, .0))
+            self.assertEqual(z - np.float64(2.0), z - ComplexNumber(2.0, .0))
+            self.assertEqual(z * 3, z * ComplexNumber(3.0, .0))
+            self.assertEqual(z / 4.0, z / ComplexNumber(4.0, .0))
+            self.assertEqual(z._mul(z)._truediv(z)._sub(z)._add(z), z)
+            with self.assertRaises(TypeError):
+                z + 'a'
+            with self.assertRaises(TypeError):
+                z * [1.0]
+
+    def test_value_type(self):
+        Z = ComplexNumber.rnd(-50, +50, NUMBER_TESTS)
+
+        for z in Z:
+            self.assertEqual(hash(z), hash(ComplexNumber(z.re, z.im)))
+            self.assertFalse(hasattr(z, '__dict__'))
+            with self.assertRaises(AttributeError):
+                z.re = .0
+        self.assertEqual(len(set(list(Z) + list(Z))), len(set(Z)))
+        for x in [math.inf, - math.inf, 1e300]:
+            self.assertEqual(hash(ComplexNumber(x, 1.0)), hash(ComplexNumber(x, 1.0)))
+
     def test_root_of_unity(self):
         for n in range(0, 100):
             for k in range(0, n):
                 self.assertEqual(RootOfUnity(k, n) ** n, ONE)
 
+class TestComplexArray(unittest.TestCase):
+    def test_field_laws(self):
+        A = ComplexArray.from_list(ComplexNumber.rnd(-50, +50, NUMBER_TESTS))
+        B = ComplexArray.from_list(ComplexNumber.rnd(-50, +50, NUMBER_TESTS))
+        C = ComplexArray.from_list(ComplexNumber.rnd(-50, +50, NUMBER_TESTS))
+
+        self.assertEqual(associative_property_add(A, B, C), ZERO)
+        self.assertEqual(commutative_portperty_add(A, B, C), ZERO)
+        self.assertEqual(associative_property_mul(A, B, C), ZERO)
+        self.assertEqual(commutative_portperty_mul(A, B, C), ZERO)
+        self.assertEqual(right_distributive(A, B, C), ZERO)
+        self.assertEqual(left_distributive(A, B, C), ZERO)
+        self.assertEqual(inv_element_mul(A, A.inv(), ONE), ZERO)
+        self.assertEqual(inv_element_add(A, - A, ZERO), ZERO)
+
+    def test_scalar_ops(self):
+        A = ComplexNumber.rnd(-50, +50, NUMBER_TESTS)
+        B = ComplexNumber.rnd(-50, +50, NUMBER_TESTS)
+        Z = ComplexArray.from_list(A)
+        W = ComplexArray.from_list(B)
+
+        for i in range(0, NUMBER_TESTS):
+            self.assertEqual((Z + W)[i], A[i] + B[i])
+            self.assertEqual((Z - W)[i], A[i] - B[i])
+            self.assertEqual((Z * W)[i], A[i] * B[i])
+            self.assertEqual((Z / W)[i], A[i] / B[i])
+            self.assertEqual((Z * 2.0)[i], A[i] * 2.0)
+            self.assertEqual((Z ** 3)[i], A[i] ** 3)
+            self.assertEqual(Z.conj()[i], A[i].conj())
+            self.assertEqual(Z.inv()[i], A[i].inv())
+            self.assertAlmostEqual(Z.norm_sq()[i], A[i].norm_sq())
+            self.assertAlmostEqual(Z.norm()[i], A[i].norm())
+
+    def test_broadcast_scalar(self):
+        Z = ComplexArray.from_list(ComplexNumber.rnd(-50, +50, NUMBER_TESTS))
+
+        self.assertEqual(_i * Z, Z * _i)
+        self.assertEqual(1.0 - Z, - (Z - 1.0))
+        self.assertEqual((2.0 / Z) * Z, 2.0)
+
+    def test_pow(self):
+        Z = ComplexArray.from_list([RootOfUnity(1, 7)] * 7)
+        N = np.arange(0, 7)
+
+        self.assertEqual(Z ** 7, ONE)
+        self.assertEqual(Z ** - 7, ONE)
+        self.assertEqual(Z ** 0, ONE)
+        self.assertEqual((Z ** N) * (Z ** (7 - N)), ONE)
+
+    def test_round_trip(self):
+        Z = ComplexNumber.rnd(-50, +50, NUMBER_TESTS)
+        W = ComplexArray.from_list(Z).to_list()
+
+        for i in range(0, NUMBER_TESTS):
+            self.assertEqual(Z[i].re, W[i].re)
+            self.assertEqual(Z[i].im, W[i].im)
+
+        V = ComplexArray.from_list(Z)
+        self.assertEqual(ComplexArray.from_vec(V.to_vec()), V)
+        self.assertFalse(V == V[:-1])
+
+    def test_cayley(self):
+        z = np.random.uniform(- 5.0, 5.0, NUMBER_TESTS) + 1.0j * np.random.uniform(.01, 5.0, NUMBER_TESTS)
+        w = plane_to_disk(z)
+        self.assertTrue(np.all(np.abs(w) < 1.0))
+        self.assertTrue(np.allclose(disk_to_plane(w), z))
+        self.assertEqual(disk_to_plane(.0), 1.0j)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,127 @@
+import unittest
+import math
+import numpy as np
+
+from hypgeo.complex_plane import ComplexNumber
+from hypgeo.geometry import Position
+from hypgeo.moebius import Moeb, MoebStack
+from hypgeo.domains import *
+
+NUMBER_TESTS = 10000
+
+S, T = Moeb(.0, - 1.0, 1.0, .0), Moeb(1.0, 1.0, .0, 1.0)
+
+def hecke(q):
+    return [S, Moeb(1.0, 2.0 * math.cos(math.pi / q), .0, 1.0)]
+
+def schottky(k, r=.2):
+    """Returns generators mapping the outside of the circle of radius r around 2i onto the inside of the one around
+       - 2i - 1, whose isometric circles are these circles."""
+    generators = []
+    for i in range(0, k):
+        c0, c1 = 2.0 * i, - 2.0 * i - 1.0
+        generators.append(Moeb(c1 / r, - (c0 * c1 + r * r) / r, 1.0 / r, - c0 / r))
+    return generators
+
+def lines(domain):
+    L = domain.Polygon.Lines
+    return sorted(zip(L.IsVertical.tolist(), (np.round(L.Center, 9) + .0).tolist(), np.round(L.Radius, 9).tolist()))
+
+class TestDomains(unittest.TestCase):
+    def assertSidesPaired(self, domain):
+        # every pairing maps its side onto a side of the polygon
+        L = domain.Polygon.Lines
+        images = domain.Pairings.map_lines(L)
+        for vertical, center, radius in zip(images.IsVertical, images.Center, images.Radius):
+            self.assertTrue(np.any((L.IsVertical == vertical) & np.isclose(L.Center, center, atol=1e-06)
+                & (L.IsVertical | np.isclose(L.Radius, radius, atol=1e-06))))
+
+    def assertReduces(self, domain):
+        z = np.random.uniform(- 5.0, 5.0, NUMBER_TESTS) + 1.0j * np.random.uniform(.01, 3.0, NUMBER_TESTS)
+        r = domain.reduce(z)
+        self.assertTrue(np.all(r.Converged))
+        self.assertTrue(np.all(domain.Polygon.positions(r.Points) != Position.OUT.value))
+        self.assertTrue(np.allclose(r.Moebs.apply(z), r.Points))
+
+    def test_isometric_circles(self):
+        M = MoebStack.rnd(- 5.0, 5.0, NUMBER_TESTS)
+        C = isometric_circles(M)
+        z = C.Center + C.Radius * np.exp(1.0j * np.random.uniform(.0, math.pi, NUMBER_TESTS))
+
+        # g is an euclidean isometry on its isometric circle and maps it onto the one of its inverse
+        self.assertTrue(np.allclose(np.abs(M.c * z + M.d), 1.0))
+        D = isometric_circles(M.inv())
+        self.assertTrue(np.allclose(np.abs(M.apply(z) - D.Center), D.Radius))
+
+    def test_ford_modular(self):
+        for q in [3, 4, 5, 7]:
+            D = ford_domain(hecke(q))
+            l = round(math.cos(math.pi / q), 9)
+            self.assertEqual(lines(D), [(False, .0, 1.0), (True, - l, math.inf), (True, l, math.inf)])
+            self.assertSidesPaired(D)
+            self.assertReduces(D)
+
+        D = ford_domain([S, T], left=.0)
+        self.assertEqual(lines(D), [(False, .0, 1.0), (False, 1.0, 1.0), (True, .0, math.inf), (True, 1.0, math.inf)])
+
+    def test_ford_congruence(self):
+        # the principal congruence subgroup of level 2
+        D = ford_domain([Moeb(1.0, 2.0, .0, 1.0), Moeb(1.0, .0, 2.0, 1.0)])
+        self.assertEqual(lines(D), [(False, - .5, .5), (False, .5, .5), (True, - 1.0, math.inf),
+            (True, 1.0, math.inf)])
+        self.assertSidesPaired(D)
+        self.assertReduces(D)
+
+        # words of a redundant generating set give the same domain
+        self.assertEqual(lines(ford_domain([Moeb(1.0, 2.0, .0, 1.0), Moeb(1.0, .0, 2.0, 1.0),
+            Moeb(1.0, 2.0, .0, 1.0) * Moeb(1.0, .0, 2.0, 1.0)], length=1)), lines(D))
+
+    def test_ford_schottky(self):
+        k = 50
+        D = ford_domain(schottky(k), length=1)
+        centers = np.sort(np.concatenate([2.0 * np.arange(k), - 2.0 * np.arange(k) - 1.0]))
+
+        self.assertEqual(len(D.Polygon), 2 * k)
+        self.assertTrue(np.allclose(np.sort(D.Polygon.Lines.Center), centers))
+        self.assertTrue(np.allclose(D.Polygon.Lines.Radius, .2))
+        self.assertSidesPaired(D)
+
+    def test_dirichlet(self):
+        for q in [3, 4, 5]:
+            D = dirichlet_domain(hecke(q), ComplexNumber(.0, 2.0))
+            l = round(math.cos(math.pi / q), 9)
+            self.assertEqual(lines(D), [(False, .0, 1.0), (True, - l, math.inf), (True, l, math.inf)])
+            self.assertSidesPaired(D)
+            self.assertReduces(D)
+
+        # all points of the domain are at least as close to the base point as to its images under the pairings
+        base = ComplexNumber(.3, 1.7)
+        D = dirichlet_domain([Moeb(1.0, 2.0, .0, 1.0), Moeb(1.0, .0, 2.0, 1.0)], base)
+        r = D.reduce(np.random.uniform(- 5.0, 5.0, NUMBER_TESTS) + 1.0j * np.random.uniform(.01, 3.0, NUMBER_TESTS))
+        p = complex(base.re, base.im)
+        q = D.Pairings.inv().apply(np.full(len(D.Pairings), p))
+        distance = lambda z, w: np.abs(z - w) ** 2 / (z.imag * w.imag)
+        self.assertTrue(np.all(r.Converged))
+        self.assertTrue(np.all(distance(r.Points[:, None], p) <= distance(r.Points[:, None], q[None, :]) + 1e-06))
+        self.assertSidesPaired(D)
+
+    def test_dirichlet_schottky(self):
+        for base in [ComplexNumber(.3, 5.0), ComplexNumber(.3, 1.0)]:
+            D = dirichlet_domain(schottky(20), base)
+            self.assertEqual(len(D.Polygon), 40)
+            self.assertSidesPaired(D)
+
+        # the images of the base point under the outer generators are within 1e-07 of the real axis
+        k = 150
+        D = dirichlet_domain(schottky(k), ComplexNumber(.3, 1.0), length=1)
+        self.assertEqual(len(D.Polygon), 2 * k)
+        self.assertSidesPaired(D)
+
+    def test_unsupported(self):
+        with self.assertRaises(AssertionError):
+            ford_domain([Moeb(2.0, .0, .0, .5), T])
+        with self.assertRaises(AssertionError):
+            dirichlet_domain([S, T], ComplexNumber(.0, 1.0))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+import math
+import numpy as np
+
+from hypgeo.complex_plane import ComplexNumber, _i
+from hypgeo import geometry
+from hypgeo.moebius import Moeb, MoebStack
+from hypgeo.transformations import *
+from hypgeo.flow import Flow, rotation, dilation, translation
+
+NUMBER_TESTS = 1000
+
+class TestFlow(unittest.TestCase):
+    def test_geometry_flow(self):
+        f = geometry.Flow(parab)
+        m = f(2.0)
+        self.assertEqual((m.a, m.b, m.c, m.d), (1.0, 2.0, .0, 1.0))
+        self.assertEqual(f(2.0, ComplexNumber(1.0, 1.0)), ComplexNumber(3.0, 1.0))
+
+    def test_batch_kernels(self):
+        T = np.random.uniform(- 10.0, 10.0, NUMBER_TESTS)
+        for scalar, batch in [(ellip_0, ellip_0_batch), (loxod, loxod_batch), (parab, parab_batch)]:
+            M = batch(T)
+            self.assertEqual(M.Matrices.shape, (NUMBER_TESTS, 2, 2))
+            self.assertTrue(M == MoebStack.from_list([scalar(t) for t in T]))
+
+    def test_stack(self):
+        T = np.random.uniform(- 10.0, 10.0, NUMBER_TESTS)
+        for f in [rotation, dilation, translation]:
+            self.assertTrue(f(T) == MoebStack.from_list([f(t) for t in T]))
+            self.assertTrue(f.stack(T) == Flow(f._moeb_param).stack(T))
+        self.assertEqual(len(rotation.stack(1.0)), 1)
+
+    def test_trajectories(self):
+        T = np.linspace(.0, 2.0 * math.pi, 50)
+        Z = ComplexNumber.rnd_in_HPlus(- 5.0, 5.0, 5.0, 200)
+        for f in [rotation, dilation, translation]:
+            X = f(T, Z)
+            self.assertEqual(X.shape, (50, 200))
+            for k in range(0, 50, 7):
+                for j in range(0, 200, 31):
+                    z = f(T[k], Z.to_list()[j])
+                    self.assertTrue(np.isclose(X[k, j], complex(z.re, z.im)))
+
+        # rotations around i preserve the distance to i, translations the imaginary part
+        X = rotation.trajectories(T, Z)
+        d = np.abs(X - 1.0j) ** 2 / X.imag
+        self.assertTrue(np.allclose(d, d[0]))
+        self.assertTrue(np.allclose(translation(T, Z).imag, Z.im))
+        self.assertTrue(np.allclose(X[- 1], Z.Values))
+
+    def test_conj(self):
+        T = np.random.uniform(- 10.0, 10.0, 100)
+        for u in ComplexNumber.rnd_in_HPlus(- 5.0, 5.0, 5.0, 10).to_list():
+            f = rotation.conj(moeb_to(u, _i))
+            self.assertTrue(f(T) == MoebStack.from_list([ellip(t, u) for t in T]))
+            self.assertTrue(np.allclose(f(T, np.array([complex(u.re, u.im)])), complex(u.re, u.im)))
+
+if __name__ == '__main__':
+    unittest.main()
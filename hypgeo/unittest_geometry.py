@@ -0,0 +1,117 @@
+import unittest
+import numpy as np
+
+from hypgeo.complex_plane import ComplexNumber, ComplexArray
+from hypgeo.geometry import *
+from hypgeo.moebius import Moeb, MoebConj
+
+NUMBER_TESTS = 1000
+
+class TestGeodesicArray(unittest.TestCase):
+    def test_line_trough(self):
+        Z0 = HalfSpace.rnd(- 10.0, + 10.0, 10.0, NUMBER_TESTS)
+        Z1 = HalfSpace.rnd(- 10.0, + 10.0, 10.0, NUMBER_TESTS)
+        Z1 = ComplexArray(np.concatenate([Z0.Values[: 10] + 1.0j, Z1.Values[10:]]))
+        L = GeodesicArray.line_trough(Z0, Z1)
+
+        self.assertEqual(np.count_nonzero(L.IsVertical), 10)
+        for i in range(0, NUMBER_TESTS):
+            self.assertEqual(L[i], GeodesicLine.line_trough(Z0[i], Z1[i]))
+
+    def test_round_trip(self):
+        lines = HalfCircle.rnd(10.0, - 10.0, + 10.0, NUMBER_TESTS).to_list() \
+            + Vertical.rnd(- 10.0, + 10.0, NUMBER_TESTS).to_list()
+        L = GeodesicArray.from_list(lines)
+
+        self.assertEqual(L.to_list(), lines)
+        self.assertEqual(L[: 10], GeodesicArray.from_list(lines[: 10]))
+        self.assertFalse(L == L[: 10])
+
+    def test_map_lines(self):
+        L = GeodesicArray.from_list(HalfCircle.rnd(10.0, - 10.0, + 10.0, NUMBER_TESTS).to_list()
+            + Vertical.rnd(- 10.0, + 10.0, NUMBER_TESTS).to_list())
+
+        for m in Moeb.rnd(- 5.0, + 5.0, 5).to_list() + MoebConj.rnd(- 5.0, + 5.0, 5).to_list():
+            K, K_l = m(L), GeodesicArray.from_list([m(l) for l in L])
+            self.assertTrue(np.array_equal(K.IsVertical, K_l.IsVertical))
+            self.assertTrue(np.allclose(K.Center, K_l.Center, rtol=1e-06))
+            self.assertTrue(np.allclose(K.Radius, K_l.Radius, rtol=1e-06))
+
+    def test_map_lines_stack(self):
+        L = HalfCircle.rnd(10.0, - 10.0, + 10.0, NUMBER_TESTS)
+        M = Moeb.rnd(- 5.0, + 5.0, NUMBER_TESTS)
+        K = M(L)
+
+        for i in range(0, NUMBER_TESTS):
+            self.assertEqual(K[i], M[i](L[i]))
+
+    def test_endpoints(self):
+        lines = HalfCircle.rnd(10.0, - 10.0, + 10.0, NUMBER_TESTS).to_list() \
+            + Vertical.rnd(- 10.0, + 10.0, NUMBER_TESTS).to_list()
+        L = GeodesicArray.from_list(lines)
+
+        self.assertEqual(GeodesicArray.line_between(* L.endpoints()), L)
+        for l in lines:
+            self.assertEqual(GeodesicLine.line_between(* l.endpoints()), l)
+            self.assertEqual(GeodesicLine.line_between(* reversed(l.endpoints())), l)
+
+    def test_map_line_points(self):
+        lines = HalfCircle.rnd(10.0, - 10.0, + 10.0, NUMBER_TESTS).to_list() \
+            + Vertical.rnd(- 10.0, + 10.0, NUMBER_TESTS).to_list()
+
+        for m, l in zip(Moeb.rnd(- 5.0, + 5.0, 2 * NUMBER_TESTS), lines):
+            k = m(l)
+            for z in l.get_two_points():
+                w = m(z)
+                if type(k) is Vertical:
+                    self.assertAlmostEqual(w.re, k.Absc, delta=1e-09 * (1.0 + abs(k.Absc)))
+                else:
+                    self.assertAlmostEqual((w - k.Center).norm(), k.Radius, delta=1e-09 * (1.0 + k.Radius))
+
+class TestHalfSpace(unittest.TestCase):
+    def test_position(self):
+        Z = HalfSpace.rnd(- 10.0, + 10.0, 10.0, NUMBER_TESTS)
+        lines = HalfCircle.rnd(10.0, - 10.0, + 10.0, 10).to_list() + Vertical.rnd(- 10.0, + 10.0, 10).to_list()
+
+        for l in lines:
+            for h in [HalfSpace(l), HalfSpace(l, True)]:
+                self.assertEqual(h.Sign, - 1.0 if h.IsComplement else 1.0)
+                P = h.position_batch(Z)
+                P_v = h.position_batch(Z.to_vec())
+                self.assertEqual(P.dtype, np.int8)
+                self.assertTrue(np.array_equal(P, P_v))
+                for i in range(0, NUMBER_TESTS):
+                    self.assertEqual(P[i], h.position(Z[i]).value)
+                    self.assertEqual(h.complement().position(Z[i]), opposite(h.position(Z[i])))
+
+    def test_boundary(self):
+        h = HalfSpace(HalfCircle(2.0, 1.0))
+        Z = np.array([1.0 + 2.0j, 1.0 + 1.0j, 1.0 + 3.0j, 3.0 + 1e-06j])
+
+        self.assertTrue(np.array_equal(h.position_batch(Z), [Position.ON.value, Position.IN.value, Position.OUT.value,
+            Position.ON.value]))
+        self.assertTrue(np.array_equal(h.position_batch(Z, tol=.0), [Position.ON.value, Position.IN.value, 
+            Position.OUT.value, Position.OUT.value]))
+
+        # the tolerance is a distance to the line for small and large half circles alike
+        for r in [1e-06, 1.0, 1e06]:
+            h = HalfSpace(HalfCircle(r, .0))
+            Z = np.array([r + 5e-10, r + 2e-09, r - 2e-09]) * np.exp(.7j)
+            self.assertTrue(np.array_equal(h.position_batch(Z), [Position.ON.value, Position.OUT.value,
+                Position.IN.value]))
+
+    def test_intersection(self):
+        Z = HalfSpace.rnd(- 10.0, + 10.0, 10.0, NUMBER_TESTS)
+        spaces = [HalfSpace(Vertical(- 1.0), True), HalfSpace(Vertical(1.0)), HalfSpace(unit_circle, True)]
+        M = HalfSpace.position_matrix(spaces, Z)
+        I = HalfSpace.intersection(spaces, Z)
+
+        self.assertEqual(M.shape, (3, NUMBER_TESTS))
+        for i in range(0, NUMBER_TESTS):
+            inside = abs(Z[i].re) < 1.0 and Z[i].norm() > 1.0
+            self.assertEqual(I[i] == Position.IN.value, inside)
+            for j in range(0, 3):
+                self.assertEqual(M[j, i], spaces[j].position(Z[i]).value)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+import unittest
+import math
+import numpy as np
+
+from hypgeo.complex_plane import ComplexNumber
+from hypgeo.geometry import HalfCircle
+from hypgeo.moebius import Moeb, MoebConj, MoebStack
+from hypgeo.transformations import ellip_0, refl_0, line_to_line
+from hypgeo.lazy import Alphabet, LazyMoeb, lazy, evaluate_all
+
+NUMBER_TESTS = 1000
+
+class TestLazyMoeb(unittest.TestCase):
+    def setUp(self):
+        self.alphabet = Alphabet()
+        self.M = Moeb.rnd(- 2, + 2, 3).to_list()
+        self.G = [lazy(m, self.alphabet) for m in self.M]
+
+    def test_letters(self):
+        self.assertEqual([g.Word for g in self.G], [(0,), (2,), (4,)])
+        self.assertEqual(lazy(Moeb(self.M[1].a, self.M[1].b, self.M[1].c, self.M[1].d), self.alphabet).Word, (2,))
+        self.assertEqual(len(self.alphabet), 6)
+        self.assertTrue(self.alphabet.Letters[1] == self.M[0].inv())
+        self.assertEqual(LazyMoeb([0, 2, 3, 1, 4], self.alphabet).Word, (4,))
+
+    def test_folding(self):
+        g, h, k = self.G
+        self.assertEqual(len(g * h * h.inv() * g.inv()), 0)
+        self.assertEqual(len(g * self.M[0].inv()), 0)
+        self.assertEqual(lazy(self.M[1].inv(), self.alphabet).Word, h.inv().Word)
+        self.assertEqual((g * h / h).Word, g.Word)
+        self.assertEqual((g ** 5 * g ** - 3).Word, (g ** 2).Word)
+        self.assertEqual(g.conj(h).conj(h.inv()).Word, g.Word)
+        self.assertEqual(len((g * h * k).inv() * g * h * k), 0)
+
+    def test_evaluate(self):
+        g, h, k = self.G
+        z = ComplexNumber(.3, 1.7)
+        m = self.M[0] * self.M[1] * self.M[2].inv()
+        w = g * h / k
+        self.assertTrue(MoebStack.from_list([w.evaluate()]) == m)
+        self.assertTrue(w == m)
+        self.assertEqual(w(z), m(z))
+        self.assertTrue(g.conj(h) == self.M[0].conj(self.M[1]))
+        self.assertTrue((g ** - 4) == self.M[0] ** - 4)
+        self.assertTrue(g * h * h.inv() == g)
+
+    def test_conj_chain(self):
+        # reflections are letters as well, lazy products of determinant - 1 evaluate to MoebConj
+        l_0, l_1 = HalfCircle(1.0, .0), HalfCircle(3.0, 2.0)
+        r, t = refl_0(1.0), line_to_line(l_0, l_1)
+        w = lazy(r, self.alphabet).conj(t)
+        self.assertIsInstance(w.evaluate(), MoebConj)
+        self.assertTrue(w == r.conj(t))
+        self.assertEqual(len(w * w), 0)
+        self.assertEqual(len(lazy(r, self.alphabet) ** 2), 0)
+        self.assertEqual(lazy(r, self.alphabet).inv().Word, lazy(r, self.alphabet).Word)
+
+    def test_shared_prefixes(self):
+        g, h, k = self.G
+        x = g * h
+        P = [x * k ** i for i in range(1, 10)]
+        self.assertTrue(all(p._node.left is x._node for p in P[: 2]))
+        P[0].evaluate()
+        self.assertIsNotNone(x._node.matrix)
+        # the tree associates the products differently, which matters for large entries
+        self.assertTrue(np.allclose(evaluate_all(P).Matrices, MoebStack.from_list([self.M[0] * self.M[1] *
+            self.M[2] ** i for i in range(1, 10)]).Matrices, rtol=1e-06, atol=1e-09))
+
+    def test_long_words(self):
+        # building a word takes logarithmic time per letter and shares the trees of the factors
+        T = np.random.uniform(.0, 2.0 * math.pi, 3)
+        G = [lazy(ellip_0(t), self.alphabet) for t in T]
+        N = np.random.randint(0, len(G), 16000)
+        w = LazyMoeb([], self.alphabet)
+        for n in N:
+            w = w * G[n]
+        self.assertEqual(len(w), 16000)
+        self.assertLessEqual(w._node.height, 2 * math.log2(16000))
+        self.assertEqual(w.Word, tuple(G[n].Word[0] for n in N))
+        self.assertTrue(w.isclose(ellip_0(float(math.fsum(T[N]) % (2.0 * math.pi))), 1e-06))
+        self.assertEqual(len(w * w.inv()), 0)
+        self.assertEqual(len(G[0].inv() * w), 16001 - 2 * (N[0] == 0))
+
+        # powers are symbolic, their trees have O(log n) nodes
+        n = 7 * 10 ** 12 + 3
+        p = lazy(Moeb(1.0, 1.0, .0, 1.0), self.alphabet) ** n
+        self.assertEqual(len(p), n)
+        self.assertLessEqual(p._node.height, 2 * math.log2(n))
+        self.assertTrue(p == Moeb(1.0, float(n), .0, 1.0))
+
+    def test_evaluate_all(self):
+        T = np.random.uniform(.0, 2.0 * math.pi, 4)
+        G = [lazy(ellip_0(t), self.alphabet) for t in T]
+        N = np.random.randint(0, len(G), (NUMBER_TESTS, 12))
+        W = [LazyMoeb([], self.alphabet) for i in range(0, NUMBER_TESTS)]
+        for i in range(0, NUMBER_TESTS):
+            for j in N[i, : i % 13]:
+                W[i] = W[i] * G[j]
+        S = evaluate_all(W, batch_size=100)
+        self.assertEqual(len(S), NUMBER_TESTS)
+        self.assertTrue(S == MoebStack.from_list([w.evaluate() for w in W]))
+        self.assertEqual(len(evaluate_all([])), 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,117 @@
+import unittest
+import math
+import numpy as np
+
+from hypgeo.complex_plane import ComplexNumber, ComplexArray
+from hypgeo.moebius import Moeb, MoebStack, MoebType
+from hypgeo.tessellation import Tessellation, regular_polygon
+from hypgeo.metric import *
+
+NUMBER_TESTS = 10000
+
+class TestMetric(unittest.TestCase):
+    def test_distance(self):
+        rng = np.random.default_rng(0)
+        Z, W = ComplexNumber.rnd_in_HPlus(- 5.0, 5.0, 5.0, NUMBER_TESTS, rng), \
+            ComplexNumber.rnd_in_HPlus(- 5.0, 5.0, 5.0, NUMBER_TESTS, rng)
+        D = distance(Z, W)
+        expected = np.arccosh(1.0 + np.abs(Z.Values - W.Values) ** 2 / (2.0 * Z.im * W.im))
+
+        self.assertTrue(np.allclose(D, expected))
+        self.assertTrue(np.allclose(distance(Z.to_list()[0], W), distance(Z.Values[0], W)))
+        for z, w, d in zip(Z.to_list()[: 100], W.to_list()[: 100], D[: 100]):
+            self.assertAlmostEqual(distance(z, w), d)
+
+        # invariance under isometries
+        for g in Moeb.rnd(- 3.0, 3.0, 10, rng).to_list():
+            self.assertTrue(np.allclose(distance(g.apply(Z), g.apply(W)), D))
+        self.assertAlmostEqual(distance(ComplexNumber(.0, 1.0), ComplexNumber(.0, math.e)), 1.0)
+
+    def test_boundary(self):
+        # close points and points near the real axis keep their relative precision
+        for y in [1e-03, 1e-08, 1e-14]:
+            z, w = ComplexNumber(.0, y), ComplexNumber(y * 1e-07, y)
+            self.assertAlmostEqual(distance(z, w) / 1e-07, 1.0, places=6)
+            self.assertAlmostEqual(distance(ComplexNumber(.0, y), ComplexNumber(.0, 1.0)), - math.log(y), places=9)
+
+    def test_cross_ratio(self):
+        rng = np.random.default_rng(1)
+        Z = [ComplexNumber.rnd_in_HPlus(- 5.0, 5.0, 5.0, NUMBER_TESTS, rng) for i in range(4)]
+        R = cross_ratio(*Z)
+        for g in Moeb.rnd(- 3.0, 3.0, 10, rng).to_list():
+            self.assertTrue(np.allclose(cross_ratio(*[g.apply(z) for z in Z]), R))
+        r = cross_ratio(*[z.to_list()[0] for z in Z])
+        self.assertTrue(type(r) is ComplexNumber)
+        self.assertTrue(np.isclose(complex(r.re, r.im), R[0]))
+
+    def test_classify(self):
+        M = MoebStack.rnd(- 3.0, 3.0, NUMBER_TESTS, rng=np.random.default_rng(2))
+        T = classify(M)
+        L = translation_length(M)
+
+        self.assertEqual(T.dtype, np.int8)
+        for g, t, l in zip(M.to_list()[: 1000], T, L):
+            self.assertEqual(classify(g).value, t)
+            self.assertAlmostEqual(translation_length(g), l)
+        self.assertTrue(np.all(L[T != MoebType.HYPERBOLIC.value] == .0))
+        self.assertTrue(np.all(L[T == MoebType.HYPERBOLIC.value] > .0))
+
+        # a hyperbolic transformation moves the points of its axis by the translation length
+        g = Moeb(4.0, .0, .0, .25)
+        self.assertAlmostEqual(translation_length(g), distance(ComplexNumber(.0, 1.0), g(ComplexNumber(.0, 1.0))))
+
+    def test_fixed_points(self):
+        M = MoebStack.rnd(- 3.0, 3.0, NUMBER_TESTS, rng=np.random.default_rng(3))
+        T = classify(M)
+        Z0, Z1 = fixed_points(M)
+        for Z in (Z0, Z1):
+            self.assertTrue(np.allclose(M.apply(Z), Z))
+
+        elliptic, hyperbolic = T == MoebType.ELLIPTIC.value, T == MoebType.HYPERBOLIC.value
+        self.assertTrue(np.all(Z0[elliptic].imag > .0))
+        self.assertTrue(np.all(Z0[hyperbolic].imag == .0))
+
+        # the derivative 1 / (c z + d)^2 is larger than 1 at the repelling and smaller at the attracting fixed point
+        c, d = M.c[hyperbolic], M.d[hyperbolic]
+        self.assertTrue(np.all(np.abs(c * Z0[hyperbolic] + d) < 1.0))
+        self.assertTrue(np.all(np.abs(c * Z1[hyperbolic] + d) > 1.0))
+
+        self.assertEqual(fixed_points(Moeb(2.0, 3.0, .0, .5)), (- 2.0 + .0j, complex(math.inf, .0)))
+        self.assertEqual(fixed_points(Moeb(- .5, 3.0, .0, - 2.0)), (complex(math.inf, .0), - 2.0 + .0j))
+        self.assertEqual(fixed_points(Moeb(1.0, 3.0, .0, 1.0)), (complex(math.inf, .0), complex(math.inf, .0)))
+        z0, z1 = fixed_points(Moeb(1.0, .0, 1.0, 1.0))
+        self.assertEqual(z0, .0)
+        self.assertEqual(z1, .0)
+
+    def test_area(self):
+        for p, q in [(7, 3), (4, 5), (3, 7), (8, 8)]:
+            V = regular_polygon(p, q)
+            self.assertTrue(np.allclose(angles(V), 2.0 * math.pi / q))
+            self.assertAlmostEqual(area(V), (p - 2) * math.pi - 2.0 * math.pi * p / q)
+            self.assertAlmostEqual(area(V.Values[:: - 1]), area(V))
+
+            # batch of all tiles up to depth 3
+            tiles = np.concatenate([v for d, v, m in Tessellation(V, 3).levels()])
+            self.assertTrue(np.allclose(area(tiles), area(V)))
+
+        inradius = math.acosh(math.cos(math.pi / 4) / math.sin(math.pi / 5))
+        self.assertLess(disc_area(inradius), area(regular_polygon(5, 4)))
+        self.assertAlmostEqual(disc_area(1e-04) / (math.pi * 1e-08), 1.0)
+
+    def test_pairwise(self):
+        rng = np.random.default_rng(4)
+        Z, W = ComplexNumber.rnd_in_HPlus(- 5.0, 5.0, 5.0, 300, rng), ComplexNumber.rnd_in_HPlus(- 5.0, 5.0, 5.0, 70, rng)
+        expected = distance(Z.Values[:, None], W.Values[None, :])
+
+        for block in [1, 16, 64, 4096]:
+            self.assertTrue(np.array_equal(pairwise(Z, W, block), expected))
+            index, dist = nearest(Z, W, block)
+            self.assertTrue(np.array_equal(index, np.argmin(expected, axis=1)))
+            self.assertTrue(np.array_equal(dist, np.min(expected, axis=1)))
+
+        out = np.zeros((300, 70))
+        self.assertTrue(pairwise(Z, W, 32, out) is out)
+        self.assertTrue(np.array_equal(out, expected))
+
+if __name__ == '__main__':
+    unittest.main()
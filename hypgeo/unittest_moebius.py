@@ -1,5 +1,7 @@
 import unittest
-from hypgeo.moebius import Moeb, MoebConj, moeb_id
+import numpy as np
+from hypgeo.complex_plane import ComplexNumber, ComplexArray
+from hypgeo.moebius import Moeb, MoebConj, MoebStack, moeb_id
 from hypgeo.helpers.group import *
 
 NUMBER_TESTS = 1000
@@ -51,6 +53,80 @@ class TestMoebiusTransformation(unittest.TestCase):
             self.assertEqual(inv_element_r(m, m.inv()), moeb_id)
             self.assertEqual(inv_element_r(m, m.inv()), moeb_id)
 
+    def test_value_type(self):
+        for m in Moeb.rnd(-50, +50, 100).to_list() + MoebConj.rnd(-50, +50, 100).to_list():
+            self.assertEqual(hash(m), hash(m.clone()))
+            self.assertFalse(hasattr(m, '__dict__'))
+            with self.assertRaises(AttributeError):
+                m.a = .0
+        self.assertEqual(hash(MoebStack(np.array([[[1e300, .0], [.0, 1e-300]]]))[0]),
+            hash(MoebStack(np.array([[[1e300, .0], [.0, 1e-300]]]))[0]))
+
+    def test_apply(self):
+        Z = ComplexNumber.rnd(-50, +50, NUMBER_TESTS)
+        V = ComplexArray.from_list(Z)
+
+        for m in Moeb.rnd(-50, +50, 10).to_list() + MoebConj.rnd(-50, +50, 10).to_list():
+            W = m.apply(V)
+            W_c = m.apply(V.Values)
+            W_v = m.apply(V.to_vec())
+
+            for i in range(0, NUMBER_TESTS):
+                self.assertEqual(W[i], m(Z[i]))
+            self.assertTrue(np.allclose(W_c, W.Values))
+            self.assertTrue(np.allclose(W_v, W.to_vec()))
+            self.assertEqual(m(V), W)
+
+class TestMoebStack(unittest.TestCase):
+    def test_group_laws(self):
+        for det in [1.0, - 1.0]:
+            A = MoebStack.rnd(-50, +50, NUMBER_TESTS, det)
+            B = MoebStack.rnd(-50, +50, NUMBER_TESTS, det)
+            C = MoebStack.rnd(-50, +50, NUMBER_TESTS, det)
+
+            self.assertTrue(np.allclose(A.Det, det))
+            self.assertEqual(associative_property(A, B, C), moeb_id)
+            self.assertEqual(neutral_element_r(A, moeb_id), moeb_id)
+            self.assertEqual(neutral_element_l(A, moeb_id), moeb_id)
+            self.assertEqual(inv_element_r(A, A.inv()), moeb_id)
+            self.assertEqual(inv_element_l(A, A.inv()), moeb_id)
+
+    def test_elementwise(self):
+        A = MoebStack.rnd(-50, +50, 100)
+        B = MoebConj.rnd(-50, +50, 100)
+        g = Moeb.rnd(-50, +50, 1)[0]
+
+        for i in range(0, 100):
+            self.assertEqual((A * B)[i], A[i] * B[i])
+            self.assertEqual((A * g)[i], A[i] * g)
+            self.assertEqual((g * A)[i], g * A[i])
+            self.assertEqual((A / B)[i], A[i] / B[i])
+            self.assertEqual(A.conj(B)[i], A[i].conj(B[i]))
+            self.assertEqual(A.inv()[i], A[i].inv())
+
+    def test_pow(self):
+        M = Moeb.rnd(-2, +2, 100)
+        N = np.random.randint(-5, 6, 100)
+        P = M ** N
+        Q = MoebStack.from_list([M[i] ** int(N[i]) for i in range(0, 100)])
+
+        self.assertTrue(np.allclose(P.Matrices, Q.Matrices, rtol=1e-09, atol=1e-09))
+        self.assertEqual(M ** 0, moeb_id)
+
+    def test_apply(self):
+        M = MoebConj.rnd(-50, +50, NUMBER_TESTS)
+        Z = ComplexNumber.rnd(-50, +50, NUMBER_TESTS)
+        W = M.apply(ComplexArray.from_list(Z))
+
+        for i in range(0, NUMBER_TESTS):
+            self.assertEqual(W[i], M[i](Z[i]))
+
+    def test_round_trip(self):
+        M = Moeb.rnd(-50, +50, NUMBER_TESTS)
+
+        self.assertTrue(all(type(m) is Moeb for m in M))
+        self.assertTrue(all(type(m) is MoebConj for m in MoebConj.rnd(-50, +50, 10)))
+        self.assertEqual(MoebStack.from_list(M.to_list()), M)
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,61 @@
+import unittest
+import numpy as np
+
+from hypgeo.complex_plane import ComplexArray
+from hypgeo.geometry import *
+from hypgeo.moebius import Moeb, MoebConj, MoebStack
+from hypgeo.parallel import Executor
+
+NUMBER_TESTS = 10000
+
+def rnd_points(samples):
+    return np.random.uniform(- 10.0, + 10.0, samples) + 1.0j * np.random.uniform(.1, 10.0, samples)
+
+class TestExecutor(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.executor = Executor(workers=3, min_shard=1000)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.executor.shutdown()
+
+    def test_apply(self):
+        Z = rnd_points(NUMBER_TESTS)
+        g = Moeb.rnd(- 5.0, + 5.0, 1)[0]
+        G = MoebStack.rnd(- 5.0, + 5.0, NUMBER_TESTS, - 1.0)
+
+        self.assertTrue(np.array_equal(self.executor.apply(g, Z), g.apply(Z)))
+        self.assertTrue(np.array_equal(self.executor.apply(G, Z), G.apply(Z)))
+        self.assertEqual(self.executor.apply(g, ComplexArray(Z)), g.apply(ComplexArray(Z)))
+        V = np.stack([Z.real, Z.imag], axis=1)
+        self.assertTrue(np.array_equal(self.executor.apply(G, V), G.apply(V)))
+
+    def test_line_trough(self):
+        Z0, Z1 = rnd_points(NUMBER_TESTS), rnd_points(NUMBER_TESTS)
+        Z1[: 10] = Z0[: 10] + 1.0j
+        L, M = self.executor.line_trough(Z0, Z1), GeodesicArray.line_trough(Z0, Z1)
+
+        self.assertTrue(np.array_equal(L.IsVertical, M.IsVertical))
+        self.assertTrue(np.array_equal(L.Center, M.Center))
+        self.assertTrue(np.array_equal(L.Radius, M.Radius))
+
+        with self.assertRaises(AssertionError):
+            self.executor.line_trough(Z0, np.where(np.arange(NUMBER_TESTS) == 5000, Z0, Z1))
+
+    def test_position(self):
+        Z = rnd_points(NUMBER_TESTS)
+        spaces = [HalfSpace(HalfCircle(2.0, 1.0)), HalfSpace(Vertical(.5), True), HalfSpace(unit_circle)]
+
+        self.assertTrue(np.array_equal(self.executor.position(spaces[0], Z), spaces[0].position_batch(Z)))
+        self.assertTrue(np.array_equal(self.executor.position(spaces, Z), HalfSpace.position_matrix(spaces, Z)))
+
+    def test_serial(self):
+        Z = rnd_points(100)
+        g = Moeb.rnd(- 5.0, + 5.0, 1)[0]
+        with Executor(workers=2) as executor:
+            self.assertTrue(np.array_equal(executor.apply(g, Z), g.apply(Z)))
+            self.assertIsNone(executor._pool)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+
+from hypgeo.complex_plane import ComplexNumber, ComplexArray
+from hypgeo.geometry import *
+from hypgeo.moebius import Moeb
+from hypgeo.polygon import HyperbolicPolygon
+from hypgeo.reduction import FundamentalDomain
+from hypgeo.storage import save, load
+from hypgeo.pipeline import *
+
+NUMBER_TESTS = 10000
+
+def modular():
+    P = HyperbolicPolygon([Vertical(- .5), Vertical(.5), unit_circle], ComplexNumber(.0, 2.0))
+    return FundamentalDomain(P, [Moeb(1.0, 1.0, .0, 1.0), Moeb(1.0, - 1.0, .0, 1.0), Moeb(.0, - 1.0, 1.0, .0)])
+
+class TestPipeline(unittest.TestCase):
+    def test_sources(self):
+        chunks = list(sample(- 1.0, 1.0, 2.0, NUMBER_TESTS + 1, 1000))
+        Z = np.concatenate([c.Points for c in chunks])
+
+        self.assertEqual([len(c) for c in chunks], [1000] * 10 + [1])
+        self.assertTrue(np.all((np.abs(Z.real) <= 1.0) & (Z.imag > .0) & (Z.imag <= 2.0)))
+        self.assertEqual(len(next(iter(sample(.0, 1.0, 1.0, chunk_size=10)))), 10)
+
+        items = [ComplexNumber(1.0, 1.0), 2.0 + 1.0j, Z[: 25], ComplexArray(Z[25: 30])]
+        chunks = list(iterate(items, 8))
+        self.assertEqual([len(c) for c in chunks], [8, 8, 8, 8])
+        self.assertTrue(np.array_equal(np.concatenate([c.Points for c in chunks]), 
+            np.concatenate([[1.0 + 1.0j, 2.0 + 1.0j], Z[: 30]])))
+
+        # batches of any size are sliced, only their tails are carried over into the next chunk
+        items = [Z[: size] for size in np.random.randint(0, 3000, 20)]
+        chunks = list(iterate(items, 1000))
+        self.assertTrue(all(len(c) == 1000 for c in chunks[: - 1]))
+        self.assertTrue(np.array_equal(np.concatenate([c.Points for c in chunks]), np.concatenate(items)))
+
+    def test_stages(self):
+        g, D = Moeb.rnd(- 5.0, + 5.0, 1)[0], modular()
+        Z = np.concatenate([c.Points for c in sample(- 10.0, 10.0, 5.0, NUMBER_TESTS, 999, np.random.default_rng(1))])
+        P = Pipeline(sample(- 10.0, 10.0, 5.0, NUMBER_TESTS, 999, np.random.default_rng(1)))
+        P = P.then(Apply(g)).then(Reduce(D)).then(Classify(D.Polygon))
+        result = P.run(Collect())
+
+        R = D.reduce(g.apply(Z))
+        self.assertTrue(np.array_equal(result.Points, R.Points))
+        self.assertTrue(np.array_equal(result['converged'], R.Converged))
+        self.assertTrue(np.all(result['position'] != Position.OUT.value))
+
+    def test_sinks(self):
+        h = HalfSpace(unit_circle)
+        P = Pipeline(sample(- 2.0, 2.0, 2.0, NUMBER_TESTS, 1000)).then(Classify(h))
+        counts, (histogram, edges) = P.run(Count(), Histogram(4, ((- 2.0, 2.0), (.0, 2.0))))
+
+        self.assertEqual(np.sum(counts), NUMBER_TESTS)
+        self.assertEqual(np.sum(histogram), NUMBER_TESTS)
+        self.assertTrue(np.array_equal(edges[0], [- 2.0, - 1.0, .0, 1.0, 2.0]))
+
+        inside = Pipeline(sample(- 2.0, 2.0, 2.0, NUMBER_TESTS, 1000)).then(Classify([h])) \
+            .then(Filter(lambda c: c['position'] == Position.IN.value)).run(Collect())
+        self.assertTrue(np.all(np.abs(inside.Points) < 1.0))
+
+    def test_files(self):
+        directory = tempfile.mkdtemp()
+        try:
+            source, target = os.path.join(directory, 'source.hyp'), os.path.join(directory, 'target.hyp')
+            Z = np.random.uniform(- 1.0, 1.0, NUMBER_TESTS) + 1.0j * np.random.uniform(.1, 1.0, NUMBER_TESTS)
+            save(source, Z)
+            g = Moeb.rnd(- 5.0, + 5.0, 1)[0]
+
+            self.assertEqual(Pipeline(read(source, 1000)).then(Apply(g)).run(Write(target)), NUMBER_TESTS)
+            self.assertTrue(np.array_equal(load(target).Values, g.apply(Z)))
+        finally:
+            shutil.rmtree(directory)
+
+if __name__ == '__main__':
+    unittest.main()
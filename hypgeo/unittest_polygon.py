@@ -0,0 +1,74 @@
+import unittest
+import numpy as np
+
+from hypgeo.complex_plane import ComplexNumber, ComplexArray
+from hypgeo.geometry import *
+from hypgeo.polygon import HyperbolicPolygon
+
+NUMBER_TESTS = 1000
+
+def rnd_sides(samples):
+    sides = []
+    for i in range(0, samples):
+        if np.random.uniform() < .3:
+            line = Vertical(np.random.uniform(- 5.0, + 5.0))
+        else:
+            line = HalfCircle(10.0 ** np.random.uniform(- 4.0, .5), np.random.uniform(- 5.0, + 5.0))
+        sides.append(HalfSpace(line, np.random.uniform() < .6))
+    return sides
+
+class TestHyperbolicPolygon(unittest.TestCase):
+    def test_modular(self):
+        P = HyperbolicPolygon([Vertical(- .5), Vertical(.5), unit_circle], ComplexNumber(.0, 2.0))
+
+        self.assertEqual(len(P), 3)
+        self.assertEqual(P.position(ComplexNumber(.0, 2.0)), Position.IN)
+        self.assertEqual(P.position(ComplexNumber(.1, .5)), Position.OUT)
+        self.assertEqual(P.position(ComplexNumber(.7, 2.0)), Position.OUT)
+        self.assertEqual(P.position(ComplexNumber(.0, 1.0)), Position.ON)
+        self.assertEqual(P.position(ComplexNumber(.5, 5.0)), Position.ON)
+        self.assertTrue(np.array_equal(P.contains(np.array([.5j, 2.0j, .5 + .5 * np.sqrt(3.0) * 1j])),
+            [False, True, True]))
+
+    def test_positions(self):
+        for i in range(0, 100):
+            sides = rnd_sides(np.random.randint(1, 30))
+            P = HyperbolicPolygon(sides)
+            Z = HalfSpace.rnd(- 8.0, + 8.0, 5.0, NUMBER_TESTS)
+
+            # points on the sides
+            k, t = np.random.randint(0, len(P), NUMBER_TESTS), np.random.uniform(.01, 3.1, NUMBER_TESTS)
+            L = P.Lines
+            B = np.where(L.IsVertical[k], L.Center[k] + 1.0j * t, L.Center[k] + L.Radius[k] * np.exp(1.0j * t))
+
+            self.assertTrue(np.array_equal(P.positions(Z), HalfSpace.intersection(sides, Z)))
+            self.assertTrue(np.array_equal(P.positions(B), HalfSpace.intersection(sides, B)))
+
+    def test_position(self):
+        sides = rnd_sides(10)
+        P = HyperbolicPolygon(sides)
+        Z = HalfSpace.rnd(- 8.0, + 8.0, 5.0, NUMBER_TESTS)
+        positions = P.positions(ComplexArray.from_list(Z))
+
+        for i in range(0, NUMBER_TESTS):
+            self.assertEqual(P.position(Z[i]).value, positions[i])
+
+    def test_violations(self):
+        for i in range(0, 100):
+            sides = rnd_sides(np.random.randint(1, 30))
+            P = HyperbolicPolygon(sides)
+            Z = HalfSpace.rnd(- 8.0, + 8.0, 5.0, NUMBER_TESTS)
+            out = HalfSpace.position_matrix(sides, Z) == Position.OUT.value
+
+            self.assertTrue(np.array_equal(P.violations(Z), np.where(np.any(out, axis=0), np.argmax(out, axis=0), - 1)))
+
+    def test_interior(self):
+        lines = [HalfCircle(1.0, - 1.0), HalfCircle(1.0, 1.0), Vertical(- 2.0), Vertical(2.0)]
+        P = HyperbolicPolygon(lines, ComplexNumber(.0, 3.0))
+
+        self.assertTrue(all(h.position(ComplexNumber(.0, 3.0)) == Position.IN for h in P.Sides))
+        self.assertEqual(P.position(ComplexNumber(- 1.0, .5)), Position.OUT)
+        self.assertEqual(P.position(ComplexNumber(.0, 1.5)), Position.IN)
+
+if __name__ == '__main__':
+    unittest.main()
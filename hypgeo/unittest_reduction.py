@@ -0,0 +1,64 @@
+import unittest
+import numpy as np
+
+from hypgeo.complex_plane import ComplexNumber, ComplexArray
+from hypgeo.geometry import *
+from hypgeo.moebius import Moeb
+from hypgeo.polygon import HyperbolicPolygon
+from hypgeo.reduction import FundamentalDomain
+from hypgeo.transformations import refl
+
+NUMBER_TESTS = 1000
+
+def modular():
+    P = HyperbolicPolygon([Vertical(- .5), Vertical(.5), unit_circle], ComplexNumber(.0, 2.0))
+    return FundamentalDomain(P, [Moeb(1.0, 1.0, .0, 1.0), Moeb(1.0, - 1.0, .0, 1.0), Moeb(.0, - 1.0, 1.0, .0)])
+
+def rnd_points(samples, min_im):
+    return np.random.uniform(- 50.0, + 50.0, samples) + 1.0j * 10.0 ** np.random.uniform(np.log10(min_im), 1.0, samples)
+
+class TestFundamentalDomain(unittest.TestCase):
+    def test_modular(self):
+        D = modular()
+        Z = rnd_points(NUMBER_TESTS, 1e-04)
+        R = D.reduce(ComplexArray(Z))
+
+        self.assertEqual(len(R), NUMBER_TESTS)
+        self.assertTrue(np.all(R.Converged))
+        self.assertTrue(np.all(D.Polygon.contains(R.Points)))
+        self.assertTrue(np.allclose(R.Moebs.apply(Z), R.Points.Values))
+        self.assertTrue(np.allclose(np.abs(R.Moebs.Det), 1.0))
+
+    def test_words(self):
+        D = modular()
+        Z = rnd_points(100, 1e-02)
+        R = D.reduce(Z)
+
+        for i in range(0, 100):
+            m = D.word_to_moeb(R.word(i))
+            M = np.array([[m.a, m.b], [m.c, m.d]])
+            self.assertTrue(np.allclose(R.Moebs.Matrices[i], M) or np.allclose(R.Moebs.Matrices[i], - M))
+            self.assertEqual(len(R.word(i)), np.sum(R.Powers[i]))
+
+    def test_reflections(self):
+        lines = [Vertical(.0), Vertical(.5), unit_circle]
+        P = HyperbolicPolygon(lines, ComplexNumber(.25, 2.0))
+        D = FundamentalDomain(P, [refl(l) for l in lines])
+        Z = rnd_points(NUMBER_TESTS, 1e-01)
+        R = D.reduce(Z, max_iter=10000)
+
+        self.assertTrue(np.all(R.Converged))
+        self.assertTrue(np.all(P.contains(R.Points)))
+        self.assertTrue(np.allclose(R.Moebs.apply(Z), R.Points))
+        self.assertTrue(np.allclose(R.Moebs.Det, np.where(R.Lengths % 2 == 0, 1.0, - 1.0)))
+
+    def test_max_iter(self):
+        D = modular()
+        R = D.reduce(np.array([.1 + 1e-03j, 2.0j]), max_iter=1)
+
+        self.assertTrue(np.array_equal(R.Converged, [False, True]))
+        self.assertEqual(R.word(0), [2])
+        self.assertTrue(np.allclose(R.Points[0], - 1.0 / (.1 + 1e-03j)))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import unittest
+import math
+import numpy as np
+
+from hypgeo.complex_plane import ComplexNumber, ComplexArray
+from hypgeo.geometry import *
+from hypgeo.moebius import Moeb, MoebConj, MoebStack
+from hypgeo.tessellation import regular_polygon
+from hypgeo.sampling import disc, polygon
+
+NUMBER_TESTS = 100000
+
+def distance(z, w):
+    return np.arccosh(1.0 + np.abs(z - w) ** 2 / (2.0 * z.imag * w.imag))
+
+class TestSampling(unittest.TestCase):
+    def test_batch_types(self):
+        self.assertEqual(type(ComplexNumber.rnd(- 1.0, 1.0, 10)), ComplexArray)
+        self.assertEqual(type(ComplexNumber.rnd_in_HPlus(- 1.0, 1.0, 1.0, 10)), ComplexArray)
+        self.assertEqual(type(HalfSpace.rnd(- 1.0, 1.0, 1.0, 10)), ComplexArray)
+        self.assertTrue(np.all(HalfCircle.rnd(1.0, - 1.0, 1.0, 10).Radius > .0))
+        self.assertTrue(np.all(Vertical.rnd(- 1.0, 1.0, 10).IsVertical))
+        self.assertTrue(np.all(HalfSpace.rnd(- 1.0, 1.0, 1.0, NUMBER_TESTS).im > .0))
+        self.assertTrue(np.allclose(MoebConj.rnd(- 1.0, 1.0, 10).Det, - 1.0))
+
+    def test_seeding(self):
+        for sampler in [lambda rng: ComplexNumber.rnd(- 1.0, 1.0, 10, rng),
+            lambda rng: ComplexNumber.rnd_in_HPlus(- 1.0, 1.0, 1.0, 10, rng),
+            lambda rng: HalfCircle.rnd(1.0, - 1.0, 1.0, 10, rng), lambda rng: Vertical.rnd(- 1.0, 1.0, 10, rng),
+            lambda rng: Moeb.rnd(- 1.0, 1.0, 10, rng), lambda rng: MoebConj.rnd(- 1.0, 1.0, 10, rng),
+            lambda rng: disc(ComplexNumber(.0, 1.0), 1.0, 10, rng),
+            lambda rng: polygon(regular_polygon(5, 4), 10, rng)]:
+            self.assertTrue(sampler(np.random.default_rng(7)) == sampler(np.random.default_rng(7)))
+            self.assertFalse(sampler(np.random.default_rng(7)) == sampler(np.random.default_rng(8)))
+
+    def test_disc(self):
+        center, radius = ComplexNumber(2.0, .5), 3.0
+        Z = disc(center, radius, NUMBER_TESTS, np.random.default_rng(0))
+        d = distance(Z.Values, 2.0 + .5j)
+
+        self.assertEqual(len(Z), NUMBER_TESTS)
+        self.assertTrue(np.all(d <= radius + 1e-09))
+        for r in [.5, 1.0, 2.0]:
+            expected = math.sinh(r / 2.0) ** 2 / math.sinh(radius / 2.0) ** 2
+            self.assertAlmostEqual(np.mean(d <= r), expected, delta=.01)
+
+    def test_polygon(self):
+        p, q = 5, 4
+        V = regular_polygon(p, q)
+        Z = polygon(V, NUMBER_TESTS, np.random.default_rng(0))
+        area = (p - 2) * math.pi - p * 2.0 * math.pi / q
+
+        # the inscribed disc of the regular polygon around i
+        inradius = math.acosh(math.cos(math.pi / q) / math.sin(math.pi / p))
+        r = .9 * inradius
+        self.assertEqual(len(Z), NUMBER_TESTS)
+        self.assertAlmostEqual(np.mean(distance(Z.Values, 1.0j) <= r), 4.0 * math.pi * math.sinh(r / 2.0) ** 2 / area,
+            delta=.01)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+import gc
+import os
+import shutil
+import tempfile
+import unittest
+import warnings
+import numpy as np
+
+from hypgeo.complex_plane import ComplexArray
+from hypgeo.geometry import *
+from hypgeo.moebius import MoebStack
+from hypgeo.storage import *
+
+NUMBER_TESTS = 1000
+
+def rnd_points(samples):
+    return ComplexArray(np.random.uniform(- 10.0, + 10.0, samples) + 1.0j * np.random.uniform(.1, 10.0, samples))
+
+def rnd_lines(samples):
+    vertical = np.random.uniform(size=samples) < .3
+    return GeodesicArray(vertical, np.random.uniform(- 10.0, + 10.0, samples), np.random.uniform(.1, 10.0, samples))
+
+class TestStorage(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_round_trip(self):
+        for data in [rnd_points(NUMBER_TESTS), MoebStack.rnd(- 5.0, + 5.0, NUMBER_TESTS), rnd_lines(NUMBER_TESTS)]:
+            path = os.path.join(self.dir, 'data.hyp')
+            save(path, data)
+            loaded = load(path)
+
+            self.assertEqual(type(loaded), type(data))
+            self.assertEqual(len(loaded), NUMBER_TESTS)
+            self.assertTrue(loaded == data)
+            self.assertEqual(os.path.getsize(path), HEADER_SIZE + NUMBER_TESTS * {ComplexArray: 16, MoebStack: 32,
+                GeodesicArray: 17}[type(data)])
+
+    def test_memmap(self):
+        path = os.path.join(self.dir, 'lines.hyp')
+        save(path, rnd_lines(NUMBER_TESTS))
+        lines = load(path)
+
+        self.assertTrue(isinstance(lines.Center.base, np.memmap) or isinstance(lines.Center, np.memmap))
+        self.assertTrue(np.all(np.isinf(lines.Radius[lines.IsVertical])))
+        self.assertEqual(type(lines[0]), Vertical if lines.IsVertical[0] else HalfCircle)
+
+        path = os.path.join(self.dir, 'points.hyp')
+        save(path, rnd_points(NUMBER_TESTS))
+        points = load(path, 'r+')
+        points.Values[0] = 1.0 + 1.0j
+        del points
+        self.assertEqual(load(path).Values[0], 1.0 + 1.0j)
+
+    def test_append(self):
+        path = os.path.join(self.dir, 'moebs.hyp')
+        chunks = [MoebStack.rnd(- 5.0, + 5.0, n) for n in [10, 0, 100, 1]]
+        with Writer(path, Kind.MOEBS) as writer:
+            writer.append(chunks[0])
+        for chunk in chunks[1:]:
+            with Writer(path, append=True) as writer:
+                writer.append(chunk)
+
+        self.assertEqual(info(path), (Kind.MOEBS, 111))
+        self.assertTrue(load(path) == MoebStack(np.concatenate([c.Matrices for c in chunks])))
+
+        # records written without updating the header are dropped
+        with open(path, 'ab') as f:
+            f.write(b'\x00' * 20)
+        with Writer(path, append=True) as writer:
+            writer.append(chunks[0])
+        self.assertEqual(os.path.getsize(path), HEADER_SIZE + 121 * 32)
+
+        # a rejected container is not left open
+        with warnings.catch_warnings(record=True) as W:
+            warnings.simplefilter('always', ResourceWarning)
+            with self.assertRaises(AssertionError):
+                Writer(path, Kind.POINTS, append=True)
+            gc.collect()
+        self.assertFalse(any(issubclass(w.category, ResourceWarning) for w in W))
+
+    def test_empty(self):
+        path = os.path.join(self.dir, 'points.hyp')
+        with Writer(path, Kind.POINTS):
+            pass
+
+        self.assertEqual(info(path), (Kind.POINTS, 0))
+        self.assertEqual(len(load(path)), 0)
+        save(path, np.array([[1.0, 2.0], [3.0, 4.0]]))
+        self.assertTrue(np.array_equal(load(path).Values, [1.0 + 2.0j, 3.0 + 4.0j]))
+
+if __name__ == '__main__':
+    unittest.main()
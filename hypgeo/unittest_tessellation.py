@@ -0,0 +1,52 @@
+import unittest
+import math
+import numpy as np
+
+from hypgeo.tessellation import Tessellation, regular_polygon
+
+def distance(z, w):
+    return np.arccosh(1.0 + np.abs(z - w) ** 2 / (2.0 * z.imag * w.imag))
+
+class TestTessellation(unittest.TestCase):
+    def test_regular_polygon(self):
+        for p, q in [(7, 3), (4, 5), (3, 7), (8, 8)]:
+            V = regular_polygon(p, q).Values
+            R = math.acosh(1.0 / (math.tan(math.pi / p) * math.tan(math.pi / q)))
+
+            self.assertEqual(len(V), p)
+            self.assertTrue(np.allclose(distance(V, 1.0j), R))
+            self.assertTrue(np.allclose(distance(V, np.roll(V, 1)), distance(V[0], V[1])))
+
+    def test_counts(self):
+        T = Tessellation(regular_polygon(7, 3), 8, batch_size=100)
+        counts = np.zeros(9, dtype=int)
+        for depth, vertices, moebs in T.levels():
+            self.assertLessEqual(len(vertices), 100)
+            counts[depth] += len(vertices)
+
+        # the tiles around a vertex form a cycle of length 3, giving 7 * F(2n) tiles at distance n
+        self.assertTrue(np.array_equal(counts, [1, 7, 21, 56, 147, 385, 1008, 2639, 6909]))
+
+    def test_tiles(self):
+        for p, q, depth in [(4, 5, 6), (3, 7, 10), (5, 4, 5)]:
+            T = Tessellation(regular_polygon(p, q), depth)
+            V, C = [], []
+            for d, vertices, moebs in T.levels():
+                V.append(vertices)
+                C.append(moebs.apply(np.full(len(moebs), 1.0j)))
+            V, C = np.concatenate(V), np.concatenate(C)
+
+            # tiles are regular polygons around their centers and different tiles have different centers
+            base = regular_polygon(p, q).Values
+            self.assertTrue(np.allclose(distance(V, C[:, None]), distance(base[0], 1.0j)))
+            self.assertEqual(len(np.unique(np.round(np.stack([C.real, C.imag], axis=1), 6), axis=0)), len(C))
+
+    def test_min_size(self):
+        T = Tessellation(regular_polygon(4, 5), 8, min_size=.5)
+        V = np.concatenate(list(T))
+
+        self.assertTrue(np.all(np.maximum(np.ptp(V.real, axis=1), np.ptp(V.imag, axis=1)) >= .5))
+        self.assertLess(len(V), len(np.concatenate(list(Tessellation(regular_polygon(4, 5), 8)))) / 10)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,7 +3,7 @@ import numpy as np
 
 from hypgeo.complex_plane import _i, ComplexNumber, RootOfUnity
 from hypgeo.transformations import *
-from hypgeo.moebius import moeb_id
+from hypgeo.moebius import moeb_id, MoebType, MoebStack
 from hypgeo.geometry import *
 
 NUMBER_TESTS = 1000
@@ -80,6 +80,23 @@ class TestTransfomations(unittest.TestCase):
             self.assertEqual(ellip(S[i], Z[i]) * ellip(T[i], Z[i]), ellip(S[i] + T[i], Z[i]))
             self.assertEqual(ellip(S[i], Z[i]) * ellip(- S[i], Z[i]), moeb_id)
 
+    def test_ellip_batch(self):
+        T = np.random.uniform(- 10.0, + 10.0, NUMBER_TESTS)
+        U = HalfSpace.rnd(- 10.0, + 10.0, 10.0, NUMBER_TESTS)
+        M = ellip_batch(T, U)
+
+        self.assertTrue(M == MoebStack.from_list([ellip(t, u) for t, u in zip(T, U.to_list())]))
+        self.assertTrue(np.allclose(M.Det, 1.0))
+        self.assertTrue(np.allclose(M.apply(U.Values), U.Values))
+        self.assertTrue(ellip_batch(T[0], U.to_list()[0]) == ellip(T[0], U.to_list()[0]))
+
+        # broadcasting over flow parameters, centers and points
+        Z = HalfSpace.rnd(- 10.0, + 10.0, 10.0, 7).Values
+        W = ellip_batch(T[: 20, None, None], U.Values[None, : 30, None], Z[None, None, :])
+        self.assertEqual(ellip_batch(T[: 20, None], U.Values[None, : 30]).Matrices.shape, (20, 30, 2, 2))
+        self.assertEqual(W.shape, (20, 30, 7))
+        self.assertTrue(np.allclose(W[3, 4], ellip(T[3], U.to_list()[4]).apply(Z)))
+
     def test_loxod(self):
         S = np.random.uniform(- 10.0, + 10.0, NUMBER_TESTS)
         T = np.random.uniform(- 10.0, + 10.0, NUMBER_TESTS)
@@ -95,6 +112,52 @@ class TestTransfomations(unittest.TestCase):
         for i in range(0, NUMBER_TESTS):
             self.assertEqual(parab(S[i]) * parab(T[i]), parab(S[i] + T[i]))
             self.assertEqual(parab(S[i]) * parab(- S[i]), moeb_id)
+
+    def test_pow_one_parameter_groups(self):
+        T = np.random.uniform(- 1e-03, + 1e-03, 100)
+        N = np.random.randint(- 10 ** 5, 10 ** 5, 100)
+
+        def _coefficients(g):
+            return [g.a, g.b, g.c, g.d]
+
+        for i in range(0, 100):
+            # the entries grow up to e^5, compare them relative to their magnitude
+            for g, t in [(ellip_0, T[i]), (parab, T[i]), (loxod, T[i] / 10.0)]:
+                self.assertTrue(np.allclose(_coefficients(g(t) ** N[i]), _coefficients(g(t * N[i])), rtol=1e-09,
+                    atol=1e-12))
+            self.assertEqual(ellip_0(.5 + abs(T[i])).classify(), MoebType.ELLIPTIC)
+            self.assertEqual(parab(T[i]).classify(), MoebType.PARABOLIC)
+            self.assertEqual(loxod(.5 + abs(T[i])).classify(), MoebType.HYPERBOLIC)
+
+    def test_pow_batch(self):
+        N = np.arange(- 50, 50)
+
+        for g in [ellip_0(.3), parab(.3), loxod(.3), refl_0(2.0), loxod(- 9.98e-5)]:
+            P, Q = g.pow_batch(N), g.pow_batch(N, closed_form=True)
+            for i in range(0, len(N)):
+                g_n = g ** N[i]
+                self.assertTrue(np.allclose(P.Matrices[i], [[g_n.a, g_n.b], [g_n.c, g_n.d]], rtol=1e-09, atol=1e-12))
+                self.assertTrue(np.allclose(Q.Matrices[i], [[g_n.a, g_n.b], [g_n.c, g_n.d]], rtol=1e-09, atol=1e-12))
+
+    def test_pow_closed_form(self):
+        # the small entry of powers close to the identity cancels in closed form, which falls back to squaring
+        g, n = loxod(- 9.98e-5), np.array([- 97756, 97756])
+        P = g.pow_batch(n, closed_form=True)
+        self.assertTrue(np.allclose(P.d, np.exp(9.98e-5 * n / 2.0), rtol=1e-11, atol=.0))
+        self.assertTrue(np.allclose(P.a, np.exp(- 9.98e-5 * n / 2.0), rtol=1e-11, atol=.0))
+        N = np.arange(- 1000, 1000, 7)
+        for t in np.random.uniform(- 3.0, 3.0, 100):
+            P = ellip_0(t).pow_batch(N, closed_form=True)
+            self.assertTrue(np.allclose(P.Matrices, ellip_0_batch(t * N).Matrices, rtol=1e-09, atol=1e-12))
+
+    def test_refl_batch(self):
+        L = HalfCircle.rnd(10.0, - 10.0, + 10.0, 100).to_list() + Vertical.rnd(- 10.0, + 10.0, 100).to_list()
+        Z = np.array([[z.re, z.im] for z in HalfSpace.rnd(- 10.0, + 10.0, 10.0, len(L))])
+        R = refl_batch(GeodesicArray.from_list(L))
+
+        self.assertTrue(np.allclose(R.Det, - 1.0))
+        self.assertTrue(np.allclose(R.apply(Z), [refl(l)(ComplexNumber(z[0], z[1])).to_vec() for l, z in zip(L, Z)]))
+        self.assertTrue(np.allclose(R.apply(R.apply(Z)), Z))
           
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
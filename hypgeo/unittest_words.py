@@ -0,0 +1,55 @@
+import unittest
+import numpy as np
+
+from hypgeo.moebius import Moeb, MoebStack
+from hypgeo.words import WordEnumerator
+
+S, T = Moeb(.0, - 1.0, 1.0, .0), Moeb(1.0, 1.0, .0, 1.0)
+A, B = Moeb(1.0, 2.0, .0, 1.0), Moeb(1.0, .0, 2.0, 1.0)
+
+def distinct(m):
+    m = m.Matrices.reshape(-1, 4)
+    m = m * np.where(m[np.arange(len(m)), np.argmax(np.abs(m) > 1e-09, axis=1)] < .0, - 1.0, 1.0)[:, None]
+    return len(np.unique(np.round(m, 6), axis=0)) == len(m)
+
+class TestWordEnumerator(unittest.TestCase):
+    def test_free(self):
+        E = WordEnumerator([A, B], 7, batch_size=100)
+        words, moebs = E.enumerate()
+
+        self.assertEqual(len(words), 2 * (3 ** 7 - 1))
+        self.assertTrue(distinct(moebs))
+        self.assertTrue(all(len(words[i]) <= len(words[i + 1]) for i in range(0, len(words) - 1)))
+        for w in words:
+            self.assertTrue(all(w[i + 1] != E.inverse(w[i]) for i in range(0, len(w) - 1)))
+
+    def test_modular(self):
+        E = WordEnumerator([S, T], 8)
+        words, moebs = E.enumerate()
+
+        self.assertTrue(distinct(moebs))
+        self.assertNotIn([2], words)
+        self.assertNotIn([0, 0], words)
+        self.assertTrue(np.allclose(np.abs(moebs.Det), 1.0))
+        for i in range(0, len(words)):
+            m = E.to_moeb(words[i])
+            self.assertTrue(np.allclose([m.a, m.b, m.c, m.d], moebs.Matrices[i].ravel()))
+
+    def test_batches(self):
+        E = WordEnumerator([S, T], 6, batch_size=16)
+        batches = list(E)
+
+        self.assertTrue(all(len(w) <= 16 for w, m in batches))
+        self.assertTrue(all(type(m) is MoebStack and len(m) == len(w) for w, m in batches))
+        self.assertEqual([word for w, m in batches for word in w.tolist()], WordEnumerator([S, T], 6).enumerate()[0])
+
+    def test_max_index(self):
+        words, moebs = WordEnumerator([S, T], 8, max_index=50).enumerate()
+        words_all, moebs_all = WordEnumerator([S, T], 8).enumerate()
+
+        self.assertGreater(len(words), len(words_all))
+        self.assertFalse(distinct(moebs))
+        self.assertTrue(distinct(moebs_all))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,156 @@
+from hypgeo.complex_plane import *
+from hypgeo.backend import renormalize
+from hypgeo.moebius import MoebGen, MoebStack
+
+def _keys(m, tol, projective):
+    """Returns hashable keys of a stack of matrices of shape (N, 2, 2) which coincide for matrices whose entries
+       round to the same multiples of tol, scaled by the power of two above their largest entry (at least 1) as
+       rounding errors grow with the entries. If projective is True, m and - m get the same key."""
+    m = m.reshape(-1, 4)
+    scale = np.exp2(np.ceil(np.log2(np.maximum(np.max(np.abs(m), axis=1), 1.0))))
+    q = np.round(m / (tol * scale[:, None]))
+    if projective:
+        nonzero = q != .0
+        first = q[np.arange(len(q)), np.argmax(nonzero, axis=1)]
+        q = q * np.where(first < .0, - 1.0, 1.0)[:, None]
+    q = np.ascontiguousarray(q + .0)
+    return q.view(np.dtype((np.void, q.dtype.itemsize * 4)))[:, 0].tolist()
+
+class WordEnumerator:
+    """A class enumerating the elements of the group generated by finitely many Moebius transformations breadth
+       first by the length of their words. Words are freely reduced, i.e. no letter is followed by its inverse, and
+       an element is only emitted for the first (shortest) word representing it. Duplicates are detected by a hash
+       index of the quantized matrices.
+
+       Letters 0, ..., k - 1 stand for the generators and k, ..., 2k - 1 for their inverses. The words of each
+       length are generated depth first from the words of the shorter lengths in blocks of batch_size, so only
+       the hash index grows with the number of elements. It keeps the keys of whole word lengths, dropping the
+       oldest lengths once it exceeds max_index keys. Afterwards the deduplication is incomplete: elements of a
+       dropped length may be emitted again, and all freely reduced words up to a dropped length are extended."""
+
+    @property
+    def Letters(self):
+        return self._letters
+
+    @property
+    def MaxLength(self):
+        return self._max_length
+
+    def __init__(self, generators, max_length, tol=1e-09, projective=True, max_index=None, batch_size=65536):
+        """
+        Parameters
+        ----------
+        generators : list, MoebStack
+            Generators (MoebGen) of the group
+        max_length : int
+            Maximal length of the enumerated words
+        tol : float
+            Matrices whose entries coincide up to tol (relative to their magnitude if it exceeds 1) are identified
+        projective : bool
+            Whether the matrices m and - m, which define the same transformation, are identified
+        max_index : int
+            Maximal number of keys in the hash index, unbounded if None
+        batch_size : int
+            Maximal number of candidate words per emitted batch
+        """
+
+        if not isinstance(generators, MoebStack):
+            assert all(isinstance(g, MoebGen) for g in generators), "generators are not of type \"MoebGen\"!"
+            generators = MoebStack.from_list(generators)
+        assert len(generators) > 0, "At least one generator is needed!"
+        assert max_length >= 0, "max_length must not be negative!"
+
+        self._k = len(generators)
+        self._letters = MoebStack(np.concatenate([generators.Matrices, generators.inv().Matrices]))
+        self._max_length = max_length
+        self._tol = tol
+        self._projective = projective
+        self._max_index = max_index
+        self._batch_size = batch_size
+
+    def inverse(self, letter):
+        """Returns the letter(s) of the inverse of letter."""
+        return (letter + self._k) % (2 * self._k)
+
+    def to_moeb(self, word):
+        """Returns the transformation of a word (sequence of letters) as product of the letters from left to right."""
+        m = np.eye(2)
+        for letter in word:
+            m = renormalize(m @ self._letters.Matrices[letter])
+        return MoebStack(m[None])[0]
+
+    def __iter__(self):
+        """Yields batches (words, moebs) of the enumerated elements ordered by word length, where words is an
+           np.array of letters of shape (B, L) and moebs is a MoebStack of the B transformations."""
+        letters = self._letters.Matrices
+        n_letters = len(letters)
+        # hash index of the keys of all remembered elements with the length of their word and the last length for
+        # which it was extended, and the keys per word length for eviction
+        index = dict.fromkeys(_keys(np.eye(2)[None], self._tol, self._projective), (0, 0))
+        lengths = [list(index)]
+        dropped = - 1
+
+        chunk = max(1, self._batch_size // n_letters)
+        for length in range(1, self._max_length + 1):
+            level, found = [], False
+            lengths.append(level)
+            # iterative deepening: the words of the shorter lengths are regenerated depth first in lexicographic
+            # order, the order in which their elements were first found
+            stack = [(0, np.zeros((1, 0), dtype=np.int64), np.eye(2)[None])]
+            while len(stack) > 0:
+                l, w, m = stack.pop()
+
+                # append every letter except the inverse of the last one
+                letter = np.tile(np.arange(n_letters), len(w))
+                parent = np.repeat(np.arange(len(w)), n_letters)
+                if l > 0:
+                    keep = letter != self.inverse(w[parent, - 1])
+                    letter, parent = letter[keep], parent[keep]
+                # renormalized against the drift of the determinant over long words
+                cand = renormalize(np.matmul(m[parent], letters[letter]))
+                keys = _keys(cand, self._tol, self._projective)
+
+                new = np.zeros(len(cand), dtype=bool)
+                if l + 1 == length:
+                    for i, key in enumerate(keys):
+                        if key not in index:
+                            index[key] = (length, length)
+                            level.append(key)
+                            new[i] = True
+                elif l + 1 <= dropped:
+                    new[:] = True
+                else:
+                    # only the first word of an element is extended
+                    for i, key in enumerate(keys):
+                        entry = index.get(key)
+                        if entry is not None and entry[0] == l + 1 and entry[1] != length:
+                            index[key] = (l + 1, length)
+                            new[i] = True
+                if not np.any(new):
+                    continue
+
+                w = np.concatenate([w[parent[new]], letter[new, None]], axis=1)
+                if l + 1 == length:
+                    found = True
+                    yield w, MoebStack(cand[new])
+                else:
+                    m = cand[new]
+                    for start in reversed(range(0, len(w), chunk)):
+                        stack.append((l + 1, w[start: start + chunk], m[start: start + chunk]))
+
+            # bound the memory of the hash index by forgetting the oldest word lengths
+            while self._max_index is not None and len(index) > self._max_index and len(lengths) > 1:
+                for key in lengths.pop(0):
+                    del index[key]
+                dropped += 1
+
+            if not found:
+                return
+
+    def enumerate(self):
+        """Returns all enumerated elements as pair of a list of words (lists of letters) and a MoebStack."""
+        words, moebs = [], [np.eye(2)[None][: 0]]
+        for w, m in self:
+            words += w.tolist()
+            moebs.append(m.Matrices)
+        return words, MoebStack(np.concatenate(moebs))